@@ -6,7 +6,7 @@ from template_analyzer.djangoanalyzer import get_node_instances
 from fluent_contents.models import PlaceholderData
 from fluent_contents.templatetags.fluent_contents_tags import PagePlaceholderNode
 
-__all__ = ("get_template_placeholder_data",)
+__all__ = ("get_template_placeholder_data", "get_template_placeholder_nodes")
 
 
 def get_template_placeholder_data(template):
@@ -22,7 +22,7 @@ def get_template_placeholder_data(template):
     :rtype: list of :class:`~fluent_contents.models.PlaceholderData`
     """
     # Find the instances.
-    nodes = get_node_instances(template, PagePlaceholderNode)
+    nodes = get_template_placeholder_nodes(template)
 
     # Avoid duplicates, wrap in a class.
     names = set()
@@ -40,3 +40,21 @@ def get_template_placeholder_data(template):
             names.add(data.slot)
 
     return result
+
+
+def get_template_placeholder_nodes(template):
+    """
+    Return the :class:`~fluent_contents.templatetags.fluent_contents_tags.PagePlaceholderNode` nodes found in a template.
+
+    The result is memoized on the compiled template object,
+    so a template that is kept by the cached template loader is only scanned once.
+
+    :param template:  The Template object, or nodelist to scan.
+    :rtype: list of :class:`~fluent_contents.templatetags.fluent_contents_tags.PagePlaceholderNode`
+    """
+    try:
+        return template._fluent_contents_placeholder_nodes
+    except AttributeError:
+        nodes = get_node_instances(template, PagePlaceholderNode)
+        template._fluent_contents_placeholder_nodes = nodes
+        return nodes
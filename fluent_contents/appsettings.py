@@ -1,6 +1,7 @@
 """
 Overview of all settings which can be customized.
 """
+
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from fluent_utils.load import import_class
@@ -18,8 +19,80 @@ FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = getattr(
     settings, "FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT", False
 )
 
+# Keep a copy of cached output in the current process.
+# The request-local copy is cleared after each request,
+# the process-local copy only lives for a few seconds.
+FLUENT_CONTENTS_LOCAL_CACHE = getattr(settings, "FLUENT_CONTENTS_LOCAL_CACHE", False)
+FLUENT_CONTENTS_LOCAL_CACHE_MAX_ENTRIES = getattr(
+    settings, "FLUENT_CONTENTS_LOCAL_CACHE_MAX_ENTRIES", 0
+)
+FLUENT_CONTENTS_LOCAL_CACHE_TIMEOUT = getattr(settings, "FLUENT_CONTENTS_LOCAL_CACHE_TIMEOUT", 5)
+
+# Invalidate the cached output by increasing a counter per parent object,
+# instead of deleting all cache keys of all sites and languages.
+FLUENT_CONTENTS_CACHE_GENERATIONS = getattr(settings, "FLUENT_CONTENTS_CACHE_GENERATIONS", False)
+
+# Avoid that all workers render the same placeholder when the cached output expired.
+# This can be "lock" (one worker renders, others display the previous output)
+# or "early" (probabilistic early expiration).
+FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION = getattr(
+    settings, "FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION", None
+)
+FLUENT_CONTENTS_CACHE_LOCK_TIMEOUT = getattr(settings, "FLUENT_CONTENTS_CACHE_LOCK_TIMEOUT", 30)
+FLUENT_CONTENTS_CACHE_STALE_TIMEOUT = getattr(
+    settings, "FLUENT_CONTENTS_CACHE_STALE_TIMEOUT", 24 * 3600
+)
+
+if FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION not in (None, "lock", "early"):
+    raise ImproperlyConfigured(
+        "FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION should be None, 'lock' or 'early'."
+    )
+
+# Keep caching the full placeholder output when it has items that can't be cached.
+# This can be "inline" (the items are rendered in each request) or "esi" (edge side includes).
+FLUENT_CONTENTS_CACHE_HOLE_PUNCHING = getattr(
+    settings, "FLUENT_CONTENTS_CACHE_HOLE_PUNCHING", None
+)
+
+if FLUENT_CONTENTS_CACHE_HOLE_PUNCHING not in (None, "inline", "esi"):
+    raise ImproperlyConfigured(
+        "FLUENT_CONTENTS_CACHE_HOLE_PUNCHING should be None, 'inline' or 'esi'."
+    )
+
+# Compress the cached output of large items and placeholders.
+# This can be "zlib" or "zstd" (requires the "zstandard" package).
+FLUENT_CONTENTS_CACHE_COMPRESSION = getattr(settings, "FLUENT_CONTENTS_CACHE_COMPRESSION", None)
+FLUENT_CONTENTS_CACHE_COMPRESSION_THRESHOLD = getattr(
+    settings, "FLUENT_CONTENTS_CACHE_COMPRESSION_THRESHOLD", 4096
+)
+
+if FLUENT_CONTENTS_CACHE_COMPRESSION not in (None, "zlib", "zstd"):
+    raise ImproperlyConfigured(
+        "FLUENT_CONTENTS_CACHE_COMPRESSION should be None, 'zlib' or 'zstd'."
+    )
+elif FLUENT_CONTENTS_CACHE_COMPRESSION == "zstd":
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured(
+            "FLUENT_CONTENTS_CACHE_COMPRESSION = 'zstd' requires the 'zstandard' package."
+        )
+
+# Render the items of thread-safe plugins concurrently, using a pool of this many threads.
+FLUENT_CONTENTS_RENDER_THREADS = getattr(settings, "FLUENT_CONTENTS_RENDER_THREADS", 0)
+FLUENT_CONTENTS_RENDER_THREAD_TIMEOUT = getattr(
+    settings, "FLUENT_CONTENTS_RENDER_THREAD_TIMEOUT", 10
+)
+
 FLUENT_CONTENTS_PLACEHOLDER_CONFIG = getattr(settings, "FLUENT_CONTENTS_PLACEHOLDER_CONFIG", {})
 
+# The modules that register the plugin of a model, to import plugins on first use.
+FLUENT_CONTENTS_PLUGIN_MODULES = getattr(settings, "FLUENT_CONTENTS_PLUGIN_MODULES", {})
+if not isinstance(FLUENT_CONTENTS_PLUGIN_MODULES, dict):
+    raise ImproperlyConfigured(
+        "FLUENT_CONTENTS_PLUGIN_MODULES should be a dictionary of 'app_label.ModelName': 'module.path'."
+    )
+
 # Note: the default language setting is used during the migrations
 FLUENT_DEFAULT_LANGUAGE_CODE = getattr(
     settings,
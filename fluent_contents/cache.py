@@ -1,7 +1,21 @@
 """
 Functions for caching.
 """
+import math
+import pickle
+import random
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from asgiref.local import Local
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache as django_cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.signals import request_finished, request_started
+
+from fluent_contents import appsettings
 
 
 def get_rendering_cache_key(placeholder_name, contentitem):
@@ -15,11 +29,12 @@ def get_rendering_cache_key(placeholder_name, contentitem):
     """
     if not contentitem.pk:
         return None
-    return "contentitem.@{}.{}.{}".format(
+    cachekey = "contentitem.@{}.{}.{}".format(
         placeholder_name,
         contentitem.plugin.type_name,  # always returns the upcasted name.
         contentitem.pk,  # already unique per language_code
     )
+    return _add_cache_generation(cachekey, contentitem.parent_type_id, contentitem.parent_id)
 
 
 def get_placeholder_cache_key(placeholder, language_code):
@@ -48,9 +63,552 @@ def get_placeholder_cache_key_for_parent(parent_object, placeholder_name, langua
     )
 
 
+def get_placeholder_site_cache_key(cachekey, site_id=None):
+    """
+    .. versionadded:: 3.2
+       Return the cache key for placeholder output that differs per site.
+
+    This is used instead of the placeholder cache key when the placeholder has items of plugins
+    that set :attr:`~fluent_contents.extensions.ContentPlugin.cache_output_per_site`.
+
+    :param cachekey: The placeholder cache key, e.g. from :func:`get_placeholder_cache_key_for_parent`.
+    :param site_id: The site, by default the current ``SITE_ID``.
+    """
+    return "{}.s{}".format(cachekey, site_id or settings.SITE_ID)
+
+
+def get_placeholder_fallback_cache_key(cachekey, fallback_language_code):
+    """
+    .. versionadded:: 3.2
+       Return the cache key for placeholder output that is rendered in a fallback language.
+
+    This is used when the placeholder has no items in the requested language,
+    and the items of the ``fallback_language`` are displayed instead.
+
+    :param cachekey: The placeholder cache key of the requested language.
+    :param fallback_language_code: The language of the displayed items.
+    """
+    return "{}.f{}".format(cachekey, fallback_language_code)
+
+
+def get_placeholder_output_keys(cachekey, fallback_language_code=None):
+    """
+    .. versionadded:: 3.2
+       Return all keys where the output of a placeholder can be stored, in the order of preference.
+
+    These are the :func:`site specific <get_placeholder_site_cache_key>` and regular key,
+    followed by the :func:`fallback language <get_placeholder_fallback_cache_key>` variants.
+    """
+    keys = [get_placeholder_site_cache_key(cachekey), cachekey]
+    if fallback_language_code:
+        fallback_cachekey = get_placeholder_fallback_cache_key(cachekey, fallback_language_code)
+        keys += [get_placeholder_site_cache_key(fallback_cachekey), fallback_cachekey]
+    return keys
+
+
+def get_cached_placeholder(cachekey, fallback_language_code=None):
+    """
+    .. versionadded:: 3.2
+       Return the cached output of a placeholder, which is either stored under the cache key
+       or one of it's variants from :func:`get_placeholder_output_keys`.
+       All keys are read in a single call.
+
+    With the ``"early"`` mode of :ref:`FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION`,
+    this also returns ``None`` when the output should be rendered again before it expires.
+    """
+    keys = get_placeholder_output_keys(cachekey, fallback_language_code)
+    if appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION == "early":
+        keys += [f"{key}.expires" for key in keys]
+    return _find_cached_placeholder(cache.get_many(keys), cachekey, fallback_language_code)
+
+
+def _find_cached_placeholder(
+    values, cachekey, fallback_language_code=None, early_expiration_beta=1.0, now=None
+):
+    # Return the output from the values of get_many(), or None when it needs to be rendered.
+    for key in get_placeholder_output_keys(cachekey, fallback_language_code):
+        output = values.get(key)
+        if output is not None:
+            break
+    else:
+        return None
+
+    if appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION == "early" and _expires_early(
+        values.get(f"{key}.expires"), early_expiration_beta, now
+    ):
+        return None
+    return output
+
+
+def _expires_early(expires, early_expiration_beta=1.0, now=None):
+    # Probabilistic early expiration, as described in "Optimal Probabilistic Cache Stampede Prevention".
+    # The chance of rendering increases when the output is about to expire, or takes long to render.
+    if expires is None:
+        return False
+    expire_time, render_time = expires
+    now = time.time() if now is None else now
+    return (
+        now - render_time * early_expiration_beta * math.log(1.0 - random.random()) >= expire_time
+    )
+
+
+def get_placeholder_stale_cache_key_for_parent(parent_object, placeholder_name, language_code):
+    """
+    .. versionadded:: 3.2
+       Return the cache key where the previous output of a placeholder is kept.
+
+    This key is used by the ``"lock"`` mode of :ref:`FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION`.
+    It's not removed when the cache is cleared, so the output can be displayed while it's rendered again.
+    """
+    parent_type = ContentType.objects.get_for_model(parent_object)
+    return "placeholder_stale.{}.{}.{}.{}".format(
+        parent_type.id, parent_object.pk, placeholder_name, language_code
+    )
+
+
+def get_placeholder_items_cache_key(placeholder, language_code):
+    """
+    .. versionadded:: 3.2
+       Return the cache key where the list of items in a placeholder is stored.
+
+    This list holds the ``(pk, polymorphic_ctype_id, language_code, sort_order, render_payload)``
+    of every item, so the cached output of all items can be read without querying the items first.
+    """
+    cachekey = "placeholder_items.{}.{}.{}.{}".format(
+        placeholder.parent_type_id, placeholder.parent_id, placeholder.slot, language_code
+    )
+    return _add_cache_generation(cachekey, placeholder.parent_type_id, placeholder.parent_id)
+
+
+def _get_media_cache_key(digest):
+    # The media of cached output is stored next to it, see TieredCache.set_many()
+    return f"fluent_contents.media.{digest.hex()}"
+
+
 def _get_placeholder_cache_key_for_id(parent_type_id, parent_id, placeholder_name, language_code):
     # Return a cache key for a placeholder, without having to fetch a placeholder first.
     # Not yet exposed, maybe more object values are needed later.
-    return "placeholder.{}.{}.{}.{}".format(
-        parent_type_id, parent_id, placeholder_name, language_code
+    cachekey = "{}{}".format(
+        _get_placeholder_cache_key_prefix(parent_type_id, parent_id, placeholder_name),
+        language_code,
     )
+    return _add_cache_generation(cachekey, parent_type_id, parent_id)
+
+
+def _get_placeholder_cache_key_prefix(parent_type_id, parent_id, placeholder_name):
+    # The common start of all output keys of a placeholder, for every language.
+    return "placeholder.{}.{}.{}.".format(parent_type_id, parent_id, placeholder_name)
+
+
+def get_cache_generation(parent_type_id, parent_id):
+    """
+    .. versionadded:: 3.2
+       Return the current cache generation of a parent object.
+
+    When :ref:`FLUENT_CONTENTS_CACHE_GENERATIONS` is enabled, this value is part of all cache keys
+    of the placeholders and content items of the parent.
+    Calling :func:`bump_cache_generation` makes all those keys obsolete at once.
+    The value is remembered for the remainder of the request.
+    """
+    key = _get_generation_cache_key(parent_type_id, parent_id)
+    memo = getattr(_generation_local, "data", None)
+    if memo is not None:
+        try:
+            return memo[key]
+        except KeyError:
+            pass
+
+    generation = cache.get(key)
+    if generation is None:
+        # Start at a time-based value, so an evicted counter doesn't resurrect old output.
+        generation = int(time.time() * 1000)
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+
+    if memo is not None:
+        memo[key] = generation
+    return generation
+
+
+def bump_cache_generation(parent_type_id, parent_id):
+    """
+    .. versionadded:: 3.2
+       Invalidate the cached output of all placeholders and content items of a parent object.
+
+    This only has effect when :ref:`FLUENT_CONTENTS_CACHE_GENERATIONS` is enabled.
+    """
+    key = _get_generation_cache_key(parent_type_id, parent_id)
+    try:
+        generation = cache.incr(key)
+    except ValueError:
+        generation = int(time.time() * 1000)
+        cache.set(key, generation, None)
+
+    memo = getattr(_generation_local, "data", None)
+    if memo is not None:
+        memo[key] = generation
+
+
+_GENERATION_KEY_PREFIX = "fluent_contents.generation."
+
+
+def _get_generation_cache_key(parent_type_id, parent_id):
+    return f"{_GENERATION_KEY_PREFIX}{parent_type_id}.{parent_id}"
+
+
+def _add_cache_generation(cachekey, parent_type_id, parent_id):
+    if not appsettings.FLUENT_CONTENTS_CACHE_GENERATIONS:
+        return cachekey
+    return "{}.g{}".format(cachekey, get_cache_generation(parent_type_id, parent_id))
+
+
+class TieredCache:
+    """
+    .. versionadded:: 3.2
+       A wrapper around the Django cache backend, which adds in-process caching tiers in front of it.
+
+    The local tiers are:
+
+    * A dictionary that lives for the duration of a single request,
+      enabled by the :ref:`FLUENT_CONTENTS_LOCAL_CACHE` setting.
+    * A bounded LRU dictionary per process, which keeps entries for a short time,
+      enabled by the :ref:`FLUENT_CONTENTS_LOCAL_CACHE_MAX_ENTRIES` setting.
+
+    Deleting keys (e.g. from :func:`CachedModelMixin.clear_cache() <fluent_contents.models.mixins.CachedModelMixin.clear_cache>`)
+    also evicts them from the local tiers of the current process.
+    Other processes may display their local copy until the :ref:`FLUENT_CONTENTS_LOCAL_CACHE_TIMEOUT` passed.
+
+    The cache generations and locks are never kept in the local tiers,
+    so changes by other processes are seen immediately.
+
+    Values are stored in pickled form, so each read returns a new object just like the Django cache does.
+    The cached :class:`~fluent_contents.models.ContentItemOutput` only refers to it's media,
+    so the media definition is written in the same call.
+    When the media is no longer available, the output is treated as a missing entry.
+    All methods that write or delete keys are implemented here, including the asynchronous variants,
+    so the local tiers stay consistent. Other attributes are read from the Django cache backend directly.
+    """
+
+    def __init__(self, backend):
+        self._backend = backend
+        self._request_local = Local()
+        self._process_local = OrderedDict()
+        self._process_lock = Lock()
+
+    def __getattr__(self, item):
+        return getattr(self._backend, item)
+
+    def start_request(self, **kwargs):
+        """Start a new request-scoped tier. This is called by the ``request_started`` signal."""
+        self._request_local.data = {} if appsettings.FLUENT_CONTENTS_LOCAL_CACHE else None
+
+    def end_request(self, **kwargs):
+        """Discard the request-scoped tier. This is called by the ``request_finished`` signal."""
+        self._request_local.data = None
+
+    def get(self, key, default=None, version=None):
+        if version is None:
+            value = self._get_local(key)
+            if value is not None:
+                return value
+
+        value = self._backend.get(key, version=version)
+        if value is None or _is_incomplete(value):
+            return default
+
+        if version is None:
+            self._set_local({key: value})
+        return value
+
+    async def aget(self, key, default=None, version=None):
+        if version is None:
+            value = self._get_local(key)
+            if value is not None:
+                return value
+
+        value = await self._backend.aget(key, version=version)
+        if value is None or _is_incomplete(value):
+            return default
+
+        if version is None:
+            self._set_local({key: value})
+        return value
+
+    def get_many(self, keys, version=None):
+        if version is not None:
+            return self._backend.get_many(keys, version=version)
+
+        values = {}
+        missing_keys = []
+        for key in keys:
+            value = self._get_local(key)
+            if value is not None:
+                values[key] = value
+            else:
+                missing_keys.append(key)
+
+        if missing_keys:
+            found = _skip_incomplete(self._backend.get_many(missing_keys))
+            self._set_local(found)
+            values.update(found)
+
+        return values
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if version is None:
+            # Cached output is stored together with it's media definition.
+            self.set_many({key: value}, timeout)
+        else:
+            self._backend.set(key, value, timeout, version=version)
+            self._delete_local([key])
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if version is None:
+            # Cached output is stored together with it's media definition.
+            await self.aset_many({key: value}, timeout)
+        else:
+            await self._backend.aset(key, value, timeout, version=version)
+            self._delete_local([key])
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = self.get(key, version=version)
+        if value is None:
+            self._delete_local([key])
+            value = self._backend.get_or_set(key, default, timeout, version=version)
+        return value
+
+    async def aget_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        value = await self.aget(key, version=version)
+        if value is None:
+            self._delete_local([key])
+            value = await self._backend.aget_or_set(key, default, timeout, version=version)
+        return value
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        if version is None:
+            data = _add_media_definitions(data)
+        failed_keys = self._backend.set_many(data, timeout, version=version)
+        if version is None and not failed_keys:
+            self._set_local(data)
+        else:
+            self._delete_local(data.keys())
+        return failed_keys
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._delete_local([key])
+        return self._backend.add(key, value, timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._delete_local([key])
+        return self._backend.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self._delete_local([key])
+        return self._backend.decr(key, delta, version=version)
+
+    async def aincr(self, key, delta=1, version=None):
+        self._delete_local([key])
+        return await self._backend.aincr(key, delta, version=version)
+
+    async def adecr(self, key, delta=1, version=None):
+        self._delete_local([key])
+        return await self._backend.adecr(key, delta, version=version)
+
+    def incr_version(self, key, delta=1, version=None):
+        self._delete_local([key])
+        return self._backend.incr_version(key, delta, version=version)
+
+    def decr_version(self, key, delta=1, version=None):
+        self._delete_local([key])
+        return self._backend.decr_version(key, delta, version=version)
+
+    async def aincr_version(self, key, delta=1, version=None):
+        self._delete_local([key])
+        return await self._backend.aincr_version(key, delta, version=version)
+
+    async def adecr_version(self, key, delta=1, version=None):
+        self._delete_local([key])
+        return await self._backend.adecr_version(key, delta, version=version)
+
+    def delete(self, key, version=None):
+        self._delete_local([key])
+        return self._backend.delete(key, version=version)
+
+    async def adelete(self, key, version=None):
+        self._delete_local([key])
+        return await self._backend.adelete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        self._delete_local(keys)
+        return self._backend.delete_many(keys, version=version)
+
+    async def aget_many(self, keys, version=None):
+        if version is not None:
+            return await self._backend.aget_many(keys, version=version)
+
+        values = {}
+        missing_keys = []
+        for key in keys:
+            value = self._get_local(key)
+            if value is not None:
+                values[key] = value
+            else:
+                missing_keys.append(key)
+
+        if missing_keys:
+            found = _skip_incomplete(await self._backend.aget_many(missing_keys))
+            self._set_local(found)
+            values.update(found)
+
+        return values
+
+    async def aset_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        if version is None:
+            data = _add_media_definitions(data)
+        failed_keys = await self._backend.aset_many(data, timeout, version=version)
+        if version is None and not failed_keys:
+            self._set_local(data)
+        else:
+            self._delete_local(data.keys())
+        return failed_keys
+
+    async def aadd(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._delete_local([key])
+        return await self._backend.aadd(key, value, timeout, version=version)
+
+    async def adelete_many(self, keys, version=None):
+        keys = list(keys)
+        self._delete_local(keys)
+        return await self._backend.adelete_many(keys, version=version)
+
+    def clear(self):
+        self.clear_local()
+        return self._backend.clear()
+
+    async def aclear(self):
+        self.clear_local()
+        return await self._backend.aclear()
+
+    def clear_local(self):
+        """Clear the in-process tiers only."""
+        if getattr(self._request_local, "data", None):
+            self._request_local.data = {}
+        with self._process_lock:
+            self._process_local.clear()
+
+    def _get_local(self, key):
+        value = self._read_local(key)
+        if value is None or _is_incomplete(value):
+            return None
+        return value
+
+    def _read_local(self, key):
+        if not _is_local_key(key):
+            return None
+
+        request_data = getattr(self._request_local, "data", None)
+        if request_data:
+            try:
+                return pickle.loads(request_data[key])
+            except KeyError:
+                pass
+
+        if appsettings.FLUENT_CONTENTS_LOCAL_CACHE_MAX_ENTRIES:
+            with self._process_lock:
+                try:
+                    expires, pickled = self._process_local[key]
+                except KeyError:
+                    return None
+
+                if expires < time.monotonic():
+                    del self._process_local[key]
+                    return None
+
+                self._process_local.move_to_end(key)
+
+            if request_data is not None:
+                request_data[key] = pickled
+            return pickle.loads(pickled)
+
+        return None
+
+    def _set_local(self, data):
+        request_data = getattr(self._request_local, "data", None)
+        max_entries = appsettings.FLUENT_CONTENTS_LOCAL_CACHE_MAX_ENTRIES
+        if request_data is None and not max_entries:
+            return
+
+        pickled_data = {
+            key: pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            for key, value in data.items()
+            if _is_local_key(key)
+        }
+        if request_data is not None:
+            request_data.update(pickled_data)
+
+        if max_entries:
+            expires = time.monotonic() + appsettings.FLUENT_CONTENTS_LOCAL_CACHE_TIMEOUT
+            with self._process_lock:
+                for key, pickled in pickled_data.items():
+                    self._process_local[key] = (expires, pickled)
+                    self._process_local.move_to_end(key)
+
+                while len(self._process_local) > max_entries:
+                    self._process_local.popitem(last=False)
+
+    def _delete_local(self, keys):
+        request_data = getattr(self._request_local, "data", None)
+        if request_data:
+            for key in keys:
+                request_data.pop(key, None)
+
+        if self._process_local:
+            with self._process_lock:
+                for key in keys:
+                    self._process_local.pop(key, None)
+
+
+def _is_local_key(key):
+    # The generations and locks coordinate multiple processes, these are always read from the backend.
+    return not (key.startswith(_GENERATION_KEY_PREFIX) or key.endswith(".lock"))
+
+
+def _is_incomplete(value):
+    # Cached output of which the media definition is no longer available, is rendered again.
+    return getattr(value, "_media_missing", False) is True
+
+
+def _skip_incomplete(values):
+    return {key: value for key, value in values.items() if not _is_incomplete(value)}
+
+
+def _add_media_definitions(data):
+    # Cached output only holds a digest of it's media, the definition is stored next to it.
+    from fluent_contents.models import _add_media_definitions
+
+    return _add_media_definitions(data)
+
+
+#: .. versionadded:: 3.2
+#:    The cache that is used to store the rendered output.
+#:    This is the Django cache, with the local tiers of :class:`TieredCache` in front of it.
+cache = TieredCache(django_cache)
+
+request_started.connect(cache.start_request, dispatch_uid="fluent_contents.cache.start_request")
+request_finished.connect(cache.end_request, dispatch_uid="fluent_contents.cache.end_request")
+
+# The cache generations that are read during the request.
+_generation_local = Local()
+
+
+def _start_generation_memo(**kwargs):
+    _generation_local.data = {}
+
+
+def _end_generation_memo(**kwargs):
+    _generation_local.data = None
+
+
+request_started.connect(_start_generation_memo, dispatch_uid="fluent_contents.cache.generations")
+request_finished.connect(_end_generation_memo, dispatch_uid="fluent_contents.cache.generations")
@@ -2,13 +2,16 @@
 Internal module for the plugin system,
 the API is exposed via __init__.py
 """
+
+import json
+
 import django.contrib.auth.context_processors
 import django.contrib.messages.context_processors
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib import admin
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
-from django.core.cache import cache
 from django.db import DatabaseError
 from django.forms import Media, MediaDefiningClass
 from django.http import HttpResponsePermanentRedirect, HttpResponseRedirect
@@ -20,9 +23,14 @@ from django.utils.html import escape, linebreaks
 from django.utils.translation import get_language
 from django.utils.translation import gettext_lazy as _
 
-from fluent_contents.cache import get_placeholder_cache_key, get_rendering_cache_key
+from fluent_contents.cache import cache, get_placeholder_cache_key, get_rendering_cache_key
 from fluent_contents.forms import ContentItemForm
-from fluent_contents.models import DEFAULT_TIMEOUT, ContentItemOutput, ImmutableMedia
+from fluent_contents.models import (
+    DEFAULT_TIMEOUT,
+    ContentItemOutput,
+    ImmutableMedia,
+    intern_media,
+)
 from fluent_contents.utils.search import clean_join, get_search_field_values
 
 
@@ -67,8 +75,15 @@ class PluginContext(Context):
 def frontend_media_property(cls):
     # Identical to the media_property, adapted to read the "FrontendMedia" class
     # and optimized to avoid useless object creation.
+    # The media is only constructed once per plugin class, and shared by all rendered items.
+    registered = {}
 
     def _media(self):
+        try:
+            return registered[self.__class__]
+        except KeyError:
+            pass
+
         # Get the media property of the superclass, if it exists
         sup_cls = super(cls, self)
         try:
@@ -83,11 +98,12 @@ def frontend_media_property(cls):
 
             # Not supporting extend=('js',) here, not documented in Django either.
             if getattr(definition, "extend", True) and base is not ImmutableMedia.empty_instance:
-                return base + media
-
-            return media
+                media = base + media
         else:
-            return base
+            media = base
+
+        media = registered[self.__class__] = intern_media(media)
+        return media
 
     return property(_media)
 
@@ -184,6 +200,9 @@ class ContentPlugin(metaclass=PluginMediaDefiningClass):
 
     #: .. versionadded:: 0.9
     #: Cache the plugin output per :django:setting:`SITE_ID`.
+    #:
+    #: .. versionchanged:: 3.2
+    #:    The placeholder output is also cached per site when it contains items of this plugin.
     cache_output_per_site = False
 
     #: .. versionadded:: 1.0
@@ -221,6 +240,23 @@ class ContentPlugin(metaclass=PluginMediaDefiningClass):
     #: See also: :attr:`cache_output_per_language`
     render_ignore_item_language = False
 
+    #: .. versionadded:: 3.2
+    #: The model fields that the :func:`render` method uses.
+    #: When defined, the values of these fields are also stored in the base ``ContentItem`` table,
+    #: so the item can be rendered without querying the table of the plugin model.
+    #: Use an empty tuple when the plugin only uses the fields of the base ``ContentItem`` model.
+    #:
+    #: Note the stored values are only updated when the item is saved,
+    #: using ``QuerySet.update()`` on the plugin model will leave outdated values.
+    render_payload_fields = None
+
+    #: .. versionadded:: 3.2
+    #: Tell whether the :func:`render` method can run in a separate thread.
+    #: When :ref:`FLUENT_CONTENTS_RENDER_THREADS` is enabled, the items of these plugins are rendered concurrently.
+    #: This is useful for plugins that wait for external services, such as an oEmbed provider.
+    #: The plugin should not rely on thread-local state other than the active language.
+    render_thread_safe = False
+
     #: Alternative template for the view.
     ADMIN_TEMPLATE_WITHOUT_LABELS = (
         "admin/fluent_contents/contentitem/admin_form_without_labels.html"
@@ -316,7 +352,14 @@ class ContentPlugin(metaclass=PluginMediaDefiningClass):
         # Internal wrapper for render(), to allow updating the method signature easily.
         # It also happens to really simplify code navigation.
         result = self.render(request=request, instance=instance)
+        return self._get_contentitem_output(instance, result)
 
+    async def _arender_contentitem(self, request, instance):
+        # Internal wrapper for arender(), same as _render_contentitem()
+        result = await self.arender(request=request, instance=instance)
+        return self._get_contentitem_output(instance, result)
+
+    def _get_contentitem_output(self, instance, result):
         if isinstance(result, ContentItemOutput):
             # Return in new 1.0 format
 
@@ -414,6 +457,36 @@ class ContentPlugin(metaclass=PluginMediaDefiningClass):
 
         return cachekeys
 
+    def has_custom_output_cache_keys(self):
+        """
+        .. versionadded:: 3.2
+           Tell whether the plugin overrides the functions that generate the cache keys.
+
+           When :ref:`FLUENT_CONTENTS_CACHE_GENERATIONS` is enabled, the default cache keys
+           are invalidated by increasing the generation of the parent object.
+           The keys of :func:`get_output_cache_keys` are only deleted for plugins with custom cache keys.
+        """
+        cls = self.__class__
+        return (
+            cls.get_output_cache_base_key is not ContentPlugin.get_output_cache_base_key
+            or cls.get_output_cache_key is not ContentPlugin.get_output_cache_key
+            or cls.get_output_cache_keys is not ContentPlugin.get_output_cache_keys
+        )
+
+    def get_output_cache_lookup_key(self, placeholder_name, instance):
+        """
+        .. versionadded:: 3.2
+           Return the cache key to read the rendered item from,
+           when all items of a placeholder are fetched at once using ``cache.get_many()``.
+
+           By default, this returns the key of :func:`get_output_cache_key`.
+           When :func:`get_cached_output` is overwritten, ``None`` is returned,
+           so the rendering falls back to calling :func:`get_cached_output` for each individual item.
+        """
+        if self.__class__.get_cached_output is not ContentPlugin.get_cached_output:
+            return None
+        return self.get_output_cache_key(placeholder_name, instance)
+
     def get_cached_output(self, placeholder_name, instance):
         """
         .. versionadded:: 0.9
@@ -426,6 +499,21 @@ class ContentPlugin(metaclass=PluginMediaDefiningClass):
         cachekey = self.get_output_cache_key(placeholder_name, instance)
         return cache.get(cachekey)
 
+    def get_output_cache_store_key(self, placeholder_name, instance):
+        """
+        .. versionadded:: 3.2
+           Return the cache key to store the rendered item at,
+           when all rendered items of a placeholder are written at once using ``cache.set_many()``.
+           The output is stored using the :attr:`cache_timeout` of the plugin.
+
+           By default, this returns the key of :func:`get_output_cache_key`.
+           When :func:`set_cached_output` is overwritten, ``None`` is returned,
+           so the rendering falls back to calling :func:`set_cached_output` for each individual item.
+        """
+        if self.__class__.set_cached_output is not ContentPlugin.set_cached_output:
+            return None
+        return self.get_output_cache_key(placeholder_name, instance)
+
     def set_cached_output(self, placeholder_name, instance, output):
         """
         .. versionadded:: 0.9
@@ -480,6 +568,19 @@ class ContentPlugin(metaclass=PluginMediaDefiningClass):
         context = self.get_context(request, instance, **kwargs)
         return self.render_to_string(request, render_template, context)
 
+    async def arender(self, request, instance, **kwargs):
+        """
+        .. versionadded:: 3.2
+           The asynchronous variant of :func:`render`,
+           which is used by :func:`~fluent_contents.rendering.arender_placeholder`.
+
+        By default, this calls :func:`render` using :func:`~asgiref.sync.sync_to_async`.
+        Override this function to perform I/O without blocking the event loop,
+        e.g. when fetching data from an external service.
+        The same return values as :func:`render` are supported.
+        """
+        return await sync_to_async(self.render)(request, instance, **kwargs)
+
     def render_to_string(self, request, template, context, content_instance=None):
         """
         Render a custom template with the :class:`~PluginContext` as context instance.
@@ -556,6 +657,61 @@ class ContentPlugin(metaclass=PluginMediaDefiningClass):
         """
         return self.frontend_media
 
+    def get_render_payload(self, instance):
+        """
+        .. versionadded:: 3.2
+           Return the serialized values of the :attr:`render_payload_fields`.
+           This is stored in the ``render_payload`` field of the item when it's saved.
+        """
+        if self.render_payload_fields is None:
+            return ""
+
+        payload = {}
+        for name in self.render_payload_fields:
+            field = self.model._meta.get_field(name)
+            if field.value_from_object(instance) is None:
+                payload[field.attname] = None
+            else:
+                payload[field.attname] = field.value_to_string(instance)
+        return json.dumps(payload, separators=(",", ":"))
+
+    def get_instance_from_payload(self, contentitem):
+        """
+        .. versionadded:: 3.2
+           Construct the plugin model from a base ``ContentItem`` object and its stored render payload.
+           Returns ``None`` when there is no (up to date) payload, so the database table will be read instead.
+
+           All other fields of the plugin model are deferred, and will be fetched when they are accessed.
+        """
+        if self.render_payload_fields is None or not contentitem.render_payload:
+            return None
+
+        try:
+            payload = json.loads(contentitem.render_payload)
+        except ValueError:
+            return None
+
+        opts = self.model._meta
+        values = {}
+        for name in self.render_payload_fields:
+            field = opts.get_field(name)
+            try:
+                value = payload[field.attname]
+            except KeyError:
+                return None  # The render_payload_fields changed.
+            values[field.attname] = None if value is None else field.to_python(value)
+
+        for field in contentitem._meta.concrete_fields:
+            values[field.attname] = getattr(contentitem, field.attname)
+        for parent_link in opts.parents.values():
+            if parent_link is not None:
+                values[parent_link.attname] = contentitem.pk
+
+        field_names = [f.attname for f in opts.concrete_fields if f.attname in values]
+        return self.model.from_db(
+            contentitem._state.db, field_names, [values[name] for name in field_names]
+        )
+
     def get_search_text(self, instance):
         """
         Return a custom search text for a given instance.
@@ -6,7 +6,7 @@ from threading import Lock
 
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ImproperlyConfigured
-from fluent_utils.load import import_apps_submodule
+from fluent_utils.load import import_apps_submodule, import_module_or_none
 
 from fluent_contents import appsettings
 from fluent_contents.forms import ContentItemForm
@@ -62,6 +62,13 @@ class PluginPool:
         self._name_for_ctype_id = None
         self.detected = False
 
+        # Precomputed lookup tables for the rendering code.
+        # These are kept up to date by register(), so a lookup is a single dictionary access.
+        # The content type table is filled on first use, as that requires the database.
+        self._plugin_for_model = {}
+        self._plugin_for_ctype_id = {}
+        self._allowed_plugins_for_slot = {}
+
     def register(self, plugin):
         """
         Make a plugin known to the CMS.
@@ -103,10 +110,13 @@ class PluginPool:
         plugin_instance = plugin()
         self.plugins[name] = plugin_instance
         self._name_for_model[plugin.model] = name  # Track reverse for model.plugin link
+        self._plugin_for_model[plugin.model] = plugin_instance
+        self._allowed_plugins_for_slot = {}
 
         # Only update lazy indexes if already created
         if self._name_for_ctype_id is not None:
             self._name_for_ctype_id[plugin.type_id] = name
+            self._plugin_for_ctype_id[plugin.type_id] = plugin_instance
 
         return plugin  # Allow decorator syntax
 
@@ -120,15 +130,23 @@ class PluginPool:
     def get_allowed_plugins(self, placeholder_slot):
         """
         Return the plugins which are supported in the given placeholder name.
+
+        .. versionchanged:: 3.2
+           The result is computed once per slot.
         """
+        try:
+            return list(self._allowed_plugins_for_slot[placeholder_slot])
+        except KeyError:
+            pass
+
         # See if there is a limit imposed.
         slot_config = appsettings.FLUENT_CONTENTS_PLACEHOLDER_CONFIG.get(placeholder_slot) or {}
         plugins = slot_config.get("plugins")
         if not plugins:
-            return self.get_plugins()
+            allowed_plugins = self.get_plugins()
         else:
             try:
-                return self.get_plugins_by_name(*plugins)
+                allowed_plugins = self.get_plugins_by_name(*plugins)
             except PluginNotFound as e:
                 raise PluginNotFound(
                     str(e)
@@ -137,6 +155,9 @@ class PluginPool:
                     )
                 )
 
+        self._allowed_plugins_for_slot[placeholder_slot] = tuple(allowed_plugins)
+        return allowed_plugins
+
     def get_plugins_by_name(self, *names):
         """
         Return a list of plugins by plugin class, or name.
@@ -151,7 +172,7 @@ class PluginPool:
                     raise PluginNotFound(f"No plugin named '{name}'.")
             elif isinstance(name, type) and issubclass(name, ContentPlugin):
                 # Will also allow classes instead of strings.
-                plugin_instances.append(self.plugins[self._name_for_model[name.model]])
+                plugin_instances.append(self._plugin_for_model[name.model])
             else:
                 raise TypeError(
                     "get_plugins_by_name() expects a plugin name or class, not: {}".format(name)
@@ -171,25 +192,47 @@ class PluginPool:
 
         You can also use the :attr:`ContentItem.plugin <fluent_contents.models.ContentItem.plugin>` property directly.
         This is the low-level function that supports that feature.
+
+        .. versionchanged:: 3.2
+           When the plugin is not registered yet, only the module that registers it is imported.
         """
-        self._import_plugins()  # could happen during rendering that no plugin scan happened yet.
+        try:
+            # Fast path for rendering, the plugin is registered already.
+            return self._plugin_for_model[model_class]
+        except KeyError:
+            pass
 
         # Avoid confusion between model instance and class here:
         assert issubclass(model_class, ContentItem)
 
+        # Could happen during rendering that no plugin scan happened yet.
+        self._import_plugin_module(model_class)
+        if model_class not in self._plugin_for_model:
+            self._import_plugins()
+
         try:
-            name = self._name_for_model[model_class]
+            return self._plugin_for_model[model_class]
         except KeyError:
             raise PluginNotFound(f"No plugin found for model '{model_class.__name__}'.")
-        return self.plugins[name]
 
     def _get_plugin_by_content_type(self, contenttype):
-        self._import_plugins()
-        self._setup_lazy_indexes()
-
         ct_id = contenttype.id if isinstance(contenttype, ContentType) else int(contenttype)
         try:
-            name = self._name_for_ctype_id[ct_id]
+            # Fast path for rendering, the content type was resolved before.
+            return self._plugin_for_ctype_id[ct_id]
+        except KeyError:
+            pass
+
+        if not self.detected:
+            # Only import the plugin of this content type, instead of scanning all apps.
+            plugin = self._get_plugin_by_content_type_model(ct_id)
+            if plugin is not None:
+                self._plugin_for_ctype_id[ct_id] = plugin
+                return plugin
+
+        self._setup_lazy_indexes()
+        try:
+            return self._plugin_for_ctype_id[ct_id]
         except KeyError:
             # ContentType not found, likely a plugin is no longer registered or the app has been removed.
             try:
@@ -207,7 +250,35 @@ class PluginPool:
                 "No plugin found for content type #{} ({}).".format(contenttype, ct_name)
             )
 
-        return self.plugins[name]
+    def _get_plugin_by_content_type_model(self, ct_id):
+        # The ContentType objects are cached by Django, so this rarely queries the database.
+        try:
+            model = ContentType.objects.get_for_id(ct_id).model_class()
+        except ContentType.DoesNotExist:
+            return None
+
+        if model is None or not issubclass(model, ContentItem):
+            return None
+
+        try:
+            plugin = self.get_plugin_by_model(model)
+        except PluginNotFound:
+            return None
+        return plugin if plugin.type_id == ct_id else None
+
+    def _import_plugin_module(self, model_class):
+        """
+        Internal function, import the module that registers the plugin of a model.
+        This avoids importing all plugins when a site only renders a few of them.
+        """
+        if self.detected:
+            return
+
+        module_name = appsettings.FLUENT_CONTENTS_PLUGIN_MODULES.get(model_class._meta.label)
+        if module_name is None:
+            # By convention, the plugin is found in the app of the model.
+            module_name = f"{model_class._meta.app_config.name}.content_plugins"
+        import_module_or_none(module_name)
 
     def _import_plugins(self):
         """
@@ -244,6 +315,9 @@ class PluginPool:
                     )
                 plugin_ctypes[ct_id] = name
 
+            self._plugin_for_ctype_id.update(
+                (ct_id, self.plugins[name]) for ct_id, name in plugin_ctypes.items()
+            )
             self._name_for_ctype_id = plugin_ctypes
 
 
@@ -0,0 +1,14 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("fluent_contents", "0001_initial")]
+
+    operations = [
+        migrations.AddField(
+            model_name="contentitem",
+            name="render_payload",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
@@ -13,17 +13,25 @@ Secondly, there are a few possible fields to add to parent models:
 Finally, to exchange template data, a :class:`PlaceholderData` object is available
 which mirrors the relevant fields of the :class:`Placeholder` model.
 """
+import hashlib
+import struct
+import zlib
+
 import django
 from django.core.cache.backends.base import DEFAULT_TIMEOUT
 from django.forms import Media
 from django.utils.html import conditional_escape
 from django.utils.safestring import SafeData, mark_safe
 
+from fluent_contents import appsettings
+from fluent_contents.cache import _get_media_cache_key, cache
 from fluent_contents.models.db import ContentItem, Placeholder
 from fluent_contents.models.fields import (
     ContentItemRelation,
     PlaceholderField,
     PlaceholderRelation,
+    prefetch_contentitems,
+    prefetch_placeholders,
 )
 from fluent_contents.models.managers import (
     ContentItemManager,
@@ -38,6 +46,8 @@ __all__ = (
     "PlaceholderData",
     "ContentItemOutput",
     "ImmutableMedia",
+    "intern_media",
+    "get_media_keys",
     "PlaceholderManager",
     "ContentItemManager",
     "get_parent_lookup_kwargs",
@@ -45,6 +55,8 @@ __all__ = (
     "PlaceholderField",
     "PlaceholderRelation",
     "ContentItemRelation",
+    "prefetch_placeholders",
+    "prefetch_contentitems",
 )
 
 _ALLOWED_ROLES = list(dict(Placeholder.ROLES).keys())
@@ -115,6 +127,111 @@ class PlaceholderData:
         )
 
 
+_OUTPUT_FORMAT_VERSION = 1
+_OUTPUT_HEADER = struct.Struct(">BBI")
+_OUTPUT_FLAG_MEDIA = 0x01
+_OUTPUT_FLAG_ZLIB = 0x02
+_OUTPUT_FLAG_ZSTD = 0x04
+
+# The same media is used by many cached items, only decode it once per process.
+_decoded_media = {}
+_DECODED_MEDIA_MAX_ENTRIES = 500
+
+
+def _has_media(media):
+    return any(media._css_lists) or any(media._js_lists)
+
+
+def _encode_media(media):
+    """
+    Return the digest of the media, which is stored in the output instead of the media itself.
+    """
+    try:
+        # The digest is stored at the object, as intern_media() shares it.
+        digest = media.__dict__["_fluent_contents_digest"]
+    except KeyError:
+        media_keys = repr(get_media_keys(media)).encode("utf-8")
+        digest = hashlib.blake2b(media_keys, digest_size=16).digest()
+        media._fluent_contents_digest = digest
+
+    if digest not in _decoded_media:
+        _remember_media(digest, intern_media(media))
+    return digest
+
+
+def _decode_media(digest):
+    """
+    Return the media object for a digest of :func:`_encode_media`,
+    or ``None`` when the media definition is no longer available.
+    """
+    try:
+        return _decoded_media[digest]
+    except KeyError:
+        pass
+
+    # Written by another process, or before this process was restarted.
+    definition = cache.get(_get_media_cache_key(digest))
+    if definition is None:
+        return None
+
+    media = Media()
+    media._css_lists, media._js_lists = definition
+    media = intern_media(media)
+    _remember_media(digest, media)
+    return media
+
+
+def _remember_media(key, media):
+    if len(_decoded_media) >= _DECODED_MEDIA_MAX_ENTRIES:
+        _decoded_media.clear()
+    _decoded_media[key] = media
+
+
+def _add_media_definitions(data):
+    """
+    Return the values to cache, including the media definitions of the :class:`ContentItemOutput` objects.
+    These are stored in the same call, so other processes can decode the output.
+    """
+    definitions = {}
+    for value in data.values():
+        if isinstance(value, ContentItemOutput) and _has_media(value.media):
+            media_key = _get_media_cache_key(_encode_media(value.media))
+            definitions[media_key] = (value.media._css_lists, value.media._js_lists)
+
+    if not definitions:
+        return data
+
+    definitions.update(data)
+    return definitions
+
+
+def _decode_output_state(state):
+    """
+    Decode the byte string of :func:`ContentItemOutput.__getstate__`.
+    Returns the HTML and the (shared) media object, which is ``None`` when it's no longer available.
+    """
+    version, flags, media_length = _OUTPUT_HEADER.unpack_from(state)
+    if version != _OUTPUT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported ContentItemOutput format version: {version}")
+
+    offset = _OUTPUT_HEADER.size
+    media = ImmutableMedia.empty_instance
+    if flags & _OUTPUT_FLAG_MEDIA:
+        media_data = state[offset : offset + media_length]
+        offset += media_length
+        media = _decode_media(media_data)
+
+    html_data = state[offset:]
+    if flags & _OUTPUT_FLAG_ZSTD:
+        import zstandard
+
+        html_data = zstandard.ZstdDecompressor().decompress(html_data)
+    elif flags & _OUTPUT_FLAG_ZLIB:
+        html_data = zlib.decompress(html_data)
+
+    return html_data.decode("utf-8"), media
+
+
 class ContentItemOutput(SafeData):
     """
     A wrapper with holds the rendered output of a plugin,
@@ -125,6 +242,9 @@ class ContentItemOutput(SafeData):
     but also allows reading the :attr:`html` and :attr:`media` attributes.
     """
 
+    # Set when the cached media definition is no longer available.
+    _media_missing = False
+
     def __init__(self, html, media=None, cacheable=True, cache_timeout=DEFAULT_TIMEOUT):
         self.html = conditional_escape(html)  # enforce consistency
         self.media = media or ImmutableMedia.empty_instance
@@ -151,16 +271,50 @@ class ContentItemOutput(SafeData):
         return str(self).__getitem__(item)
 
     def __getstate__(self):
-        return (str(self.html), self.media._css_lists, self.media._js_lists)
+        # Store a compact byte string, instead of pickling the media lists each time.
+        # The format is: a header with the version, flags and media length; the media key and the HTML.
+        flags = 0
+        media_data = b""
+        if _has_media(self.media):
+            flags |= _OUTPUT_FLAG_MEDIA
+            media_data = _encode_media(self.media)
+
+        html_data = str(self.html).encode("utf-8")
+        compression = appsettings.FLUENT_CONTENTS_CACHE_COMPRESSION
+        if (
+            compression
+            and len(html_data) >= appsettings.FLUENT_CONTENTS_CACHE_COMPRESSION_THRESHOLD
+        ):
+            if compression == "zstd":
+                import zstandard
+
+                flags |= _OUTPUT_FLAG_ZSTD
+                html_data = zstandard.ZstdCompressor().compress(html_data)
+            else:
+                flags |= _OUTPUT_FLAG_ZLIB
+                html_data = zlib.compress(html_data)
+
+        header = _OUTPUT_HEADER.pack(_OUTPUT_FORMAT_VERSION, flags, len(media_data))
+        return b"".join((header, media_data, html_data))
 
     def __setstate__(self, state):
         # Handle pickling manually, otherwise invokes __getattr__ in a loop.
         # (the first call goes to __setstate__, while self.html isn't set so __getattr__ is invoked again)
-        html_str, css, js = state
-        self.html = mark_safe(html_str)
         self.cacheable = True  # Implied by retrieving from cache.
         self.cache_timeout = DEFAULT_TIMEOUT
-
+        if not isinstance(state, tuple):
+            html_str, media = _decode_output_state(state)
+            self.html = mark_safe(html_str)
+            if media is None:
+                # The cache treats this as a missing entry, so the output is rendered again.
+                self._media_missing = True
+                media = ImmutableMedia.empty_instance
+            self.media = media
+            return
+
+        # cache from 3.1 version and older.
+        html_str, css, js = state
+        self.html = mark_safe(html_str)
         if not css and not js:
             self.media = ImmutableMedia.empty_instance
         else:
@@ -176,9 +330,9 @@ class ContentItemOutput(SafeData):
         """
         Insert more media files to the output. (internal-private for now).
         """
-        # Upgrade the performance-optimization of ImmediateMedia to an editable object.
+        # Media objects are treated as immutable, so the object can be shared.
         if self.media is ImmutableMedia.empty_instance:
-            self.media = Media() + media
+            self.media = media
         else:
             # Needs to be merged as new copy, can't risk merging the 'media' object
             self.media = media + self.media
@@ -208,3 +362,58 @@ class ImmutableMedia(Media):
 
 
 ImmutableMedia.empty_instance = ImmutableMedia()
+
+# The registry of shared media objects, see intern_media()
+_media_registry = {}
+_MEDIA_REGISTRY_MAX_ENTRIES = 1000
+
+
+def intern_media(media):
+    """
+    .. versionadded:: 3.2
+       Return a shared :class:`~django.forms.Media` object for the given media.
+
+    Media with the same definition returns the same object,
+    which avoids creating copies for every rendered item.
+    The returned object should be treated as immutable.
+    """
+    if media is ImmutableMedia.empty_instance:
+        return media
+
+    css_keys, js_keys = get_media_keys(media)
+    key = (css_keys, js_keys)
+    try:
+        return _media_registry[key]
+    except KeyError:
+        pass
+
+    if not any(css_keys) and not any(js_keys):
+        return ImmutableMedia.empty_instance
+
+    if len(_media_registry) >= _MEDIA_REGISTRY_MAX_ENTRIES:
+        _media_registry.clear()
+    _media_registry[key] = media
+    return media
+
+
+def get_media_keys(media):
+    """
+    .. versionadded:: 3.2
+       Return a hashable key for every CSS and JavaScript list in the media object.
+       These keys allow to merge media without duplicate entries.
+    """
+    try:
+        # The keys are stored at the object, as intern_media() shares it.
+        return media.__dict__["_fluent_contents_keys"]
+    except KeyError:
+        pass
+
+    keys = (
+        tuple(
+            tuple((medium, tuple(paths)) for medium, paths in sorted(css.items()))
+            for css in media._css_lists
+        ),
+        tuple(tuple(js) for js in media._js_lists),
+    )
+    media._fluent_contents_keys = keys
+    return keys
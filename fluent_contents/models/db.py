@@ -1,7 +1,9 @@
 from copy import deepcopy
 
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.sites.models import Site
 from django.db import connection, models
 from django.db.backends.utils import truncate_name
 from django.dispatch import receiver
@@ -14,7 +16,15 @@ from polymorphic.base import PolymorphicModelBase
 from polymorphic.models import PolymorphicModel
 
 from fluent_contents import appsettings
-from fluent_contents.cache import get_placeholder_cache_key
+from fluent_contents.cache import (
+    _get_placeholder_cache_key_prefix,
+    bump_cache_generation,
+    cache,
+    get_placeholder_cache_key,
+    get_placeholder_fallback_cache_key,
+    get_placeholder_items_cache_key,
+    get_placeholder_site_cache_key,
+)
 from fluent_contents.models.managers import (
     ContentItemManager,
     PlaceholderManager,
@@ -26,7 +36,7 @@ from fluent_contents.models.mixins import CachedModelMixin
 OPTIMIZE_TRANSLATED_MODEL = True
 
 
-class Placeholder(models.Model):
+class Placeholder(CachedModelMixin, models.Model):
     """
     The placeholder groups various :class:`ContentItem` models together in a single compartment.
     It is the reference point to render custom content.
@@ -79,6 +89,9 @@ class Placeholder(models.Model):
 
     objects = PlaceholderManager()
 
+    # The output of a missing placeholder is cached too, so clear it when it's created.
+    clear_cache_on_add = True
+
     class Meta:
         app_label = "fluent_contents"  # required for subfolder
         verbose_name = _("Placeholder")
@@ -107,17 +120,7 @@ class Placeholder(models.Model):
         By passing the :attr:`parent` object, the items can additionally
         be filtered by the parent language.
         """
-        # Optimization: if the parent is a TranslatableModel,
-        # the code can already tell if there can be any content items.
-        # If there is no translation for a current language, avoid trying to fetch items.
-        # This speeds up sites where all content exists in fallback languages only.
-        if (
-            OPTIMIZE_TRANSLATED_MODEL
-            and parent is not None
-            and limit_parent_language
-            and isinstance(parent, TranslatableModel)
-            and not parent.has_translation()
-        ):
+        if _is_untranslated_parent(parent, limit_parent_language):
             return ContentItem.objects.none()
 
         item_qs = self.contentitems.all()  # django-polymorphic FTW!
@@ -170,6 +173,50 @@ class Placeholder(models.Model):
 
     delete.alters_data = True
 
+    def clear_cache(self):
+        """
+        .. versionadded:: 3.2
+
+        Delete the cached output of the placeholder.
+        When :ref:`FLUENT_CONTENTS_CACHE_GENERATIONS` is enabled,
+        the cache generation of the parent object is increased instead.
+        """
+        if not appsettings.FLUENT_CONTENTS_CACHE_GENERATIONS:
+            return super().clear_cache()
+
+        bump_cache_generation(self.parent_type_id, self.parent_id)
+
+    clear_cache.alters_data = True
+
+    def get_cache_keys(self):
+        """
+        .. versionadded:: 3.2
+
+        Get a list of all cache keys associated with this model.
+        These are the output keys and item lists of the placeholder in every language.
+        """
+        keys = []
+        for language_code in _get_language_codes() + [None]:
+            keys += [
+                get_placeholder_cache_key(self, language_code),
+                get_placeholder_items_cache_key(self, language_code),
+            ]
+        return keys
+
+
+def _is_untranslated_parent(parent, limit_parent_language=True):
+    # Optimization: if the parent is a TranslatableModel,
+    # the code can already tell if there can be any content items.
+    # If there is no translation for a current language, avoid trying to fetch items.
+    # This speeds up sites where all content exists in fallback languages only.
+    return (
+        OPTIMIZE_TRANSLATED_MODEL
+        and parent is not None
+        and limit_parent_language
+        and isinstance(parent, TranslatableModel)
+        and not parent.has_translation()
+    )
+
 
 class ContentItemMetaClass(PolymorphicModelBase):
     """
@@ -290,6 +337,9 @@ class ContentItem(CachedModelMixin, PolymorphicModel, metaclass=ContentItemMetaC
     )
     sort_order = models.IntegerField(default=1, db_index=True)
 
+    # A copy of the values the plugin needs for rendering, see ContentPlugin.render_payload_fields
+    render_payload = models.TextField(blank=True, default="", editable=False)
+
     @cached_property
     def plugin(self):
         """
@@ -400,10 +450,37 @@ class ContentItem(CachedModelMixin, PolymorphicModel, metaclass=ContentItemMetaC
                 or appsettings.FLUENT_CONTENTS_DEFAULT_LANGUAGE_CODE
             )
 
+        if self.__class__ is not ContentItem:
+            # Store the values for rendering without reading the derived table.
+            from fluent_contents.extensions import PluginNotFound
+
+            try:
+                self.render_payload = self.plugin.get_render_payload(self)
+            except PluginNotFound:
+                pass
+
         super().save(*args, **kwargs)
 
     save.alters_data = True
 
+    def clear_cache(self):
+        """
+        Delete the cache keys associated with this model.
+
+        .. versionchanged:: 3.2
+           When :ref:`FLUENT_CONTENTS_CACHE_GENERATIONS` is enabled,
+           the cache generation of the parent object is increased instead of deleting all keys.
+           Only the keys of plugins with custom cache keys are still deleted.
+        """
+        if not appsettings.FLUENT_CONTENTS_CACHE_GENERATIONS:
+            return super().clear_cache()
+
+        bump_cache_generation(self.parent_type_id, self.parent_id)
+        if self.placeholder_id and self.plugin.has_custom_output_cache_keys():
+            cache.delete_many(self.plugin.get_output_cache_keys(self.placeholder.slot, self))
+
+    clear_cache.alters_data = True
+
     def get_cache_keys(self):
         """
         Get a list of all cache keys associated with this model.
@@ -413,18 +490,102 @@ class ContentItem(CachedModelMixin, PolymorphicModel, metaclass=ContentItemMetaC
             # TODO: prune old placeholder slot name?
             return []
 
+        site_ids = _get_site_ids() if _get_per_site_placeholder_ids([self]) else None
+        return self._get_cache_keys(site_ids)
+
+    def _get_cache_keys(self, site_ids=None):
+        # The keys of get_cache_keys(), site_ids is given when the placeholder output is cached per site.
         # As plugins can change the output caching,
         # they should also return those keys where content is stored at.
         placeholder = self.placeholder
         keys = [
             # Always make sure the base placeholder is cleared,
             # regardless whether get_output_cache_keys() is overwritten.
-            get_placeholder_cache_key(placeholder, self.language_code)
+            get_placeholder_cache_key(placeholder, self.language_code),
+            # The parent object could be untranslated,
+            # that output is cached without language, even when it's empty.
+            get_placeholder_cache_key(placeholder, None),
+            # The list of items in the placeholder.
+            get_placeholder_items_cache_key(placeholder, self.language_code),
+            get_placeholder_items_cache_key(placeholder, None),
         ]
         keys.extend(self.plugin.get_output_cache_keys(placeholder.slot, self))
+
+        # The placeholder output could be cached as fallback:
+        # other languages may display this item, or this language displayed a fallback before.
+        for language_code in _get_language_codes():
+            keys += [
+                get_placeholder_fallback_cache_key(
+                    get_placeholder_cache_key(placeholder, language_code), self.language_code
+                ),
+                get_placeholder_fallback_cache_key(keys[0], language_code),
+            ]
+
+        if site_ids:
+            # The placeholder output is cached per site when it contains items of such plugins.
+            placeholder_key_prefix = _get_placeholder_cache_key_prefix(
+                placeholder.parent_type_id, placeholder.parent_id, placeholder.slot
+            )
+            placeholder_keys = [key for key in keys if key.startswith(placeholder_key_prefix)]
+            for site_id in site_ids:
+                keys.extend(
+                    get_placeholder_site_cache_key(key, site_id) for key in placeholder_keys
+                )
         return keys
 
 
+def _get_contentitems_cache_keys(items):
+    """
+    Return the :func:`~ContentItem.get_cache_keys` of multiple items,
+    while the placeholders that are cached per site are determined only once.
+    """
+    items = [item for item in items if item.placeholder_id]
+    per_site_ids = _get_per_site_placeholder_ids(items)
+    site_ids = _get_site_ids() if per_site_ids else None
+
+    keys = []
+    for item in items:
+        keys += item._get_cache_keys(site_ids if item.placeholder_id in per_site_ids else None)
+    return keys
+
+
+def _get_per_site_placeholder_ids(items):
+    # Only placeholders with items of per-site plugins store their output per site.
+    from fluent_contents.extensions import plugin_pool
+
+    per_site_ids = {item.placeholder_id for item in items if item.plugin.cache_output_per_site}
+    placeholder_ids = {item.placeholder_id for item in items} - per_site_ids
+    type_ids = [
+        plugin.type_id for plugin in plugin_pool.get_plugins() if plugin.cache_output_per_site
+    ]
+    if placeholder_ids and type_ids:
+        per_site_ids.update(
+            ContentItem.objects.filter(
+                placeholder_id__in=placeholder_ids, polymorphic_ctype_id__in=type_ids
+            ).values_list("placeholder_id", flat=True)
+        )
+    return per_site_ids
+
+
+def _get_language_codes():
+    # All languages that could be used to render content.
+    language_codes = [code for code, _ in settings.LANGUAGES]
+    for language_code in (
+        settings.LANGUAGE_CODE,
+        appsettings.FLUENT_CONTENTS_DEFAULT_LANGUAGE_CODE,
+    ):
+        if language_code not in language_codes:
+            language_codes.append(language_code)
+    return language_codes
+
+
+def _get_site_ids():
+    site_ids = list(Site.objects.values_list("pk", flat=True))
+    if settings.SITE_ID not in site_ids:
+        site_ids.append(settings.SITE_ID)
+    return site_ids
+
+
 # Instead of overriding the admin classes (effectively inserting the TranslatableAdmin
 # in all your PlaceholderAdmin subclasses too), a signal is handled instead.
 # It's up to you to decide whether the use the TranslatableAdmin (or any other similar class)
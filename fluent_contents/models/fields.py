@@ -2,6 +2,7 @@ import django
 from django.contrib.contenttypes.fields import GenericRel, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.db import DEFAULT_DB_ALIAS
+from django.db.models import F
 from django.db.models.query_utils import Q
 from django.utils.functional import lazy
 from django.utils.text import capfirst
@@ -11,7 +12,13 @@ from fluent_contents.forms.fields import PlaceholderFormField
 
 from .db import ContentItem, Placeholder
 
-__all__ = ("PlaceholderRelation", "ContentItemRelation", "PlaceholderField")
+__all__ = (
+    "PlaceholderRelation",
+    "ContentItemRelation",
+    "PlaceholderField",
+    "prefetch_placeholders",
+    "prefetch_contentitems",
+)
 
 # The PlaceholderField is inspired by Django CMS
 # Yet uses a different methology to access the fields.
@@ -121,9 +128,21 @@ class PlaceholderFieldDescriptor:
         """Return the placeholder by slot."""
         if instance is None:
             return self
+
+        # The placeholder is cached at the instance,
+        # which is also filled by prefetch_placeholders()
+        placeholders = _get_placeholder_cache(instance)
         try:
-            placeholder = Placeholder.objects.get_by_slot(instance, self.slot)
-        except Placeholder.DoesNotExist:
+            placeholder = placeholders[self.slot]
+        except KeyError:
+            try:
+                placeholder = Placeholder.objects.get_by_slot(instance, self.slot)
+            except Placeholder.DoesNotExist:
+                placeholder = None
+            else:
+                placeholders[self.slot] = placeholder
+
+        if placeholder is None:
             raise Placeholder.DoesNotExist(
                 "Placeholder does not exist for parent {} (type_id: {}, parent_id: {}), slot: '{}'".format(
                     repr(instance),
@@ -132,9 +151,9 @@ class PlaceholderFieldDescriptor:
                     self.slot,
                 )
             )
-        else:
-            placeholder.parent = instance  # fill the reverse cache
-            return placeholder
+
+        placeholder.parent = instance  # fill the reverse cache
+        return placeholder
 
     def __set__(self, instance, value):
         if instance is None:
@@ -148,6 +167,145 @@ class PlaceholderFieldDescriptor:
         )
 
 
+def _get_placeholder_cache(instance):
+    # The cache of the PlaceholderFieldDescriptor, which holds a placeholder (or None) per slot.
+    # It's reset when the object is saved as a copy, which changes the primary key.
+    try:
+        pk, placeholders = instance.__dict__["_placeholder_cache"]
+    except KeyError:
+        pass
+    else:
+        if pk == instance.pk:
+            return placeholders
+
+    placeholders = {}
+    instance.__dict__["_placeholder_cache"] = (instance.pk, placeholders)
+    return placeholders
+
+
+def prefetch_placeholders(instances, *field_names):
+    """
+    .. versionadded:: 3.2
+       Fetch the placeholders of multiple objects in a single query.
+
+    This avoids a query for every object when the placeholder fields are accessed,
+    for example when displaying ``{% render_placeholder article.contents %}`` in a list view:
+
+    .. code-block:: python
+
+        articles = prefetch_placeholders(Article.objects.all(), "contents")
+
+    :param instances: The objects (or queryset) that have a :class:`PlaceholderField`.
+    :param field_names: The names of the placeholder fields to fetch. By default, all fields are fetched.
+    :returns: A list of the objects.
+    """
+    instances = list(instances)
+    if not instances:
+        return instances
+
+    # Group by model, as the objects could be polymorphic.
+    # Missing placeholders are also cached, so accessing those doesn't perform a query either.
+    by_model = {}
+    for instance in instances:
+        by_model.setdefault(instance.__class__, []).append(instance)
+
+    for model, model_instances in by_model.items():
+        placeholder_fields = getattr(model, "_meta_placeholder_fields", {})
+        try:
+            slots = [placeholder_fields[name].slot for name in field_names or placeholder_fields]
+        except KeyError as e:
+            raise ValueError(f"Model {model.__name__} has no PlaceholderField {e}")
+
+        if not slots:
+            continue
+
+        instances_by_id = {}
+        for instance in model_instances:
+            placeholders = _get_placeholder_cache(instance)
+            for slot in slots:
+                placeholders[slot] = None
+            instances_by_id.setdefault(instance.pk, []).append(instance)
+
+        placeholder_qs = Placeholder.objects.filter(
+            parent_type=ContentType.objects.get_for_model(model),
+            parent_id__in=list(instances_by_id),
+            slot__in=slots,
+        )
+        for placeholder in placeholder_qs:
+            for instance in instances_by_id[placeholder.parent_id]:
+                _get_placeholder_cache(instance)[placeholder.slot] = placeholder
+
+    return instances
+
+
+def prefetch_contentitems(parent_objects, slots=None, languages=None):
+    """
+    .. versionadded:: 3.2
+       Fetch the content items of multiple objects in a single query.
+
+    The items are grouped by parent, slot and language, and stored at the parent objects.
+    The rendering functions use these items instead of querying the items of each placeholder.
+    The rendered output is still cached, only the items that need to be rendered
+    are fetched from their derived tables (using a single query per content item type).
+
+    .. code-block:: python
+
+        articles = prefetch_placeholders(Article.objects.all(), "contents")
+        prefetch_contentitems(articles, slots=["article_contents"])
+
+    :param parent_objects: The parent objects (or queryset) of the content items.
+    :param slots: Optional, only fetch the items of these placeholder slots.
+    :param languages: Optional, only fetch the items of these languages.
+    :returns: A list of the parent objects.
+    """
+    parent_objects = list(parent_objects)
+    if not parent_objects:
+        return parent_objects
+
+    slots = frozenset(slots) if slots is not None else None
+    languages = frozenset(languages) if languages is not None else None
+    groups_by_parent = {}
+    for parent_object in parent_objects:
+        parent_type = ContentType.objects.get_for_model(parent_object)
+        groups = groups_by_parent.setdefault((parent_type.id, parent_object.pk), {})
+        parent_object.__dict__["_contentitem_cache"] = (parent_object.pk, slots, languages, groups)
+
+    items = (
+        ContentItem.objects.for_parents(parent_objects, slots=slots, languages=languages)
+        .annotate(prefetched_slot=F("placeholder__slot"))
+        .non_polymorphic()
+    )
+    for contentitem in items:
+        groups = groups_by_parent[(contentitem.parent_type_id, contentitem.parent_id)]
+        key = (contentitem.prefetched_slot, contentitem.language_code)
+        groups.setdefault(key, []).append(contentitem)
+
+    return parent_objects
+
+
+def _get_prefetched_contentitems(parent_object, slot, language_code=None):
+    # Return the items that prefetch_contentitems() stored for a parent slot,
+    # or None when these are not prefetched. Without language, the items of all languages are returned.
+    try:
+        pk, slots, languages, groups = parent_object.__dict__["_contentitem_cache"]
+    except (KeyError, AttributeError):
+        return None
+
+    if pk != parent_object.pk or (slots is not None and slot not in slots):
+        return None
+
+    if language_code is not None:
+        if languages is not None and language_code not in languages:
+            return None
+        return list(groups.get((slot, language_code), ()))
+    elif languages is not None:
+        return None
+    else:
+        items = [item for key, items in groups.items() if key[0] == slot for item in items]
+        items.sort(key=lambda item: item.sort_order)
+        return items
+
+
 class PlaceholderField(PlaceholderRelation):
     """
     The model field to add :class:`~fluent_contents.models.ContentItem` objects to a model.
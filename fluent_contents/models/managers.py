@@ -4,6 +4,7 @@ The manager classes are accessed via ``Placeholder.objects``.
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import get_language
 from parler import appsettings as parler_appsettings
 from parler.utils import get_language_title
@@ -45,6 +46,12 @@ class PlaceholderManager(models.Manager):
             **parent_attrs
         )
         obj.parent = parent_object  # fill the reverse cache
+
+        # Also update the cache of the PlaceholderField descriptor
+        if parent_object is not None and "_placeholder_cache" in parent_object.__dict__:
+            pk, placeholders = parent_object._placeholder_cache
+            if pk == parent_object.pk:
+                placeholders[slot] = obj
         return obj
 
 
@@ -98,6 +105,35 @@ class ContentItemQuerySet(PolymorphicQuerySet):
 
         return self.filter(**lookup)
 
+    def for_parents(self, parent_objects, slots=None, languages=None):
+        """
+        .. versionadded:: 3.2
+
+        Return all content items which are associated with the given parent objects.
+
+        :param parent_objects: The parent objects, which may have different models.
+        :param slots: Optional, only return the items of these placeholder slots.
+        :param languages: Optional, only return the items of these languages.
+        """
+        ids_by_type = {}
+        for parent_object in parent_objects:
+            parent_type = ContentType.objects.get_for_model(parent_object)
+            ids_by_type.setdefault(parent_type, []).append(parent_object.pk)
+
+        if not ids_by_type:
+            return self.none()
+
+        lookup = Q()
+        for parent_type, parent_ids in ids_by_type.items():
+            lookup |= Q(parent_type=parent_type, parent_id__in=parent_ids)
+
+        qs = self.filter(lookup)
+        if slots is not None:
+            qs = qs.filter(placeholder__slot__in=slots)
+        if languages is not None:
+            qs = qs.filter(language_code__in=languages)
+        return qs
+
     def clear_cache(self):
         """
         .. versionadded:: 1.0 Clear the cache of the selected entries.
@@ -168,6 +204,14 @@ class ContentItemManager(PolymorphicManager):
         """
         return self.all().parent(parent_object, limit_parent_language)
 
+    def for_parents(self, parent_objects, slots=None, languages=None):
+        """
+        .. versionadded:: 3.2
+
+        Return all content items which are associated with the given parent objects.
+        """
+        return self.all().for_parents(parent_objects, slots=slots, languages=languages)
+
     def create_for_placeholder(self, placeholder, sort_order=1, language_code=None, **kwargs):
         """
         Create a Content Item with the given parameters
@@ -1,4 +1,4 @@
-from django.core.cache import cache
+from fluent_contents.cache import cache
 
 
 class CachedModelMixin:
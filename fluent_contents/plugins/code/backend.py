@@ -1,7 +1,10 @@
 """
 Using pygments to render the code.
 """
-from django.utils.translation import gettext as _
+from functools import lru_cache
+
+from django.utils.functional import lazy
+from django.utils.translation import gettext_lazy as _
 from pygments import highlight, styles
 from pygments.formatters.html import HtmlFormatter
 from pygments.lexers import get_all_lexers, get_lexer_by_name
@@ -9,27 +12,50 @@ from pygments.styles import get_all_styles
 
 from fluent_contents.plugins.code import appsettings
 
-STYLE_CHOICES = [(x, x) for x in get_all_styles()]
-STYLE_CHOICES.sort(key=lambda x: x[1].lower())
-
-_languageChoices = [
-    (x[1][0], x[0]) for x in get_all_lexers() if x[1]
-]  # x = ('Title', ('name1', 'name2', 'nameN'), ('*.ext1', '*.ext2'), ('mimetype1',))
-_languageChoices.sort(key=lambda x: x[1].lower())
-
-LANGUAGE_CHOICES = tuple(t for t in _languageChoices if t[0] in appsettings.FLUENT_CODE_SHORTLIST)
-if not appsettings.FLUENT_CODE_SHORTLIST_ONLY:
-    LANGUAGE_CHOICES += ((_("Combinations"), [t for t in _languageChoices if "+" in t[0]]),)
-    LANGUAGE_CHOICES += (
-        (
-            _("Advanced"),
-            [
-                t
-                for t in _languageChoices
-                if "+" not in t[0] and t[0] not in appsettings.FLUENT_CODE_SHORTLIST
-            ],
-        ),
+
+# Scanning all lexers and styles is slow, as pygments loads all plugins for it.
+# The choices are only generated when the admin form or model validation needs them.
+@lru_cache(maxsize=None)
+def get_style_choices():
+    """
+    Return the choices for all available pygments styles.
+    """
+    style_choices = [(x, x) for x in get_all_styles()]
+    style_choices.sort(key=lambda x: x[1].lower())
+    return style_choices
+
+
+@lru_cache(maxsize=None)
+def get_language_choices():
+    """
+    Return the choices for all pygments languages,
+    the languages of the ``FLUENT_CODE_SHORTLIST`` setting are listed first.
+    """
+    _languageChoices = [
+        (x[1][0], x[0]) for x in get_all_lexers() if x[1]
+    ]  # x = ('Title', ('name1', 'name2', 'nameN'), ('*.ext1', '*.ext2'), ('mimetype1',))
+    _languageChoices.sort(key=lambda x: x[1].lower())
+
+    language_choices = tuple(
+        t for t in _languageChoices if t[0] in appsettings.FLUENT_CODE_SHORTLIST
     )
+    if not appsettings.FLUENT_CODE_SHORTLIST_ONLY:
+        language_choices += ((_("Combinations"), [t for t in _languageChoices if "+" in t[0]]),)
+        language_choices += (
+            (
+                _("Advanced"),
+                [
+                    t
+                    for t in _languageChoices
+                    if "+" not in t[0] and t[0] not in appsettings.FLUENT_CODE_SHORTLIST
+                ],
+            ),
+        )
+    return language_choices
+
+
+STYLE_CHOICES = lazy(get_style_choices, list)()
+LANGUAGE_CHOICES = lazy(get_language_choices, tuple)()
 
 
 def render_code(instance, style_name="default"):
@@ -14,6 +14,7 @@ class CodePlugin(ContentPlugin):
     category = ContentPlugin.PROGRAMMING
     admin_form_template = "admin/fluent_contents/plugins/code/admin_form.html"
     render_template = "fluent_contents/plugins/code/code.html"
+    render_thread_safe = True
 
     class Media:
         css = {"screen": ("fluent_contents/code/code_admin.css",)}
@@ -13,6 +13,7 @@ from fluent_contents.plugins.gist.models import GistItem
 class GistPlugin(ContentPlugin):
     model = GistItem
     category = ContentPlugin.PROGRAMMING
+    render_thread_safe = True
 
     def render(self, request, instance, **kwargs):
         url = f"http://gist.github.com/{instance.gist_id}.js"
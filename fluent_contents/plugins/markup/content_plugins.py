@@ -32,6 +32,7 @@ class MarkupPluginBase(ContentPlugin):
     form = MarkupItemForm
     admin_form_template = ContentPlugin.ADMIN_TEMPLATE_WITHOUT_LABELS
     search_output = True
+    render_thread_safe = True
 
     class Media:
         css = {"screen": ("fluent_contents/plugins/markup/markup_admin.css",)}
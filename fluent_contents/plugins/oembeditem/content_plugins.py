@@ -15,6 +15,7 @@ class OEmbedPlugin(ContentPlugin):
     category = ContentPlugin.MEDIA
     admin_form_template = "admin/fluent_contents/plugins/oembeditem/admin_form.html"
     render_template = "fluent_contents/plugins/oembed/default.html"
+    render_thread_safe = True
 
     #: Custom render template
     render_template_base = "fluent_contents/plugins/oembed/{type}.html"
@@ -0,0 +1,21 @@
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
+
+
+class SharedContentConfig(AppConfig):
+    """
+    App configuration for the sharedcontent plugin.
+    """
+
+    name = "fluent_contents.plugins.sharedcontent"
+
+    def ready(self):
+        from fluent_contents.models import ContentItem
+
+        from .models import on_contentitem_change
+
+        # Only listen to the content item models, instead of all models in the project.
+        for model in apps.get_models():
+            if issubclass(model, ContentItem):
+                post_save.connect(on_contentitem_change, sender=model)
+                post_delete.connect(on_contentitem_change, sender=model)
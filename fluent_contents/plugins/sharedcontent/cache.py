@@ -10,10 +10,26 @@ def get_shared_content_cache_key_ptr(site_id, slug, language_code):
 
     This key is an indirection for the actual cache key,
     which is based on the object ID and parent ID.
+
+    .. versionchanged:: 3.2
+       The ``{% sharedcontent %}`` tag no longer uses this key,
+       the output is stored under :func:`get_shared_content_output_cache_key` instead.
     """
     return f"sharedcontent_key.{site_id}.{slug}.{language_code}"
 
 
+def get_shared_content_output_cache_key(site_id, slug, language_code):
+    """
+    .. versionadded:: 3.2
+
+    Get the cache key where the output of the ``{% sharedcontent %}`` tag is stored.
+
+    This key is based on the slug, so the output can be read without fetching the object first.
+    The output of all tags in a template is read in a single call.
+    """
+    return f"sharedcontent_output.{site_id}.{slug}.{language_code}"
+
+
 def get_shared_content_cache_key(sharedcontent):
     # Generate the key that render_placeholder() would use to store all output in.
     return get_placeholder_cache_key_for_parent(
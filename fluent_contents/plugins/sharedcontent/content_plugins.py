@@ -3,7 +3,11 @@ from django.conf import settings
 from fluent_contents import appsettings
 from fluent_contents.extensions import ContentItemForm, ContentPlugin, plugin_pool
 from fluent_contents.plugins.sharedcontent.models import SharedContentItem
-from fluent_contents.rendering import render_placeholder, render_placeholder_search_text
+from fluent_contents.rendering import (
+    is_edit_mode,
+    render_placeholder,
+    render_placeholder_search_text,
+)
 
 
 class SharedContentItemForm(ContentItemForm):
@@ -30,7 +34,9 @@ class SharedContentPlugin(ContentPlugin):
     model = SharedContentItem
     form = SharedContentItemForm
     category = ContentPlugin.ADVANCED
-    cache_output = False  # Caching happens via the placeholder/template tag.
+    # The output is cached, the SharedContent clears the items that display it when it changes.
+    # As the shared content is displayed in the current language, the output differs per language.
+    cache_output_per_language = True
     render_ignore_item_language = True  # Only switch for individual items
     search_fields = True  # Make sure the indexer processes this plugin too.
 
@@ -39,13 +45,18 @@ class SharedContentPlugin(ContentPlugin):
         # The render_placeholder() returns a ContentItemOutput object, which contains both the media and HTML code.
         # Hence, no mark_safe() or escaping is applied here.
         shared_content = instance.shared_content
-        return render_placeholder(
+        output = render_placeholder(
             request,
             shared_content.contents,
             parent_object=shared_content,
             fallback_language=True,
         )
 
+        if is_edit_mode(request):
+            # The output is wrapped with the placeholder markers, don't store that.
+            output.cacheable = False
+        return output
+
     # NOTE: typically, get_frontend_media() should be overwritten,
     # but render_placeholder() already tracks all media in the request.
 
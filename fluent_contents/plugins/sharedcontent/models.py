@@ -1,17 +1,20 @@
-from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.models import Site
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from parler.models import TranslatableModel, TranslatedFields
 
+from fluent_contents import appsettings
+from fluent_contents.cache import bump_cache_generation, cache
 from fluent_contents.models import (
     ContentItem,
     ContentItemManager,
     ContentItemRelation,
     PlaceholderField,
 )
+from fluent_contents.models.db import _get_contentitems_cache_keys, _get_language_codes
 from fluent_contents.models.mixins import CachedModelMixin
-from fluent_contents.plugins.sharedcontent.cache import get_shared_content_cache_key_ptr
+from fluent_contents.plugins.sharedcontent.cache import get_shared_content_output_cache_key
 
 from .managers import SharedContentManager
 from .utils import get_current_site_id
@@ -66,7 +69,7 @@ class SharedContent(CachedModelMixin, TranslatableModel):
         self._old_slug = self.slug
 
     def get_cache_keys(self):
-        # When the shared content is saved, make sure all rendering output PTRs are cleared.
+        # When the shared content is saved, make sure all rendering output of the tag is cleared.
         # The 'slug' could have changed. Whether the Placeholder output is cleared,
         # depends on whether those objects are altered too.
         if self.is_cross_site or self._was_cross_site:
@@ -74,14 +77,35 @@ class SharedContent(CachedModelMixin, TranslatableModel):
         else:
             sites = [self.parent_site_id]
 
+        slugs = {self._old_slug, self.slug}
         keys = []
         for site_id in sites:
-            for language_code, _ in settings.LANGUAGES:
-                keys.append(
-                    get_shared_content_cache_key_ptr(site_id, self._old_slug, language_code)
-                )
+            for language_code in _get_language_codes():
+                for slug in slugs:
+                    keys.append(get_shared_content_output_cache_key(site_id, slug, language_code))
         return keys
 
+    def clear_cache(self):
+        """
+        Delete the cached output of the ``{% sharedcontent %}`` tag.
+
+        .. versionchanged:: 3.2
+           The output of all placeholders that display this content
+           through a :class:`SharedContentItem` is cleared too.
+        """
+        super().clear_cache()
+        _clear_dependent_caches(self)
+
+    clear_cache.alters_data = True
+
+    def delete(self, *args, **kwargs):
+        # The items that display this content are removed by the database cascade,
+        # which no longer allows finding them afterwards. Clear their output beforehand.
+        _clear_dependent_caches(self)
+        return super().delete(*args, **kwargs)
+
+    delete.alters_data = True
+
 
 class SharedContentItem(ContentItem):
     """
@@ -103,3 +127,61 @@ class SharedContentItem(ContentItem):
 
     def __str__(self):
         return str(self.shared_content)
+
+
+def on_contentitem_change(instance, **kwargs):
+    """
+    Clear the output of the ``{% sharedcontent %}`` tag when one of it's items changes.
+    This signal handler is connected to all content item models by the app config.
+    """
+    if instance.parent_id is None:
+        return
+
+    if instance.parent_type_id == ContentType.objects.get_for_model(SharedContent).id:
+        for sharedcontent in SharedContent.objects.filter(pk=instance.parent_id):
+            sharedcontent.clear_cache()
+
+
+def _clear_dependent_caches(sharedcontent):
+    # The SharedContentItem objects form a reverse index of all placeholders that display a shared content.
+    # Clearing their cache also clears the output of the placeholder they are displayed in.
+    # When the item is placed in another shared content, the placeholders that display it are cleared too.
+    # All keys are collected first, so the cache is cleared with a single call.
+    sharedcontent_ct_id = ContentType.objects.get_for_model(SharedContent).id
+    use_generations = appsettings.FLUENT_CONTENTS_CACHE_GENERATIONS
+    keys = []
+    parents = set()
+    cleared_items = []
+    seen = {sharedcontent.pk}
+    pending = [sharedcontent.pk]
+    while pending:
+        items = SharedContentItem.objects.filter(shared_content_id__in=pending).select_related(
+            "placeholder"
+        )
+        pending = []
+        for item in items:
+            if use_generations:
+                # Same as ContentItem.clear_cache(), the parent generation covers the default keys.
+                parents.add((item.parent_type_id, item.parent_id))
+                if item.placeholder_id and item.plugin.has_custom_output_cache_keys():
+                    keys += item.plugin.get_output_cache_keys(item.placeholder.slot, item)
+            else:
+                cleared_items.append(item)
+
+            if item.parent_type_id == sharedcontent_ct_id and item.parent_id not in seen:
+                seen.add(item.parent_id)
+                pending.append(item.parent_id)
+
+        if pending:
+            # The output of the {% sharedcontent %} tag of these parents is outdated too.
+            for parent in SharedContent.objects.filter(pk__in=pending):
+                keys += parent.get_cache_keys()
+
+    if cleared_items:
+        # Same as item.get_cache_keys(), the per-site placeholders are found with a single query.
+        keys += _get_contentitems_cache_keys(cleared_items)
+
+    for parent_type_id, parent_id in parents:
+        bump_cache_generation(parent_type_id, parent_id)
+    if keys:
+        cache.delete_many(keys)
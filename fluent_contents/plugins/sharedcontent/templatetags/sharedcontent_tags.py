@@ -1,15 +1,24 @@
 from django.contrib.sites.models import Site
-from django.core.cache import cache
 from django.template import Library, TemplateSyntaxError
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
 from django.utils.translation import get_language
-from tag_parser.basetags import BaseAssignmentOrOutputNode
+from tag_parser.basetags import BaseAssignmentOrOutputNode, BaseNode
 
 from fluent_contents import appsettings, rendering
+from fluent_contents.cache import cache, get_cached_placeholder
+from fluent_contents.models import (
+    DEFAULT_TIMEOUT,
+    ContentItemOutput,
+    prefetch_contentitems,
+    prefetch_placeholders,
+)
 from fluent_contents.plugins.sharedcontent.cache import (
     get_shared_content_cache_key,
-    get_shared_content_cache_key_ptr,
+    get_shared_content_output_cache_key,
 )
 from fluent_contents.plugins.sharedcontent.models import SharedContent
+from fluent_contents.rendering.core import PlaceholderRenderingPipe
 from fluent_contents.utils.templatetags import extract_literal, is_true
 
 register = Library()
@@ -90,6 +99,7 @@ class SharedContentNode(BaseAssignmentOrOutputNode):
             appsettings.FLUENT_CONTENTS_CACHE_OUTPUT
             and appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT
             and cachable
+            and not rendering.is_edit_mode(request)
         )
 
         if isinstance(slot, SharedContent):
@@ -99,30 +109,38 @@ class SharedContentNode(BaseAssignmentOrOutputNode):
             # See if there is cached output, avoid fetching the Placeholder via sharedcontents.contents.
             if try_cache:
                 cache_key = get_shared_content_cache_key(sharedcontent)
-                output = cache.get(cache_key)
+                output = get_cached_placeholder(cache_key)
         else:
             site = Site.objects.get_current()
-            if try_cache:
-                # See if there is output cached, try to avoid fetching the SharedContent + Placeholder model.
-                # Have to perform 2 cache calls for this, because the placeholder output key is based on object IDs
-                cache_key_ptr = get_shared_content_cache_key_ptr(
-                    int(site.pk), slot, language_code=get_language()
-                )
-                cache_key = cache.get(cache_key_ptr)
-                if cache_key is not None:
-                    output = cache.get(cache_key)
+            language_code = get_language()
+            output_cache_key = get_shared_content_output_cache_key(
+                int(site.pk), slot, language_code
+            )
+            if not template_name:
+                # See if the output was fetched by {% prefetch_sharedcontent %} or an earlier tag.
+                output = _get_request_store(request).get(output_cache_key)
+
+                if output is None and try_cache:
+                    # See if there is output cached, try to avoid fetching the SharedContent + Placeholder model.
+                    # The output of all tags in the template is read with a single cache call.
+                    output = _get_template_output(
+                        context, request, int(site.pk), language_code, output_cache_key
+                    )
 
             if output is None:
                 # Get the placeholder
                 try:
                     sharedcontent = SharedContent.objects.parent_site(site).get(slug=slot)
                 except SharedContent.DoesNotExist:
-                    return "<!-- shared content '{}' does not yet exist -->".format(slot)
+                    return _get_missing_output(slot).html
+
+                output = self.render_shared_content(
+                    request, sharedcontent, template_name, cachable=cachable
+                )
 
-                # Now that we've fetched the object, the object key be generated.
-                # No real need to check for output again, render_placeholder() does that already.
-                if try_cache and not cache_key:
-                    cache.set(cache_key_ptr, get_shared_content_cache_key(sharedcontent))
+                # Store the output by slug, so the next request can read it without fetching the object.
+                if try_cache and not template_name and output.cacheable:
+                    _set_template_output(request, output_cache_key, output)
 
         if output is None:
             # Have to fetch + render it.
@@ -145,3 +163,185 @@ class SharedContentNode(BaseAssignmentOrOutputNode):
             cachable=cachable,
             fallback_language=True,
         )
+
+
+@register.tag
+def prefetch_sharedcontent(parser, token):
+    """
+    .. versionadded:: 3.2
+
+    Fetch and render multiple shared content blocks at once. Syntax:
+
+    .. code-block:: html+django
+
+        {% prefetch_sharedcontent "footer" "header-promo" %}
+
+    Without arguments, the blocks of all ``{% sharedcontent %}`` tags in the template
+    (including the templates it extends) are prefetched.
+    The blocks, their placeholders and items are fetched with a constant number of queries.
+    The ``{% sharedcontent %}`` tags that follow display the output without any queries.
+    Hence, place this tag at the top of the base template.
+    """
+    return PrefetchSharedContentNode.parse(parser, token)
+
+
+class PrefetchSharedContentNode(BaseNode):
+    """
+    The template node of the ``prefetch_sharedcontent`` tag.
+    """
+
+    min_args = 0
+    max_args = None
+
+    def render_tag(self, context, *tag_args, **tag_kwargs):
+        request = self.get_request(context)
+        if tag_args:
+            slugs = list(tag_args)
+        elif context.template is not None:
+            slugs = _get_template_slugs(context.template)
+        else:
+            slugs = []
+
+        if request is None or not slugs:
+            return ""
+
+        site = Site.objects.get_current()
+        language_code = get_language()
+        try_cache = (
+            appsettings.FLUENT_CONTENTS_CACHE_OUTPUT
+            and appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT
+            and not rendering.is_edit_mode(request)
+        )
+
+        # Read the cached output first, only fetch the remaining blocks.
+        store = _get_request_store(request)
+        cache_keys = {
+            slug: get_shared_content_output_cache_key(int(site.pk), slug, language_code)
+            for slug in slugs
+        }
+        if try_cache:
+            _read_outputs(store, list(cache_keys.values()))
+
+        missing_slugs = [
+            slug for slug, cache_key in cache_keys.items() if store.get(cache_key) is None
+        ]
+        if not missing_slugs:
+            return ""
+
+        # - fetch SharedContent (+ translations)
+        # - fetch Placeholder
+        # - fetch ContentItem
+        # - fetch the derived tables of the items that are not cached.
+        sharedcontents = prefetch_placeholders(
+            SharedContent.objects.parent_site(site)
+            .filter(slug__in=missing_slugs)
+            .prefetch_related("translations"),
+            "contents",
+        )
+        prefetch_contentitems(
+            sharedcontents,
+            slots=["shared_content"],
+            languages=[language_code, appsettings.FLUENT_CONTENTS_DEFAULT_LANGUAGE_CODE],
+        )
+
+        placeholders = []
+        for sharedcontent in sharedcontents:
+            placeholder = sharedcontent.contents
+            if placeholder is not None:
+                placeholder.parent = sharedcontent  # fill the reverse cache
+                placeholders.append(placeholder)
+
+        outputs = PlaceholderRenderingPipe(request).render_placeholder_list(
+            placeholders, fallback_language=True
+        )
+        for placeholder, output in zip(placeholders, outputs):
+            cache_key = cache_keys[placeholder.parent.slug]
+            if try_cache and output.cacheable:
+                _set_template_output(request, cache_key, output)
+            else:
+                store[cache_key] = output
+
+        # Also remember which blocks don't exist, so the tags don't query for them again.
+        found_slugs = {sharedcontent.slug for sharedcontent in sharedcontents}
+        for slug in missing_slugs:
+            if slug not in found_slugs:
+                store[cache_keys[slug]] = _get_missing_output(slug)
+        return ""
+
+
+def _get_missing_output(slug):
+    return ContentItemOutput(
+        mark_safe("<!-- shared content '{}' does not yet exist -->".format(escape(slug))),
+        cacheable=False,
+    )
+
+
+def _get_template_output(context, request, site_id, language_code, cache_key):
+    """
+    Return the cached output of a ``{% sharedcontent %}`` tag.
+    The first tag reads the output of all tags in the template in a single call,
+    which is remembered for the remainder of the request.
+    """
+    store = _get_request_store(request)
+    if cache_key not in store:
+        cache_keys = [cache_key]
+        if context.template is not None:
+            cache_keys += [
+                get_shared_content_output_cache_key(site_id, slug, language_code)
+                for slug in _get_template_slugs(context.template)
+            ]
+
+        _read_outputs(store, cache_keys)
+
+    return store[cache_key]
+
+
+def _read_outputs(store, cache_keys):
+    # Read all keys that are not known yet during this request, in a single call.
+    cache_keys = [key for key in dict.fromkeys(cache_keys) if key not in store]
+    if cache_keys:
+        found = cache.get_many(cache_keys)
+        for key in cache_keys:
+            store[key] = found.get(key)  # also remember the missing entries.
+
+
+def _set_template_output(request, cache_key, output):
+    # Store the output for the next requests, and the remainder of this request.
+    if output.cache_timeout is not DEFAULT_TIMEOUT:
+        cache.set(cache_key, output, output.cache_timeout)
+    else:
+        cache.set(cache_key, output)
+    _get_request_store(request)[cache_key] = output
+
+
+def _get_request_store(request):
+    if request is None:
+        return {}
+
+    try:
+        return request._fluent_contents_sharedcontent_output
+    except AttributeError:
+        store = request._fluent_contents_sharedcontent_output = {}
+        return store
+
+
+def _get_template_slugs(template):
+    """
+    Return the slugs of all ``{% sharedcontent %}`` tags that can be read from the cache.
+    The scanning of the template is memoized, just like the ``prefetch_placeholders`` tag does.
+    """
+    try:
+        return template._fluent_contents_sharedcontent_slugs
+    except AttributeError:
+        pass
+
+    from template_analyzer.djangoanalyzer import get_node_instances
+
+    slugs = []
+    for node in get_node_instances(template, SharedContentNode):
+        slug = extract_literal(node.args[0])
+        if slug and "template" not in node.kwargs and slug not in slugs:
+            slugs.append(slug)
+
+    template._fluent_contents_sharedcontent_slugs = slugs
+    return slugs
@@ -5,6 +5,7 @@ from fluent_contents.plugins.twitterfeed.models import TwitterRecentEntriesItem,
 
 class BaseTwitterPlugin(ContentPlugin):
     category = ContentPlugin.MEDIA
+    render_thread_safe = True
 
     def get_context(self, request, instance, **kwargs):
         context = super().get_context(request, instance, **kwargs)
@@ -8,10 +8,16 @@ Contents is cached in memcache whenever possible, only the remaining items are q
 The templatetags also use these functions to render the :class:`~fluent_contents.models.ContentItem` objects.
 """
 from .main import (
+    arender_content_items,
+    arender_placeholder,
     get_cached_placeholder_output,
+    get_prefetched_placeholder_output,
+    iter_placeholder_html,
     render_content_items,
+    render_missing_placeholder,
     render_placeholder,
     render_placeholder_search_text,
+    render_placeholders,
 )
 from .markers import is_edit_mode, set_edit_mode
 from .media import get_frontend_media, register_frontend_media
@@ -19,9 +25,15 @@ from .media import get_frontend_media, register_frontend_media
 __all__ = (
     # Main
     "get_cached_placeholder_output",
+    "get_prefetched_placeholder_output",
     "render_placeholder",
+    "render_placeholders",
+    "render_missing_placeholder",
+    "iter_placeholder_html",
     "render_content_items",
     "render_placeholder_search_text",
+    "arender_placeholder",
+    "arender_content_items",
     # Media
     "get_frontend_media",
     "register_frontend_media",
@@ -0,0 +1,422 @@
+"""
+The asynchronous variant of the rendering pipeline, for ASGI deployments.
+
+The cache is read and written using the async cache API,
+and the database queries use async iteration.
+Plugins can implement :func:`~fluent_contents.extensions.ContentPlugin.arender`,
+otherwise their :func:`~fluent_contents.extensions.ContentPlugin.render` method runs in a thread.
+"""
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from parler.utils.context import smart_override
+
+from fluent_contents import appsettings
+from fluent_contents.cache import (
+    cache,
+    get_placeholder_items_cache_key,
+    get_placeholder_stale_cache_key_for_parent,
+)
+from fluent_contents.extensions import PluginNotFound, plugin_pool
+from fluent_contents.models import DEFAULT_TIMEOUT, ContentItem, get_parent_language_code
+from fluent_contents.models.db import _is_untranslated_parent
+from fluent_contents.models.fields import _get_prefetched_contentitems
+
+from .core import (
+    PlaceholderRenderingPipe,
+    RenderingPipe,
+    SkipItem,
+    _get_manifest,
+    _get_manifest_items,
+    _get_payload_instances,
+    logger,
+)
+from .holes import get_hole_ids
+from .utils import get_placeholder_debug_name, get_render_language
+
+
+class AsyncRenderingPipe(RenderingPipe):
+    """
+    .. versionadded:: 3.2
+
+    The asynchronous version of the :class:`~fluent_contents.rendering.core.RenderingPipe`.
+    """
+
+    async def arender_items(
+        self, placeholder, items, parent_object=None, template_name=None, cachable=None
+    ):
+        """
+        The main rendering sequence.
+        """
+        # The plugin lookup by content type may need to query the database once.
+        # The _name_for_ctype_id table is only None until the lookup tables are set up,
+        # the _plugin_for_ctype_id table is filled on demand and can't be used for this check.
+        if plugin_pool._name_for_ctype_id is None:
+            await sync_to_async(plugin_pool._setup_lazy_indexes)()
+
+        # Unless it was done before, disable polymorphic effects.
+        is_queryset = False
+        if hasattr(items, "non_polymorphic"):
+            is_queryset = True
+            if not items.polymorphic_disabled and items._result_cache is None:
+                items = items.non_polymorphic()
+            items = [item async for item in items]
+        elif any(item.__class__ is ContentItem for item in items):
+            # A list of base objects, handle it like a non-polymorphic queryset.
+            is_queryset = True
+
+        if not items:
+            # The debug name of a shared content placeholder reads the parent object.
+            return await sync_to_async(self._get_empty_output)(placeholder)
+
+        # Tracked data during rendering:
+        result = self._create_result(placeholder, items, parent_object, template_name, cachable)
+
+        if is_queryset:
+            # Phase 1: get cached output
+            await self._afetch_cached_output(items, result=result)
+            await self._afetch_remaining_instances([result])
+        else:
+            result.add_remaining_list(items)
+
+        return await self._arender_result(result, items, template_name)
+
+    async def _arender_result(self, result, items, template_name):
+        if result.remaining_items:
+            # Phase 2: render remaining items
+            await self._arender_uncached_items(result.remaining_items, result=result)
+
+        # Store all rendered items in the cache at once.
+        if result.cache_writes:
+            await self._aflush_cache_writes(result)
+
+        # And merge all items together.
+        if template_name:
+            # The template may perform queries.
+            return await sync_to_async(self.merge_output)(result, items, template_name)
+        return self.merge_output(result, items, template_name)
+
+    async def _afetch_cached_output(self, items, result):
+        """
+        Read the cached output of all items, using a single ``cache.aget_many()`` call.
+        """
+        if not appsettings.FLUENT_CONTENTS_CACHE_OUTPUT or not self.use_cached_output:
+            result.add_remaining_list(items)
+            return
+
+        if appsettings.FLUENT_CONTENTS_CACHE_GENERATIONS:
+            # The cache generation is read from the cache with a synchronous call.
+            lookups = await sync_to_async(self._get_output_lookups)(items, result)
+        else:
+            lookups = self._get_output_lookups(items, result)
+        cachekeys = [cachekey for _, _, cachekey in lookups if isinstance(cachekey, str)]
+        cached_output = await cache.aget_many(cachekeys) if cachekeys else {}
+        if any(cachekey is None for _, _, cachekey in lookups):
+            # A plugin implements a custom get_cached_output()
+            await sync_to_async(self._store_cached_output)(lookups, cached_output, result)
+        else:
+            self._store_cached_output(lookups, cached_output, result)
+
+    async def _afetch_remaining_instances(self, results):
+        """
+        Read the derived table data for the remaining items of multiple results at once.
+        """
+        remaining_items = [item for result in results for item in result.remaining_items]
+        if not remaining_items:
+            return
+
+        real_items = await _aget_real_instances(remaining_items)
+        for result in results:
+            result.remaining_items = [
+                real_items[item.pk] for item in result.remaining_items if item.pk in real_items
+            ]
+
+    async def _arender_uncached_items(self, items, result):
+        """
+        Render a list of items, that didn't exist in the cache yet.
+        The items are rendered concurrently, the output is still stored in the original ordering.
+        """
+        outputs = await asyncio.gather(
+            *(self.arender_item(contentitem) for contentitem in items), return_exceptions=True
+        )
+        for contentitem, output in zip(items, outputs):
+            if isinstance(output, PluginNotFound):
+                result.store_exception(contentitem, output)
+                logger.debug("- item #%s has no matching plugin: %s", contentitem.pk, str(output))
+            elif isinstance(output, SkipItem):
+                result.set_skipped(contentitem)
+            elif isinstance(output, BaseException):
+                raise output
+            else:
+                self._store_rendered_output(contentitem, output, result)
+
+    async def arender_item(self, contentitem):
+        """
+        Render the individual item.
+        May raise :class:`~fluent_contents.rendering.core.SkipItem` to ignore an item.
+        """
+        render_language = get_render_language(contentitem)
+        with smart_override(render_language):
+            return await contentitem.plugin._arender_contentitem(self.request, contentitem)
+
+    async def _aflush_cache_writes(self, result):
+        """
+        Write the output of all rendered items to the cache, using a single call per timeout value.
+        """
+        for timeout, values in result.cache_writes.items():
+            await _aset_many(values, timeout)
+
+        result.cache_writes = {}
+
+
+class AsyncPlaceholderRenderingPipe(AsyncRenderingPipe, PlaceholderRenderingPipe):
+    """
+    .. versionadded:: 3.2
+
+    The asynchronous rendering of placeholders.
+    """
+
+    async def _arender_result(self, result, items, template_name):
+        output = await super()._arender_result(result, items, template_name)
+        self._track_per_site_slot(result)
+        return output
+
+    async def arender_placeholder(
+        self,
+        placeholder,
+        parent_object=None,
+        template_name=None,
+        cachable=None,
+        limit_parent_language=True,
+        fallback_language=None,
+    ):
+        """
+        The main rendering sequence for placeholders.
+        This works like :func:`~fluent_contents.rendering.core.PlaceholderRenderingPipe.render_placeholder`.
+        """
+        cachable = self._can_cache_merged_output(template_name, cachable)
+        try_cache = cachable and self.may_cache_placeholders()
+
+        # Everything that may query the database or cache synchronously is resolved in a single thread.
+        state = await sync_to_async(self._get_placeholder_state)(
+            placeholder, parent_object, limit_parent_language, fallback_language, try_cache
+        )
+        logger.debug("Rendering placeholder '%s'", state.placeholder_name)
+
+        # Fetch the placeholder output from cache.
+        cache_keys = state.cache_keys
+        output = None
+        if try_cache:
+            outputs = await self._aget_cached_placeholders(state, [placeholder.slot])
+            output = outputs.get(placeholder.slot)
+
+        if output is None:
+            # Get the items, and render them
+            start = time.time()
+            items, is_fallback = await self._aget_placeholder_items(placeholder, state)
+            output = await self.arender_items(
+                placeholder, items, state.parent_object, template_name, cachable
+            )
+
+            # Store the full-placeholder contents in the cache.
+            if try_cache:
+                if is_fallback:
+                    # Store the fallback under a different key, see render_placeholder()
+                    self._use_fallback_cache_key(cache_keys, placeholder.slot, state.fallback_code)
+
+                await self._aset_cached_placeholders(
+                    state,
+                    cache_keys,
+                    {placeholder.slot: output},
+                    render_time=time.time() - start,
+                )
+
+        if get_hole_ids(output.html):
+            output = await sync_to_async(self._fill_holes)(output)
+        return output
+
+    def _get_placeholder_state(
+        self, placeholder, parent_object, limit_parent_language, fallback_language, try_cache
+    ):
+        # Resolve the parent, language and cache keys of a placeholder.
+        # These may read the parent translation, the ContentType or the cache generation.
+        if parent_object is None:
+            # This is a cached lookup when the PlaceholderFieldDescriptor filled it.
+            parent_object = placeholder.parent
+
+        state = _PlaceholderState(
+            parent_object,
+            get_placeholder_debug_name(placeholder),
+            get_parent_language_code(parent_object),
+            self._get_fallback_language_code(fallback_language),
+            limit_parent_language,
+        )
+        if try_cache:
+            state.cache_keys, state.read_keys = self._get_placeholder_read_keys(
+                parent_object, [placeholder.slot], state.language_code, state.fallback_code
+            )
+
+        state.is_untranslated = _is_untranslated_parent(parent_object, limit_parent_language)
+        if self.may_use_item_manifest():
+            for language_code in (state.items_language_code, state.fallback_code):
+                state.manifest_keys[language_code] = get_placeholder_items_cache_key(
+                    placeholder, language_code
+                )
+        return state
+
+    async def _aget_cached_placeholders(self, state, slots):
+        """
+        Read the cached output of multiple placeholders in a single cache call.
+        """
+        cache_keys = state.cache_keys
+        outputs = self._read_cached_placeholders(
+            cache_keys, await cache.aget_many(state.read_keys), state.fallback_code
+        )
+
+        if appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION == "lock":
+            stale_keys = {}
+            for slot in slots:
+                if slot in outputs:
+                    continue
+
+                lock_key = f"{cache_keys[slot]}.lock"
+                if await cache.aadd(
+                    lock_key, True, appsettings.FLUENT_CONTENTS_CACHE_LOCK_TIMEOUT
+                ):
+                    self._placeholder_locks.append(lock_key)
+                else:
+                    stale_keys[slot] = await sync_to_async(
+                        get_placeholder_stale_cache_key_for_parent
+                    )(state.parent_object, slot, state.language_code)
+
+            if stale_keys:
+                stale_output = await cache.aget_many(list(stale_keys.values()))
+                outputs.update(self._read_stale_placeholders(stale_keys, stale_output))
+
+        return outputs
+
+    async def _aset_cached_placeholders(self, state, cache_keys, outputs, render_time=0):
+        """
+        Store the output of multiple placeholders in the cache, using a single cache call per timeout.
+        """
+        # The stale keys may read the ContentType of the parent.
+        cache_writes = await sync_to_async(self._get_placeholder_cache_writes)(
+            state.parent_object, state.language_code, cache_keys, outputs, render_time
+        )
+        for values, timeout in cache_writes:
+            await _aset_many(values, timeout)
+
+        if self._placeholder_locks:
+            await cache.adelete_many(self._placeholder_locks)
+            self._placeholder_locks = []
+
+    async def _aget_placeholder_items(self, placeholder, state):
+        # Get the items, which may be fetched by prefetch_contentitems() already.
+        parent_object = state.parent_object
+        items = None
+        if not state.is_untranslated:
+            language_code = state.items_language_code
+            items = _get_prefetched_contentitems(parent_object, placeholder.slot, language_code)
+            if items is None:
+                items = await self._aget_manifest_items(placeholder, state, language_code)
+
+            if items is None:
+                items = [
+                    item
+                    async for item in placeholder.get_content_items(
+                        parent_object, limit_parent_language=state.limit_parent_language
+                    ).non_polymorphic()
+                ]
+                await self._aset_manifest_items(state, language_code, items)
+
+        if state.fallback_code and not items:
+            # There are no items, but there is a fallback option. Try it.
+            language_code = state.fallback_code
+            logger.debug("- reading fallback language %s", language_code)
+            items = _get_prefetched_contentitems(parent_object, placeholder.slot, language_code)
+            if items is None:
+                items = await self._aget_manifest_items(placeholder, state, language_code)
+            if items is None:
+                items = [
+                    item
+                    async for item in placeholder.get_content_items(
+                        parent_object, limit_parent_language=False
+                    )
+                    .translated(language_code)
+                    .non_polymorphic()
+                ]
+                await self._aset_manifest_items(state, language_code, items)
+            return items, True
+        else:
+            return items or [], False
+
+    async def _aget_manifest_items(self, placeholder, state, language_code):
+        # The async version of _get_manifest_items()
+        cachekey = state.manifest_keys.get(language_code)
+        if cachekey is None:
+            return None
+
+        manifest = (await cache.aget_many([cachekey])).get(cachekey)
+        if manifest is None:
+            return None
+
+        logger.debug("- fetched item list for '%s'", placeholder.slot)
+        return _get_manifest_items(placeholder, manifest)
+
+    async def _aset_manifest_items(self, state, language_code, items):
+        # The async version of _set_manifest_items()
+        cachekey = state.manifest_keys.get(language_code)
+        if cachekey is not None:
+            await cache.aset_many({cachekey: _get_manifest(items)})
+
+
+class _PlaceholderState:
+    # The values of a placeholder that are resolved before rendering it asynchronously.
+
+    def __init__(
+        self, parent_object, placeholder_name, language_code, fallback_code, limit_parent_language
+    ):
+        self.parent_object = parent_object
+        self.placeholder_name = placeholder_name
+        self.language_code = language_code
+        self.fallback_code = fallback_code
+        self.limit_parent_language = limit_parent_language
+        self.cache_keys = {}
+        self.read_keys = []
+        self.is_untranslated = False
+        self.manifest_keys = {}
+
+    @property
+    def items_language_code(self):
+        # The language to filter the items by, see Placeholder.get_content_items()
+        return self.language_code if self.limit_parent_language else None
+
+
+async def _aget_real_instances(items):
+    # The async version of _get_real_instances(), returns a dictionary by pk.
+    # This performs a single query per derived model, just like get_real_instances() does.
+    instances, remaining_items = _get_payload_instances(items)
+    ids_by_model = {}
+    for item in remaining_items:
+        try:
+            model = item.plugin.model
+        except PluginNotFound:
+            # Keep the item, so rendering reports the missing plugin.
+            instances[item.pk] = item
+        else:
+            ids_by_model.setdefault(model, []).append(item.pk)
+
+    for model, ids in ids_by_model.items():
+        async for instance in model.objects.non_polymorphic().filter(pk__in=ids):
+            instances[instance.pk] = instance
+
+    return instances
+
+
+async def _aset_many(values, timeout):
+    if timeout is not DEFAULT_TIMEOUT:
+        await cache.aset_many(values, timeout)
+    else:
+        # Don't want to mix into the default 0/None issue.
+        await cache.aset_many(values)
@@ -1,25 +1,46 @@
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 
 from django.conf import settings
-from django.core.cache import cache
+from django.contrib.contenttypes.models import ContentType
+from django.db import close_old_connections
 from django.db.models.query import EmptyQuerySet
 from django.forms import Media
 from django.template.loader import render_to_string
+from django.utils import translation
 from django.utils.html import escape
 from django.utils.safestring import mark_safe
 from parler.utils.context import smart_override
 
 from fluent_contents import appsettings
-from fluent_contents.cache import get_placeholder_cache_key_for_parent, get_rendering_cache_key
+from fluent_contents.cache import (
+    _find_cached_placeholder,
+    cache,
+    get_cached_placeholder,
+    get_placeholder_cache_key_for_parent,
+    get_placeholder_fallback_cache_key,
+    get_placeholder_items_cache_key,
+    get_placeholder_output_keys,
+    get_placeholder_site_cache_key,
+    get_placeholder_stale_cache_key_for_parent,
+    get_rendering_cache_key,
+)
 from fluent_contents.extensions import PluginContext, PluginNotFound
 from fluent_contents.models import (
     DEFAULT_TIMEOUT,
     ContentItem,
     ContentItemOutput,
+    Placeholder,
     get_parent_language_code,
 )
+from fluent_contents.models.db import _is_untranslated_parent
+from fluent_contents.models.fields import _get_prefetched_contentitems
 
 from . import markers
+from .holes import fill_holes, get_hole_html, get_hole_ids, remove_hole_markers
 from .utils import (
     add_media,
     get_placeholder_debug_name,
@@ -60,9 +81,13 @@ class ResultTracker:
         self.remaining_items = []
         self.item_output = {}
         self.item_source = {}  # for debugging
+        self.cache_writes = {}  # timeout -> {cachekey: output}
+        self.holes = set()  # item ids that are rendered for each request
+        self.cache_per_site = False  # whether the merged output differs per site
 
         # Other state fields
         self.placeholder_name = get_placeholder_name(placeholder)
+        self.punch_holes = False
 
     def store_output(self, contentitem, output):
         """
@@ -108,7 +133,15 @@ class ResultTracker:
     def fetch_remaining_instances(self):
         """Read the derived table data for all objects tracked as remaining (=not found in the cache)."""
         if self.remaining_items:
-            self.remaining_items = ContentItem.objects.get_real_instances(self.remaining_items)
+            self.remaining_items = _get_real_instances(self.remaining_items)
+
+    def add_cache_write(self, cachekey, output, timeout=DEFAULT_TIMEOUT):
+        """Track output that should be stored in the cache once rendering is completed."""
+        self.cache_writes.setdefault(timeout, {})[cachekey] = output
+
+    def add_hole(self, contentitem):
+        """Track that the item output is not part of the cached output, but rendered for each request."""
+        self.holes.add(self._get_item_id(contentitem))
 
     def add_plugin_timeout(self, plugin):
         self.all_timeout = _min_timeout(self.all_timeout, plugin.cache_timeout)
@@ -167,6 +200,9 @@ class RenderingPipe:
     #: Tell whether the cache can be consulted for output.
     use_cached_output = True
 
+    # Marker for items that should not be read from the cache.
+    NO_CACHE = object()
+
     def __init__(self, request, edit_mode=None):
         if edit_mode is None:
             edit_mode = markers.is_edit_mode(request)
@@ -181,30 +217,96 @@ class RenderingPipe:
         """
         The main rendering sequence.
         """
+        items, is_queryset = self._get_non_polymorphic_items(items)
+
+        # See if the queryset contained anything.
+        # This test is moved here, to prevent earlier query execution.
+        if not items:
+            return self._get_empty_output(placeholder)
+
+        # Tracked data during rendering:
+        result = self._create_result(placeholder, items, parent_object, template_name, cachable)
+
+        if is_queryset:
+            # Phase 1: get cached output
+            self._fetch_cached_output(items, result=result)
+            result.fetch_remaining_instances()
+        else:
+            # The items is either a list of manually created items, or it's a QuerySet.
+            # Can't prevent reading the subclasses only, so don't bother with caching here.
+            result.add_remaining_list(items)
+
+        return self._render_result(result, items, template_name)
+
+    def iter_items(self, placeholder, items, parent_object=None):
+        """
+        .. versionadded:: 3.2
+
+        Render the items one by one, yielding the :class:`~fluent_contents.models.ContentItemOutput` of each item.
+        The cached output is read in a single call first, the remaining items are rendered on demand.
+        The merged output is not cached.
+        """
+        items, is_queryset = self._get_non_polymorphic_items(items)
+        if not items:
+            yield self._get_empty_output(placeholder)
+            return
+
+        result = self._create_result(placeholder, items, parent_object, cachable=False)
+        if is_queryset:
+            self._fetch_cached_output(items, result=result)
+            result.fetch_remaining_instances()
+        else:
+            result.add_remaining_list(items)
+
+        remaining_items = {result._get_item_id(item): item for item in result.remaining_items}
+        try:
+            for item_id in result.output_ordering:
+                try:
+                    contentitem = remaining_items[item_id]
+                except KeyError:
+                    contentitem = result.item_source[item_id]
+                else:
+                    self._render_uncached_items([contentitem], result=result)
+
+                output = result.item_output.get(item_id, ResultTracker.MISSING)
+                if output is not ResultTracker.SKIPPED:
+                    html, media = self._get_item_html_output(contentitem, output)
+                    yield ContentItemOutput(mark_safe(html), media, cacheable=False)
+        finally:
+            # Also store the items that were rendered when the generator is closed early.
+            if result.cache_writes:
+                self._flush_cache_writes(result)
+
+    def _get_non_polymorphic_items(self, items):
         # Unless it was done before, disable polymorphic effects.
         is_queryset = False
         if hasattr(items, "non_polymorphic"):
             is_queryset = True
             if not items.polymorphic_disabled and items._result_cache is None:
                 items = items.non_polymorphic()
+        elif any(item.__class__ is ContentItem for item in items):
+            # A list of base objects (e.g. from prefetch_contentitems()),
+            # handle it like a non-polymorphic queryset.
+            is_queryset = True
+        return items, is_queryset
 
-        # See if the queryset contained anything.
-        # This test is moved here, to prevent earlier query execution.
-        if not items:
-            logger.debug(
-                "- no items in placeholder '%s'",
-                get_placeholder_debug_name(placeholder),
-            )
-            return ContentItemOutput(
-                mark_safe(
-                    "<!-- no items in placeholder '{}' -->".format(
-                        escape(get_placeholder_name(placeholder))
-                    )
-                ),
-                cacheable=True,
-            )
+    def _get_empty_output(self, placeholder):
+        logger.debug(
+            "- no items in placeholder '%s'",
+            get_placeholder_debug_name(placeholder),
+        )
+        return ContentItemOutput(
+            mark_safe(
+                "<!-- no items in placeholder '{}' -->".format(
+                    escape(get_placeholder_name(placeholder))
+                )
+            ),
+            cacheable=True,
+        )
 
-        # Tracked data during rendering:
+    def _create_result(
+        self, placeholder, items, parent_object=None, template_name=None, cachable=None
+    ):
         result = self.result_class(
             request=self.request,
             parent_object=parent_object,
@@ -214,21 +316,18 @@ class RenderingPipe:
         )
         if self.edit_mode:
             result.set_uncachable()
+        return result
 
-        if is_queryset:
-            # Phase 1: get cached output
-            self._fetch_cached_output(items, result=result)
-            result.fetch_remaining_instances()
-        else:
-            # The items is either a list of manually created items, or it's a QuerySet.
-            # Can't prevent reading the subclasses only, so don't bother with caching here.
-            result.add_remaining_list(items)
-
+    def _render_result(self, result, items, template_name):
         # Start the actual rendering of remaining items.
         if result.remaining_items:
             # Phase 2: render remaining items
             self._render_uncached_items(result.remaining_items, result=result)
 
+        # Store all rendered items in the cache at once.
+        if result.cache_writes:
+            self._flush_cache_writes(result)
+
         # And merge all items together.
         return self.merge_output(result, items, template_name)
 
@@ -242,9 +341,17 @@ class RenderingPipe:
             result.add_remaining_list(items)
             return
 
+        # Collect all cache keys first, so the output can be read with a single cache.get_many() call.
+        lookups = self._get_output_lookups(items, result)
+        cachekeys = [cachekey for _, _, cachekey in lookups if isinstance(cachekey, str)]
+        cached_output = cache.get_many(cachekeys) if cachekeys else {}
+        self._store_cached_output(lookups, cached_output, result)
+
+    def _get_output_lookups(self, items, result):
+        # Return the cache key of each item, or NO_CACHE when it should be rendered.
+        lookups = []
         for contentitem in items:
             result.add_ordering(contentitem)
-            output = None
 
             try:
                 plugin = contentitem.plugin
@@ -253,21 +360,40 @@ class RenderingPipe:
                 logger.debug("- item #%s has no matching plugin: %s", contentitem.pk, str(ex))
                 continue
 
+            if plugin.cache_output_per_site:
+                # Also when the item output is read from the cache, see _try_cache_output()
+                result.cache_per_site = True
+
             # Respect the cache output setting of the plugin
             if self.can_use_cached_output(contentitem):
                 result.add_plugin_timeout(plugin)
+                cachekey = plugin.get_output_cache_lookup_key(result.placeholder_name, contentitem)
+                lookups.append((contentitem, plugin, cachekey))
+            else:
+                lookups.append((contentitem, plugin, self.NO_CACHE))
+        return lookups
+
+    def _store_cached_output(self, lookups, cached_output, result):
+        # Track the output found in the cache, the other items still need to be rendered.
+        for contentitem, plugin, cachekey in lookups:
+            if cachekey is self.NO_CACHE:
+                output = None
+            elif cachekey is None:
+                # The plugin implements a custom get_cached_output(), can't fetch that in bulk.
                 output = plugin.get_cached_output(result.placeholder_name, contentitem)
+            else:
+                output = cached_output.get(cachekey)
 
-                # Support transition to new output format.
-                if output is not None and not isinstance(output, ContentItemOutput):
-                    output = None
-                    logger.debug(
-                        "Flushed cached output of {}#{} to store new ContentItemOutput format (key: {})".format(
-                            plugin.type_name,
-                            contentitem.pk,
-                            get_placeholder_name(contentitem.placeholder),
-                        )
+            # Support transition to new output format.
+            if output is not None and not isinstance(output, ContentItemOutput):
+                output = None
+                logger.debug(
+                    "Flushed cached output of {}#{} to store new ContentItemOutput format (key: {})".format(
+                        plugin.type_name,
+                        contentitem.pk,
+                        get_placeholder_name(contentitem.placeholder),
                     )
+                )
 
             # For debugging, ignore cached values when the template is updated.
             if output and settings.DEBUG:
@@ -280,6 +406,21 @@ class RenderingPipe:
             else:
                 result.add_remaining(contentitem)
 
+    def _fetch_remaining_instances(self, results):
+        """
+        Read the derived table data for the remaining items of multiple results at once.
+        """
+        remaining_items = [item for result in results for item in result.remaining_items]
+        if not remaining_items:
+            return
+
+        real_items = {item.pk: item for item in _get_real_instances(remaining_items)}
+        for result in results:
+            # Items that have no derived table entry are left out, just like get_real_instances() does.
+            result.remaining_items = [
+                real_items[item.pk] for item in result.remaining_items if item.pk in real_items
+            ]
+
     def can_use_cached_output(self, contentitem):
         """
         Tell whether the code should try reading cached output
@@ -291,11 +432,18 @@ class RenderingPipe:
         """
         Render a list of items, that didn't exist in the cache yet.
         """
+        futures = self._start_threaded_items(items)
+        # The timeout applies to the whole render, not to each wait for a worker.
+        deadline = time.monotonic() + appsettings.FLUENT_CONTENTS_RENDER_THREAD_TIMEOUT
         for contentitem in items:
             # Render the item.
             # Allow derived classes to skip it.
             try:
-                output = self.render_item(contentitem)
+                future = futures.get(id(contentitem))
+                if future is not None:
+                    output = self._get_threaded_output(contentitem, future, deadline)
+                else:
+                    output = self.render_item(contentitem)
             except PluginNotFound as ex:
                 result.store_exception(contentitem, ex)
                 logger.debug("- item #%s has no matching plugin: %s", contentitem.pk, str(ex))
@@ -303,13 +451,76 @@ class RenderingPipe:
             except SkipItem:
                 result.set_skipped(contentitem)
                 continue
+            except _RenderThreadTimeout as ex:
+                result.store_exception(contentitem, ex)
+                result.set_uncachable()
+                logger.warning(
+                    "- item #%s was not rendered within %s seconds",
+                    contentitem.pk,
+                    appsettings.FLUENT_CONTENTS_RENDER_THREAD_TIMEOUT,
+                )
+                continue
 
-            # Try caching it.
-            self._try_cache_output(contentitem, output, result=result)
-            if self.edit_mode:
-                output.html = markers.wrap_contentitem_output(output.html, contentitem)
+            self._store_rendered_output(contentitem, output, result)
+
+    def _store_rendered_output(self, contentitem, output, result):
+        # Try caching it.
+        self._try_cache_output(contentitem, output, result=result)
+        if self.edit_mode:
+            # Wrap a copy, the original output is still pending to be written in the cache.
+            output = ContentItemOutput(
+                markers.wrap_contentitem_output(output.html, contentitem),
+                output.media,
+                cacheable=output.cacheable,
+                cache_timeout=output.cache_timeout,
+            )
+
+        result.store_output(contentitem, output)
+
+    def _start_threaded_items(self, items):
+        """
+        Start rendering the items of thread-safe plugins in the background.
+        Returns a dictionary with futures, indexed by the ``id()`` of the item.
+        """
+        if appsettings.FLUENT_CONTENTS_RENDER_THREADS <= 0 or _render_thread_state.active:
+            # Disabled, or this is a nested render call inside a worker thread.
+            # Waiting for other workers there could exhaust the pool.
+            return {}
+
+        threaded_items = []
+        for contentitem in items:
+            try:
+                if contentitem.plugin.render_thread_safe:
+                    threaded_items.append(contentitem)
+            except PluginNotFound:
+                pass  # reported by render_item() later.
+
+        if len(threaded_items) < 2:
+            # Not worth switching threads.
+            return {}
+
+        # The active language is thread-local, and needs to be activated in the worker.
+        # The item language is applied by render_item(), unless the plugin ignores it.
+        language = translation.get_language()
+        executor = _get_render_executor()
+        return {
+            id(contentitem): executor.submit(_render_item_in_thread, self, contentitem, language)
+            for contentitem in threaded_items
+        }
+
+    def _get_threaded_output(self, contentitem, future, deadline):
+        """
+        Wait for the output of an item that is rendered in a worker thread,
+        until the ``time.monotonic()`` deadline. Any exception of the worker is raised here.
+        """
+        try:
+            return future.result(timeout=max(0, deadline - time.monotonic()))
+        except FuturesTimeoutError:
+            if future.done():
+                raise  # The plugin raised a TimeoutError itself, it's the same class since Python 3.11.
 
-            result.store_output(contentitem, output)
+            future.cancel()
+            raise _RenderThreadTimeout() from None
 
     def render_item(self, contentitem):
         """
@@ -325,18 +536,21 @@ class RenderingPipe:
     def _try_cache_output(self, contentitem, output, result):
         plugin = contentitem.plugin
         if self._can_cache_output(plugin, output) and contentitem.pk:
-            # Cache the output
-            plugin.set_cached_output(result.placeholder_name, contentitem, output)
+            # Cache the output, this happens in bulk after all items are rendered.
+            cachekey = plugin.get_output_cache_store_key(result.placeholder_name, contentitem)
+            if cachekey is None:
+                # The plugin implements a custom set_cached_output(), can't store that in bulk.
+                plugin.set_cached_output(result.placeholder_name, contentitem, output)
+            else:
+                result.add_cache_write(cachekey, output, plugin.cache_timeout)
 
             if plugin.cache_output_per_site:
-                # Unsupported: can't cache global output for placeholder yet if output differs per SITE_ID
-                # Placeholders only have a single entry, the SITE_ID is not part of it's cache key yet.
-                logger.debug(
-                    "- item #%s is blocks full placeholder caching. Prevented by %r.cache_output_per_site",
-                    contentitem.pk,
-                    contentitem.plugin,
-                )
-                result.set_uncachable()
+                # The merged output can only be cached per SITE_ID.
+                result.cache_per_site = True
+        elif result.punch_holes and contentitem.pk:
+            # The item is rendered for each request, the complete placeholder can still be cached.
+            result.add_hole(contentitem)
+            logger.debug("- item #%s is rendered for each request", contentitem.pk)
         else:
             # An item blocks caching the complete placeholder.
             result.set_uncachable()
@@ -347,6 +561,19 @@ class RenderingPipe:
                     contentitem.plugin,
                 )
 
+    def _flush_cache_writes(self, result):
+        """
+        Write the output of all rendered items to the cache, using a single call per timeout value.
+        """
+        for timeout, values in result.cache_writes.items():
+            if timeout is not DEFAULT_TIMEOUT:
+                cache.set_many(values, timeout)
+            else:
+                # Don't want to mix into the default 0/None issue.
+                cache.set_many(values)
+
+        result.cache_writes = {}
+
     def _can_cache_output(self, plugin, output):
         return (
             appsettings.FLUENT_CONTENTS_CACHE_OUTPUT and plugin.cache_output and output.cacheable
@@ -401,39 +628,56 @@ class RenderingPipe:
         html_output = []
         merged_media = Media()
         for contentitem, output in result.get_output(include_exceptions=True):
-            if output is ResultTracker.MISSING:
-                # Likely get_real_instances() didn't return an item for it.
-                # The get_real_instances() didn't return an item for the derived table. This happens when either:
-                # 1. that table is truncated/reset, while there is still an entry in the base ContentItem table.
-                #    A query at the derived table happens every time the page is being rendered.
-                # 2. the model was completely removed which means there is also a stale ContentType object.
-                class_name = _get_stale_item_class_name(contentitem)
-                html_output.append(
-                    mark_safe(
-                        "<!-- Missing derived model for ContentItem #{id}: {cls}. -->\n".format(
-                            id=contentitem.pk, cls=class_name
-                        )
-                    )
-                )
-                logger.warning(
-                    "Missing derived model for ContentItem #{id}: {cls}.".format(
-                        id=contentitem.pk, cls=class_name
-                    )
-                )
-            elif isinstance(output, Exception):
-                html_output.append(f"<!-- error: {str(output)} -->\n")
-            else:
-                html_output.append(output.html)
-                add_media(merged_media, output.media)
+            html, media = self._get_item_html_output(contentitem, output)
+            html_output.append(html)
+            if media is not None:
+                add_media(merged_media, media)
 
         return html_output, merged_media
 
+    def _get_item_html_output(self, contentitem, output):
+        """
+        Return the HTML and media of a single rendered item.
+        The media is ``None`` for items that failed to render.
+        """
+        if output is ResultTracker.MISSING:
+            # Likely get_real_instances() didn't return an item for it.
+            # The get_real_instances() didn't return an item for the derived table. This happens when either:
+            # 1. that table is truncated/reset, while there is still an entry in the base ContentItem table.
+            #    A query at the derived table happens every time the page is being rendered.
+            # 2. the model was completely removed which means there is also a stale ContentType object.
+            class_name = _get_stale_item_class_name(contentitem)
+            logger.warning(
+                "Missing derived model for ContentItem #{id}: {cls}.".format(
+                    id=contentitem.pk, cls=class_name
+                )
+            )
+            html = mark_safe(
+                "<!-- Missing derived model for ContentItem #{id}: {cls}. -->\n".format(
+                    id=contentitem.pk, cls=class_name
+                )
+            )
+            return html, None
+        elif isinstance(output, Exception):
+            return f"<!-- error: {str(output)} -->\n", None
+        else:
+            return output.html, output.media
+
 
 class PlaceholderRenderingPipe(RenderingPipe):
     """
     The rendering of placeholders.
     """
 
+    #: The factor for early expiration, higher values favor rendering earlier.
+    early_expiration_beta = 1.0
+
+    def __init__(self, request, edit_mode=None):
+        super().__init__(request, edit_mode=edit_mode)
+        self._placeholder_locks = []
+        self._hole_html = {}
+        self._per_site_slots = set()
+
     def render_placeholder(
         self,
         placeholder,
@@ -467,18 +711,18 @@ class PlaceholderRenderingPipe(RenderingPipe):
 
         # Fetch the placeholder output from cache.
         language_code = get_parent_language_code(parent_object)
-        cache_key = None
+        fallback_code = self._get_fallback_language_code(fallback_language)
+        cache_keys = {}
         output = None
         if try_cache:
-            cache_key = get_placeholder_cache_key_for_parent(
-                parent_object, placeholder.slot, language_code
+            cache_keys, outputs = self._get_cached_placeholders(
+                parent_object, [placeholder.slot], language_code, fallback_code
             )
-            output = cache.get(cache_key)
-            if output:
-                logger.debug("- fetched cached output")
+            output = outputs.get(placeholder.slot)
 
         if output is None:
             # Get the items, and render them
+            start = time.time()
             items, is_fallback = self._get_placeholder_items(
                 placeholder,
                 parent_object,
@@ -488,22 +732,489 @@ class PlaceholderRenderingPipe(RenderingPipe):
             )
             output = self.render_items(placeholder, items, parent_object, template_name, cachable)
 
-            if is_fallback:
-                # Caching fallbacks is not supported yet,
-                # content could be rendered in a different gettext language domain.
-                output.cacheable = False
-
             # Store the full-placeholder contents in the cache.
-            if try_cache and output.cacheable:
-                if output.cache_timeout is not DEFAULT_TIMEOUT:
-                    # The timeout is based on the minimal timeout used in plugins.
-                    cache.set(cache_key, output, output.cache_timeout)
-                else:
-                    # Don't want to mix into the default 0/None issue.
-                    cache.set(cache_key, output)
+            if try_cache:
+                if is_fallback:
+                    # Content could be rendered in a different gettext language domain,
+                    # hence the fallback is stored under a key that includes both languages.
+                    self._use_fallback_cache_key(cache_keys, placeholder.slot, fallback_code)
+
+                self._set_cached_placeholders(
+                    parent_object,
+                    language_code,
+                    cache_keys,
+                    {placeholder.slot: output},
+                    render_time=time.time() - start,
+                )
+
+        return self._fill_holes(output)
+
+    def iter_placeholder(
+        self, placeholder, parent_object=None, limit_parent_language=True, fallback_language=None
+    ):
+        """
+        .. versionadded:: 3.2
+
+        Render the placeholder items one by one, see :func:`~RenderingPipe.iter_items`.
+        When the full placeholder output is cached, that is yielded at once.
+        """
+        if parent_object is None:
+            parent_object = placeholder.parent
+
+        if self.may_cache_placeholders() and not self.edit_mode:
+            language_code = get_parent_language_code(parent_object)
+            cache_key = get_placeholder_cache_key_for_parent(
+                parent_object, placeholder.slot, language_code
+            )
+            output = get_cached_placeholder(
+                cache_key, self._get_fallback_language_code(fallback_language)
+            )
+            if output is not None:
+                logger.debug("- fetched cached output for '%s'", placeholder.slot)
+                yield self._fill_holes(output)
+                return
+
+        items, is_fallback = self._get_placeholder_items(
+            placeholder, parent_object, limit_parent_language, fallback_language, try_cache=False
+        )
+        yield from self.iter_items(placeholder, items, parent_object)
+
+    def render_placeholders(self, parent_object, slots, fallback_language=None):
+        """
+        Render multiple placeholders of the same parent object at once.
+        This performs a single cache lookup and a single query for all placeholders and their items.
+        The merged output is always rendered without a template.
+
+        Returns a dictionary with a :class:`~fluent_contents.models.ContentItemOutput` for every slot.
+        """
+        logger.debug("Rendering placeholders %s", ", ".join(slots))
+        try_cache = self.may_cache_placeholders() and not self.edit_mode
+        outputs = {}
 
+        # Fetch the output of all placeholders from cache.
+        language_code = get_parent_language_code(parent_object)
+        fallback_code = self._get_fallback_language_code(fallback_language)
+        cache_keys = {}
+        if try_cache:
+            cache_keys, outputs = self._get_cached_placeholders(
+                parent_object, slots, language_code, fallback_code
+            )
+
+        missing_slots = [slot for slot in slots if slot not in outputs]
+        if not missing_slots:
+            return {slot: self._fill_holes(output) for slot, output in outputs.items()}
+
+        start = time.time()
+
+        # Fetch the remaining placeholders and their items
+        placeholders = {}
+        placeholder_qs = Placeholder.objects.parent(parent_object).filter(slot__in=missing_slots)
+        for placeholder in placeholder_qs:
+            placeholder.parent = parent_object  # fill the reverse cache
+            placeholders[placeholder.slot] = placeholder
+
+        placeholder_items = self._get_placeholders_items(
+            list(placeholders.values()), parent_object, fallback_language
+        )
+
+        for slot in missing_slots:
+            if slot not in placeholders:
+                outputs[slot] = self._get_missing_output(slot)
+
+        placeholder_outputs = self._render_placeholders_items(
+            placeholders.values(),
+            {placeholder_id: items for placeholder_id, (items, _) in placeholder_items.items()},
+        )
+        for slot, placeholder in placeholders.items():
+            outputs[slot] = placeholder_outputs[placeholder.id]
+            if try_cache and placeholder_items[placeholder.id][1]:
+                # Store the fallback under a different key, see render_placeholder()
+                self._use_fallback_cache_key(cache_keys, slot, fallback_code)
+
+        # Store the full-placeholder contents in the cache.
+        if try_cache:
+            self._set_cached_placeholders(
+                parent_object,
+                language_code,
+                cache_keys,
+                {slot: outputs[slot] for slot in missing_slots},
+                render_time=time.time() - start,
+            )
+
+        outputs = {slot: self._fill_holes(output) for slot, output in outputs.items()}
+
+        # Wrap the result after it's stored in the cache.
+        if self.edit_mode:
+            for slot, placeholder in placeholders.items():
+                output = outputs[slot]
+                output.html = markers.wrap_placeholder_output(output.html, placeholder)
+
+        return outputs
+
+    def render_placeholder_list(self, placeholders, fallback_language=None):
+        """
+        .. versionadded:: 3.2
+
+        Render the placeholders of different parent objects at once.
+        The parent of each placeholder should be known, and its items can be fetched using
+        :func:`~fluent_contents.models.prefetch_contentitems`.
+        The derived tables of all items that need to be rendered are read in a single query per model.
+        The merged output is always rendered without a template, and it's not cached.
+
+        Returns a list with a :class:`~fluent_contents.models.ContentItemOutput` for every placeholder.
+        """
+        placeholder_items = {}
+        for placeholder in placeholders:
+            items, is_fallback = self._get_placeholder_items(
+                placeholder, placeholder.parent, True, fallback_language, try_cache=False
+            )
+            placeholder_items[placeholder.id] = list(items)
+
+        outputs = self._render_placeholders_items(placeholders, placeholder_items)
+
+        result = []
+        for placeholder in placeholders:
+            output = self._fill_holes(outputs[placeholder.id])
+            if self.edit_mode:
+                output.html = markers.wrap_placeholder_output(output.html, placeholder)
+            result.append(output)
+        return result
+
+    def _render_placeholders_items(self, placeholders, placeholder_items):
+        # Render the items of multiple placeholders.
+        # Returns a dictionary with the output for each placeholder ID.
+        outputs = {}
+        results = {}
+        for placeholder in placeholders:
+            items = placeholder_items[placeholder.id]
+            if not items:
+                outputs[placeholder.id] = self._get_empty_output(placeholder)
+            else:
+                result = self._create_result(placeholder, items, placeholder.parent)
+                self._fetch_cached_output(items, result=result)
+                results[placeholder.id] = result
+
+        # Read the derived tables of all items that need to be rendered in one go.
+        self._fetch_remaining_instances(results.values())
+
+        for placeholder_id, result in results.items():
+            outputs[placeholder_id] = self._render_result(result, result.items, template_name=None)
+        return outputs
+
+    def render_missing_placeholder(self, parent_object, slot, cachable=True):
+        """
+        .. versionadded:: 3.2
+
+        Return the output for a placeholder that doesn't exist yet.
+        This output is cached like the regular placeholder output,
+        so the next request doesn't have to query for the placeholder again.
+        Creating the placeholder removes it from the cache.
+        """
+        output = self._get_missing_output(slot)
+        if cachable and self.may_cache_placeholders():
+            language_code = get_parent_language_code(parent_object)
+            cache_key = get_placeholder_cache_key_for_parent(parent_object, slot, language_code)
+            self._set_cached_placeholders(
+                parent_object, language_code, {slot: cache_key}, {slot: output}
+            )
+        return output
+
+    def _get_missing_output(self, slot):
+        logger.debug("- placeholder '%s' does not yet exist", slot)
+        return ContentItemOutput(
+            mark_safe("<!-- placeholder '{}' does not yet exist -->".format(escape(slot))),
+            cacheable=True,
+        )
+
+    def _create_result(
+        self, placeholder, items, parent_object=None, template_name=None, cachable=None
+    ):
+        result = super()._create_result(placeholder, items, parent_object, template_name, cachable)
+        result.punch_holes = bool(
+            appsettings.FLUENT_CONTENTS_CACHE_HOLE_PUNCHING
+            and result.all_cacheable
+            and self.may_cache_placeholders()
+        )
+        return result
+
+    def _render_result(self, result, items, template_name):
+        output = super()._render_result(result, items, template_name)
+        self._track_per_site_slot(result)
         return output
 
+    def _track_per_site_slot(self, result):
+        placeholder = result.placeholder
+        if result.cache_per_site and placeholder is not None:
+            # Tell _get_placeholder_cache_writes() to store the output under a site specific key.
+            self._per_site_slots.add(
+                (placeholder.parent_type_id, placeholder.parent_id, placeholder.slot)
+            )
+
+    def get_html_output(self, result, items):
+        html_output, media = super().get_html_output(result, items)
+        if appsettings.FLUENT_CONTENTS_CACHE_HOLE_PUNCHING:
+            # Replace the output of dynamic items with a marker, which is filled in after caching.
+            # Any marker text in the other items is removed, it's not created by this pipe.
+            for i, (contentitem, output) in enumerate(result.get_output(include_exceptions=True)):
+                if result._get_item_id(contentitem) in result.holes:
+                    self._hole_html[contentitem.pk] = html_output[i]
+                    html_output[i] = get_hole_html(contentitem)
+                else:
+                    html_output[i] = remove_hole_markers(html_output[i])
+        return html_output, media
+
+    def _fill_holes(self, output):
+        """
+        Render the dynamic items of a placeholder output that was cached with :ref:`FLUENT_CONTENTS_CACHE_HOLE_PUNCHING`.
+        This returns a new output object, which is marked as not cacheable.
+        """
+        if appsettings.FLUENT_CONTENTS_CACHE_HOLE_PUNCHING != "inline":
+            return output  # the markers are either not used, or handled by the edge server.
+
+        hole_ids = get_hole_ids(output.html)
+        if not hole_ids:
+            return output
+
+        missing_ids = [pk for pk in hole_ids if pk not in self._hole_html]
+        if missing_ids:
+            items = ContentItem.objects.filter(pk__in=missing_ids).non_polymorphic()
+            for contentitem in _get_real_instances(items):
+                self._hole_html[contentitem.pk] = self._render_hole(contentitem)
+
+        return ContentItemOutput(
+            fill_holes(output.html, self._hole_html),
+            output.media,
+            cacheable=False,
+            cache_timeout=output.cache_timeout,
+        )
+
+    def _render_hole(self, contentitem):
+        try:
+            return self.render_item(contentitem).html
+        except PluginNotFound as ex:
+            logger.debug("- item #%s has no matching plugin: %s", contentitem.pk, str(ex))
+            return ""
+        except SkipItem:
+            return ""
+
+    def _get_cached_placeholders(self, parent_object, slots, language_code, fallback_code=None):
+        """
+        Read the cached output of multiple placeholders in a single cache call.
+        Returns the cache key of every slot, and the output of the slots that don't have to be rendered.
+
+        With :ref:`FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION` enabled,
+        only a single worker renders a missing placeholder while the others display the previous output,
+        or the output is rendered again shortly before it expires.
+        """
+        cache_keys, read_keys = self._get_placeholder_read_keys(
+            parent_object, slots, language_code, fallback_code
+        )
+        outputs = self._read_cached_placeholders(
+            cache_keys, cache.get_many(read_keys), fallback_code
+        )
+
+        if appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION == "lock":
+            missing_slots = [slot for slot in slots if slot not in outputs]
+            if missing_slots:
+                outputs.update(
+                    self._get_stale_placeholders(
+                        parent_object, missing_slots, cache_keys, language_code
+                    )
+                )
+
+        return cache_keys, outputs
+
+    def _get_placeholder_read_keys(self, parent_object, slots, language_code, fallback_code=None):
+        # Return the cache key of every slot, and all keys that need to be read.
+        cache_keys = {
+            slot: get_placeholder_cache_key_for_parent(parent_object, slot, language_code)
+            for slot in slots
+        }
+        # The output could also be stored per site or as fallback, read all keys at once.
+        read_keys = [
+            key
+            for cache_key in cache_keys.values()
+            for key in get_placeholder_output_keys(cache_key, fallback_code)
+        ]
+        if appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION == "early":
+            read_keys += [f"{cache_key}.expires" for cache_key in read_keys]
+        return cache_keys, read_keys
+
+    def _read_cached_placeholders(self, cache_keys, cached_output, fallback_code=None):
+        # Return the cached output of the slots that don't have to be rendered.
+        outputs = {}
+        now = time.time()
+        for slot, cache_key in cache_keys.items():
+            output = _find_cached_placeholder(
+                cached_output, cache_key, fallback_code, self.early_expiration_beta, now
+            )
+            if output is not None:
+                logger.debug("- fetched cached output for '%s'", slot)
+                outputs[slot] = output
+        return outputs
+
+    def _get_stale_placeholders(self, parent_object, slots, cache_keys, language_code):
+        # Only render the placeholders which can be locked.
+        # When another worker is already rendering the placeholder, return the previous output instead.
+        # When there is no previous output, the placeholder is still rendered.
+        stale_keys = {}
+        for slot in slots:
+            lock_key = f"{cache_keys[slot]}.lock"
+            if cache.add(lock_key, True, appsettings.FLUENT_CONTENTS_CACHE_LOCK_TIMEOUT):
+                self._placeholder_locks.append(lock_key)
+            else:
+                stale_keys[slot] = get_placeholder_stale_cache_key_for_parent(
+                    parent_object, slot, language_code
+                )
+
+        if not stale_keys:
+            return {}
+
+        return self._read_stale_placeholders(stale_keys, cache.get_many(list(stale_keys.values())))
+
+    def _read_stale_placeholders(self, stale_keys, stale_output):
+        outputs = {}
+        for slot, stale_key in stale_keys.items():
+            try:
+                outputs[slot] = stale_output[stale_key]
+            except KeyError:
+                pass
+            else:
+                logger.debug("- fetched previous output for '%s', rendered elsewhere", slot)
+        return outputs
+
+    def _set_cached_placeholders(
+        self, parent_object, language_code, cache_keys, outputs, render_time=0
+    ):
+        """
+        Store the output of multiple placeholders in the cache, using a single cache call per timeout.
+        """
+        for values, timeout in self._get_placeholder_cache_writes(
+            parent_object, language_code, cache_keys, outputs, render_time
+        ):
+            if timeout is not DEFAULT_TIMEOUT:
+                cache.set_many(values, timeout)
+            else:
+                # Don't want to mix into the default 0/None issue.
+                cache.set_many(values)
+
+        if self._placeholder_locks:
+            cache.delete_many(self._placeholder_locks)
+            self._placeholder_locks = []
+
+    def _get_placeholder_cache_writes(
+        self, parent_object, language_code, cache_keys, outputs, render_time
+    ):
+        # Return the ``(values, timeout)`` pairs to store in the cache.
+        mode = appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION
+        parent_type_id = ContentType.objects.get_for_model(parent_object).id
+        per_site_slots = {
+            slot
+            for (slot_parent_type_id, slot_parent_id, slot) in self._per_site_slots
+            if slot_parent_type_id == parent_type_id and slot_parent_id == parent_object.pk
+        }
+        writes = {}
+        for slot, output in outputs.items():
+            if output.cacheable:
+                cache_key = cache_keys[slot]
+                if slot in per_site_slots:
+                    cache_key = get_placeholder_site_cache_key(cache_key)
+
+                # The timeout is based on the minimal timeout used in plugins.
+                writes.setdefault(output.cache_timeout, {})[cache_key] = output
+
+        cache_writes = []
+        now = time.time()
+        for timeout, values in writes.items():
+            cache_writes.append((values, timeout))
+            if timeout is DEFAULT_TIMEOUT:
+                timeout = cache.default_timeout
+
+            if mode == "early" and timeout is not None:
+                expires = (now + timeout, render_time)
+                cache_writes.append(
+                    ({f"{cache_key}.expires": expires for cache_key in values}, timeout)
+                )
+
+        if mode == "lock":
+            stale_values = {
+                get_placeholder_stale_cache_key_for_parent(
+                    parent_object, slot, language_code
+                ): output
+                for slot, output in outputs.items()
+                if output.cacheable and slot not in per_site_slots  # no stale copy per site.
+            }
+            if stale_values:
+                cache_writes.append(
+                    (stale_values, appsettings.FLUENT_CONTENTS_CACHE_STALE_TIMEOUT)
+                )
+
+        return cache_writes
+
+    def _get_placeholders_items(self, placeholders, parent_object, fallback_language):
+        """
+        Fetch the items of multiple placeholders using a single query.
+        Returns a dictionary with a tuple of the ``(items, is_fallback)`` for each placeholder ID.
+        """
+        placeholder_items = {placeholder.id: [] for placeholder in placeholders}
+        if not placeholders:
+            return {}
+
+        if not _is_untranslated_parent(parent_object):
+            # Only query the items that are not fetched by prefetch_contentitems() yet.
+            language_code = get_parent_language_code(parent_object)
+            missing = self._read_prefetched_items(
+                placeholders, parent_object, language_code, placeholder_items
+            )
+            if missing:
+                items = (
+                    ContentItem.objects.filter(placeholder__in=missing)
+                    .parent(parent_object, limit_parent_language=True)
+                    .non_polymorphic()
+                )
+                for contentitem in items:
+                    placeholder_items[contentitem.placeholder_id].append(contentitem)
+
+        fallback_ids = set()
+        if fallback_language:
+            # Read the fallback language for all placeholders that have no items.
+            empty_placeholders = [p for p in placeholders if not placeholder_items[p.id]]
+            if empty_placeholders:
+                language_code = self._get_fallback_language_code(fallback_language)
+                logger.debug("- reading fallback language %s", language_code)
+                missing = self._read_prefetched_items(
+                    empty_placeholders, parent_object, language_code, placeholder_items
+                )
+                if missing:
+                    items = (
+                        ContentItem.objects.filter(placeholder__in=missing)
+                        .parent(parent_object, limit_parent_language=False)
+                        .translated(language_code)
+                        .non_polymorphic()
+                    )
+                    for contentitem in items:
+                        placeholder_items[contentitem.placeholder_id].append(contentitem)
+                fallback_ids = {p.id for p in empty_placeholders}
+
+        return {
+            placeholder_id: (items, placeholder_id in fallback_ids)
+            for placeholder_id, items in placeholder_items.items()
+        }
+
+    def _read_prefetched_items(
+        self, placeholders, parent_object, language_code, placeholder_items
+    ):
+        # Fill the items which are fetched by prefetch_contentitems(),
+        # and return the placeholders that still need to be queried.
+        missing = []
+        for placeholder in placeholders:
+            items = _get_prefetched_contentitems(parent_object, placeholder.slot, language_code)
+            if items is None:
+                missing.append(placeholder)
+            else:
+                placeholder_items[placeholder.id] = items
+        return missing
+
     def _get_placeholder_items(
         self,
         placeholder,
@@ -512,32 +1223,89 @@ class PlaceholderRenderingPipe(RenderingPipe):
         fallback_language,
         try_cache,
     ):
-        # No full-placeholder cache. Get the items
-        items = placeholder.get_content_items(
-            parent_object, limit_parent_language=limit_parent_language
-        ).non_polymorphic()
-        if isinstance(items, EmptyQuerySet):  # Detect qs.none() was applied
-            logging.debug("- skipping regular language, parent object has no translation for it.")
+        # No full-placeholder cache. Get the items, which may be fetched by prefetch_contentitems().
+        items = None
+        language_code = get_parent_language_code(parent_object) if limit_parent_language else None
+        if not _is_untranslated_parent(parent_object, limit_parent_language):
+            items = _get_prefetched_contentitems(parent_object, placeholder.slot, language_code)
+            if items is None:
+                items = self._get_manifest_items(placeholder, language_code)
+
+        if items is None:
+            items = placeholder.get_content_items(
+                parent_object, limit_parent_language=limit_parent_language
+            ).non_polymorphic()
+            if isinstance(items, EmptyQuerySet):  # Detect qs.none() was applied
+                logging.debug(
+                    "- skipping regular language, parent object has no translation for it."
+                )
+            else:
+                items = self._set_manifest_items(placeholder, language_code, items)
 
         if (
             fallback_language and not items
         ):  # NOTES: performs query, so hence the .non_polymorphic() above
             # There are no items, but there is a fallback option. Try it.
-            language_code = (
-                appsettings.FLUENT_CONTENTS_DEFAULT_LANGUAGE_CODE
-                if fallback_language is True
-                else fallback_language
-            )
+            language_code = self._get_fallback_language_code(fallback_language)
             logger.debug("- reading fallback language %s, try_cache=%s", language_code, try_cache)
-            items = (
-                placeholder.get_content_items(parent_object, limit_parent_language=False)
-                .translated(language_code)
-                .non_polymorphic()
-            )
+            items = _get_prefetched_contentitems(parent_object, placeholder.slot, language_code)
+            if items is None:
+                items = self._get_manifest_items(placeholder, language_code)
+            if items is None:
+                items = (
+                    placeholder.get_content_items(parent_object, limit_parent_language=False)
+                    .translated(language_code)
+                    .non_polymorphic()
+                )
+                items = self._set_manifest_items(placeholder, language_code, items)
             return items, True
         else:
             return items, False
 
+    def may_use_item_manifest(self):
+        """
+        .. versionadded:: 3.2
+
+        Tell whether the list of items in a placeholder can be read from the cache.
+        This allows reading the cached output of all items without querying the items first.
+        """
+        return appsettings.FLUENT_CONTENTS_CACHE_OUTPUT and self.use_cached_output
+
+    def _get_manifest_items(self, placeholder, language_code):
+        # Return the items of a placeholder from the cached item list, or None when it's not cached.
+        if not self.may_use_item_manifest():
+            return None
+
+        manifest = cache.get(get_placeholder_items_cache_key(placeholder, language_code))
+        if manifest is None:
+            return None
+
+        logger.debug("- fetched item list for '%s'", placeholder.slot)
+        return _get_manifest_items(placeholder, manifest)
+
+    def _set_manifest_items(self, placeholder, language_code, items):
+        # Store the list of items, the next request can read their cached output without any query.
+        if not self.may_use_item_manifest():
+            return items
+
+        items = list(items)
+        cache.set(
+            get_placeholder_items_cache_key(placeholder, language_code), _get_manifest(items)
+        )
+        return items
+
+    def _use_fallback_cache_key(self, cache_keys, slot, fallback_code):
+        # Let _get_placeholder_cache_writes() store the output of the slot as fallback.
+        cache_keys[slot] = get_placeholder_fallback_cache_key(cache_keys[slot], fallback_code)
+
+    def _get_fallback_language_code(self, fallback_language):
+        if not fallback_language:
+            return None
+        elif fallback_language is True:
+            return appsettings.FLUENT_CONTENTS_DEFAULT_LANGUAGE_CODE
+        else:
+            return fallback_language
+
     @classmethod
     def may_cache_placeholders(cls):
         return (
@@ -550,6 +1318,117 @@ class SkipItem(RuntimeError):
     pass
 
 
+class _RenderThreadTimeout(Exception):
+    # The item was not rendered within the FLUENT_CONTENTS_RENDER_THREAD_TIMEOUT.
+    pass
+
+
+def _get_manifest(items):
+    # The compact item list that is stored in the cache.
+    # The render payload is included, so uncached items can be rendered without reading their derived table.
+    return [
+        (
+            item.pk,
+            item.polymorphic_ctype_id,
+            item.language_code,
+            item.sort_order,
+            item.render_payload,
+        )
+        for item in items
+    ]
+
+
+def _get_manifest_items(placeholder, manifest):
+    # Construct the non-polymorphic items from the cached item list.
+    # When their output is not cached, the rendering pipe constructs the items from their render payload,
+    # or reads their derived tables.
+    items = []
+    for pk, polymorphic_ctype_id, language_code, sort_order, render_payload in manifest:
+        item = ContentItem(
+            pk=pk,
+            polymorphic_ctype_id=polymorphic_ctype_id,
+            parent_type_id=placeholder.parent_type_id,
+            parent_id=placeholder.parent_id,
+            language_code=language_code,
+            placeholder=placeholder,
+            sort_order=sort_order,
+            render_payload=render_payload,
+        )
+        item._state.adding = False
+        item._state.db = placeholder._state.db
+        items.append(item)
+    return items
+
+
+def _get_real_instances(items):
+    # Same as ContentItem.objects.get_real_instances(),
+    # but construct the items from their render payload when the plugin supports that.
+    instances, remaining_items = _get_payload_instances(items)
+    if not instances:
+        return ContentItem.objects.get_real_instances(remaining_items)
+
+    if remaining_items:
+        for instance in ContentItem.objects.get_real_instances(remaining_items):
+            instances[instance.pk] = instance
+    return [instances[item.pk] for item in items if item.pk in instances]
+
+
+def _get_payload_instances(items):
+    # Return the instances constructed from their render payload, and the remaining items.
+    instances = {}
+    remaining_items = []
+    for item in items:
+        try:
+            instance = item.plugin.get_instance_from_payload(item)
+        except PluginNotFound:
+            instance = None
+
+        if instance is None:
+            remaining_items.append(item)
+        else:
+            instances[item.pk] = instance
+    return instances, remaining_items
+
+
+_render_executor = None
+_render_executor_lock = threading.Lock()
+
+
+class _RenderThreadState(threading.local):
+    active = False
+
+
+_render_thread_state = _RenderThreadState()
+
+
+def _get_render_executor():
+    """
+    Return the thread pool that renders the items of thread-safe plugins.
+    The pool is shared by all requests, so the number of threads stays bounded.
+    """
+    global _render_executor
+    if _render_executor is None:
+        with _render_executor_lock:
+            if _render_executor is None:
+                _render_executor = ThreadPoolExecutor(
+                    max_workers=appsettings.FLUENT_CONTENTS_RENDER_THREADS,
+                    thread_name_prefix="fluent_contents_render",
+                )
+    return _render_executor
+
+
+def _render_item_in_thread(pipe, contentitem, language):
+    # Like Django does at the start of a request, discard connections that are broken or expired.
+    # Connections are kept for the next item, and closed when the worker thread finishes.
+    close_old_connections()
+    _render_thread_state.active = True
+    try:
+        with translation.override(language):
+            return pipe.render_item(contentitem)
+    finally:
+        _render_thread_state.active = False
+
+
 def _get_stale_item_class_name(item):
     try:
         return item.plugin.type_name
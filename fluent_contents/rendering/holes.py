@@ -0,0 +1,91 @@
+"""
+Placeholders in the cached output, for items that can't be cached.
+
+With :ref:`FLUENT_CONTENTS_CACHE_HOLE_PUNCHING` enabled, the full placeholder output is cached
+with a marker for each dynamic item. The markers are either filled in for every request,
+or rendered as ``<esi:include>`` tags that the edge server resolves.
+"""
+import re
+
+from django.core import signing
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from fluent_contents import appsettings
+
+FRAGMENT_SALT = "fluent_contents.fragment"
+HOLE_SALT = "fluent_contents.hole"
+
+_hole_re = re.compile(r"<!--fluent-contents-hole:([^>]*?)-->")
+_hole_prefix = "<!--fluent-contents-hole:"
+
+
+def get_hole_html(contentitem):
+    """
+    Return the HTML that replaces the output of a dynamic item in the cached placeholder output.
+    """
+    if appsettings.FLUENT_CONTENTS_CACHE_HOLE_PUNCHING == "esi":
+        return mark_safe(
+            '<esi:include src="{}" />'.format(escape(get_fragment_url(contentitem.pk)))
+        )
+    else:
+        return mark_safe(
+            f"{_hole_prefix}{contentitem.pk}:{_get_hole_signature(contentitem.pk)}-->"
+        )
+
+
+def get_fragment_url(contentitem_id):
+    """
+    Return the URL of the fragment view that renders a single item.
+    The ID is signed, so only the items that are included in a page can be requested.
+    """
+    signed_id = signing.dumps(contentitem_id, salt=FRAGMENT_SALT)
+    return reverse("fluent_contents_fragment", args=(signed_id,))
+
+
+def get_hole_ids(html):
+    """
+    Return the IDs of the items that still need to be filled in.
+    Markers without a valid signature are ignored, as these could be typed in the content.
+    """
+    if _hole_prefix not in html:  # fast path
+        return []
+
+    hole_ids = (_get_hole_id(value) for value in _hole_re.findall(html))
+    return [pk for pk in hole_ids if pk is not None]
+
+
+def fill_holes(html, hole_html):
+    """
+    Replace the markers with the output of the items.
+    Markers without a valid signature are removed.
+
+    :param hole_html: The HTML for each item ID.
+    """
+    return mark_safe(
+        _hole_re.sub(lambda match: hole_html.get(_get_hole_id(match.group(1)), ""), html)
+    )
+
+
+def remove_hole_markers(html):
+    """
+    Remove the text of any marker from the output of an item,
+    so entered content can't include other items.
+    """
+    if _hole_prefix not in html:  # fast path
+        return html
+    return mark_safe(_hole_re.sub("", html))
+
+
+def _get_hole_signature(contentitem_id):
+    return salted_hmac(HOLE_SALT, str(contentitem_id)).hexdigest()
+
+
+def _get_hole_id(value):
+    # Parse the "pk:signature" value of a marker, returns None when it's invalid.
+    pk, _, signature = value.partition(":")
+    if not pk.isdigit() or not constant_time_compare(signature, _get_hole_signature(pk)):
+        return None
+    return int(pk)
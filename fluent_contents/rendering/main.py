@@ -2,30 +2,49 @@
 The main API for rendering content.
 This is exposed via __init__.py
 """
-from django.core.cache import cache
+
 from django.utils.safestring import mark_safe
 
-from fluent_contents.cache import get_placeholder_cache_key_for_parent
+from fluent_contents.cache import get_cached_placeholder, get_placeholder_cache_key_for_parent
 from fluent_contents.models import ContentItemOutput, get_parent_language_code
 
 from . import markers
+from .async_core import AsyncPlaceholderRenderingPipe, AsyncRenderingPipe
 from .core import PlaceholderRenderingPipe, RenderingPipe
+from .holes import get_hole_ids
+from .media import register_frontend_media
 from .search import SearchRenderingPipe
 
 
-def get_cached_placeholder_output(parent_object, placeholder_name):
+def get_cached_placeholder_output(
+    parent_object, placeholder_name, request=None, fallback_language=None
+):
     """
     Return cached output for a placeholder, if available.
     This avoids fetching the Placeholder object.
+
+    .. versionadded:: 3.2
+       The ``request`` parameter, which is used to render the items
+       that are left out of the cached output by :ref:`FLUENT_CONTENTS_CACHE_HOLE_PUNCHING`.
+       Without a request, such output is not returned.
+       The ``fallback_language`` parameter also returns the cached output of the fallback language,
+       like :func:`render_placeholder` does.
     """
     if not PlaceholderRenderingPipe.may_cache_placeholders():
         return None
 
+    pipe = PlaceholderRenderingPipe(request)
     language_code = get_parent_language_code(parent_object)
     cache_key = get_placeholder_cache_key_for_parent(
         parent_object, placeholder_name, language_code
     )
-    return cache.get(cache_key)
+    output = get_cached_placeholder(cache_key, pipe._get_fallback_language_code(fallback_language))
+    if output is not None and get_hole_ids(output.html):
+        if request is None:
+            # The dynamic items can't be rendered, let the caller render the placeholder.
+            return None
+        output = pipe._fill_holes(output)
+    return output
 
 
 def render_placeholder(
@@ -77,6 +96,169 @@ def render_placeholder(
     return output
 
 
+async def arender_placeholder(
+    request,
+    placeholder,
+    parent_object=None,
+    template_name=None,
+    cachable=None,
+    limit_parent_language=True,
+    fallback_language=None,
+):
+    """
+    .. versionadded:: 3.2
+
+    The asynchronous version of :func:`render_placeholder`, which accepts the same parameters.
+    This uses the async cache API and async database queries,
+    and renders the items using :func:`ContentPlugin.arender() <fluent_contents.extensions.ContentPlugin.arender>`.
+
+    :rtype: :class:`~fluent_contents.models.ContentItemOutput`
+    """
+    output = await AsyncPlaceholderRenderingPipe(request).arender_placeholder(
+        placeholder=placeholder,
+        parent_object=parent_object,
+        template_name=template_name,
+        cachable=cachable,
+        limit_parent_language=limit_parent_language,
+        fallback_language=fallback_language,
+    )
+
+    # Wrap the result after it's stored in the cache.
+    if markers.is_edit_mode(request):
+        output.html = markers.wrap_placeholder_output(output.html, placeholder)
+
+    return output
+
+
+def iter_placeholder_html(
+    request, placeholder, parent_object=None, limit_parent_language=True, fallback_language=None
+):
+    """
+    .. versionadded:: 3.2
+
+    Render a :class:`~fluent_contents.models.Placeholder` object as a sequence of HTML chunks.
+    This can be passed to a :class:`~django.http.StreamingHttpResponse`,
+    so a page with many items doesn't have to be kept in memory entirely:
+
+    .. code-block:: python
+
+        def article_view(request, slug):
+            article = get_object_or_404(Article, slug=slug)
+            placeholder = Placeholder.objects.get_by_slot(article, "main")
+            return StreamingHttpResponse(iter_placeholder_html(request, placeholder))
+
+    The cached output of all items is read at once, the remaining items are rendered when their turn comes.
+    The media of the items is registered in the request as the output is generated,
+    so it can be displayed at the end of the page using the ``{% render_content_items_media %}`` tag.
+    The full placeholder output is not stored in the cache.
+
+    :param request: The current request object.
+    :type request: :class:`~django.http.HttpRequest`
+    :param placeholder: The placeholder object.
+    :type placeholder: :class:`~fluent_contents.models.Placeholder`
+    :param parent_object: Optional, the parent object of the placeholder (already implied by the placeholder)
+    :param limit_parent_language: Whether the items should be limited to the parent language.
+    :type limit_parent_language: bool
+    :param fallback_language: The fallback language to use if there are no items in the current language. Passing ``True`` uses the default :ref:`FLUENT_CONTENTS_DEFAULT_LANGUAGE_CODE`.
+    :type fallback_language: bool/str
+    :rtype: Iterator[str]
+    """
+    if markers.is_edit_mode(request):
+        # The placeholder is wrapped in a single element, render it at once.
+        output = render_placeholder(
+            request,
+            placeholder,
+            parent_object=parent_object,
+            limit_parent_language=limit_parent_language,
+            fallback_language=fallback_language,
+        )
+        register_frontend_media(request, output.media)
+        yield output.html
+        return
+
+    outputs = PlaceholderRenderingPipe(request).iter_placeholder(
+        placeholder,
+        parent_object=parent_object,
+        limit_parent_language=limit_parent_language,
+        fallback_language=fallback_language,
+    )
+    for output in outputs:
+        register_frontend_media(request, output.media)
+        yield output.html
+
+
+def render_missing_placeholder(request, parent_object, slot, cachable=True):
+    """
+    .. versionadded:: 3.2
+
+    Return the output for a placeholder that doesn't exist yet.
+    The output is cached like the placeholder output, until the placeholder is created.
+
+    :rtype: :class:`~fluent_contents.models.ContentItemOutput`
+    """
+    return PlaceholderRenderingPipe(request).render_missing_placeholder(
+        parent_object, slot, cachable=cachable
+    )
+
+
+def render_placeholders(request, parent_object, slots, fallback_language=None):
+    """
+    Render multiple placeholders of a parent object at once, e.g. all slots of a page template.
+    This reads the cached output of all placeholders in a single call,
+    and fetches the remaining placeholders and their content items with a single query.
+
+    The output is also stored in the request, so a ``{% page_placeholder %}`` tag
+    for one of these slots can display it without performing any queries.
+
+    :param request: The current request object.
+    :type request: :class:`~django.http.HttpRequest`
+    :param parent_object: The parent object of the placeholders.
+    :param slots: The slot names of the placeholders to render.
+    :type slots: list[str]
+    :param fallback_language: The fallback language to use if there are no items in the current language. Passing ``True`` uses the default :ref:`FLUENT_CONTENTS_DEFAULT_LANGUAGE_CODE`.
+    :type fallback_language: bool/str
+    :returns: The :class:`~fluent_contents.models.ContentItemOutput` object for each slot.
+    :rtype: dict[str, ContentItemOutput]
+    """
+    outputs = PlaceholderRenderingPipe(request).render_placeholders(
+        parent_object, slots, fallback_language=fallback_language
+    )
+
+    if request is not None:
+        store = _get_prefetch_store(request)
+        for slot, output in outputs.items():
+            store[_get_prefetch_key(parent_object, slot, fallback_language)] = output
+
+    return outputs
+
+
+def get_prefetched_placeholder_output(request, parent_object, slot, fallback_language=None):
+    """
+    Return the output of a placeholder that was already rendered by :func:`render_placeholders` during this request.
+    This returns ``None`` when the placeholder was not rendered yet.
+    """
+    try:
+        store = request._fluent_contents_placeholder_output
+    except AttributeError:
+        return None
+
+    return store.get(_get_prefetch_key(parent_object, slot, fallback_language))
+
+
+def _get_prefetch_store(request):
+    try:
+        return request._fluent_contents_placeholder_output
+    except AttributeError:
+        store = request._fluent_contents_placeholder_output = {}
+        return store
+
+
+def _get_prefetch_key(parent_object, slot, fallback_language):
+    language_code = get_parent_language_code(parent_object)
+    cache_key = get_placeholder_cache_key_for_parent(parent_object, slot, language_code)
+    return cache_key, fallback_language or None
+
+
 def render_content_items(request, items, template_name=None, cachable=None):
     """
     Render a list of :class:`~fluent_contents.models.ContentItem` objects as HTML string.
@@ -115,6 +297,36 @@ def render_content_items(request, items, template_name=None, cachable=None):
     return output
 
 
+async def arender_content_items(request, items, template_name=None, cachable=None):
+    """
+    .. versionadded:: 3.2
+
+    The asynchronous version of :func:`render_content_items`, which accepts the same parameters.
+
+    :rtype: :class:`~fluent_contents.models.ContentItemOutput`
+    """
+    if hasattr(items, "non_polymorphic") and items._result_cache is None:
+        # Read the queryset without blocking, the derived models are fetched later.
+        items = [item async for item in items.non_polymorphic()]
+
+    if not items:
+        output = ContentItemOutput(mark_safe("<!-- no items to render -->"))
+    else:
+        output = await AsyncRenderingPipe(request).arender_items(
+            placeholder=None,
+            items=items,
+            parent_object=None,
+            template_name=template_name,
+            cachable=cachable,
+        )
+
+    # Wrap the result after it's stored in the cache.
+    if markers.is_edit_mode(request):
+        output.html = markers.wrap_anonymous_output(output.html)
+
+    return output
+
+
 def render_placeholder_search_text(placeholder, fallback_language=None):
     """
     Render a :class:`~fluent_contents.models.Placeholder` object to search text.
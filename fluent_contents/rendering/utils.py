@@ -14,6 +14,7 @@ from django.test import RequestFactory
 from django.utils.translation import get_language
 
 from fluent_contents.extensions import ContentPlugin
+from fluent_contents.models import get_media_keys
 
 logger = logging.getLogger(__name__)
 
@@ -23,10 +24,29 @@ _log_functions = {logging.DEBUG: "debug"}
 def add_media(dest, media):
     """
     Optimized version of django.forms.Media.__add__() that doesn't create new objects.
+    Lists of CSS and JavaScript files that are already included are skipped,
+    so Django only has to merge each list once.
     """
     if django.VERSION >= (2, 2):
-        dest._css_lists += media._css_lists
-        dest._js_lists += media._js_lists
+        try:
+            seen_css, seen_js = dest.__dict__["_fluent_contents_seen"]
+        except KeyError:
+            css_keys, js_keys = get_media_keys(dest)
+            seen_css, seen_js = dest._fluent_contents_seen = (set(css_keys), set(js_keys))
+
+        # Any keys of the object are outdated now.
+        dest.__dict__.pop("_fluent_contents_keys", None)
+
+        css_keys, js_keys = get_media_keys(media)
+        for key, css in zip(css_keys, media._css_lists):
+            if key not in seen_css:
+                seen_css.add(key)
+                dest._css_lists.append(css)
+
+        for key, js in zip(js_keys, media._js_lists):
+            if key not in seen_js:
+                seen_js.add(key)
+                dest._js_lists.append(js)
     elif django.VERSION >= (2, 0):
         combined = dest + media
         dest._css = combined._css
@@ -213,8 +213,16 @@ class PagePlaceholderNode(BaseAssignmentOrOutputNode):
                 )
             )
 
+        if not template_name and cachable:
+            # See if the placeholder was already rendered by rendering.render_placeholders(),
+            # which fetches all placeholders of a page at once.
+            output = rendering.get_prefetched_placeholder_output(
+                request, parent, slot, fallback_language
+            )
+
         if (
-            appsettings.FLUENT_CONTENTS_CACHE_OUTPUT
+            output is None
+            and appsettings.FLUENT_CONTENTS_CACHE_OUTPUT
             and appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT
             and cachable
         ):
@@ -222,30 +230,124 @@ class PagePlaceholderNode(BaseAssignmentOrOutputNode):
             # if so, no database queries have to be performed.
             # This will be omitted when an template is used,
             # because there is no way to expire that or tell whether that template is cacheable.
-            output = get_cached_placeholder_output(parent, slot)
+            output = get_cached_placeholder_output(parent, slot, request, fallback_language)
 
         if output is None:
             # Get the placeholder
             try:
                 placeholder = Placeholder.objects.get_by_slot(parent, slot)
             except Placeholder.DoesNotExist:
-                return f"<!-- placeholder '{slot}' does not yet exist -->"
-
-            output = rendering.render_placeholder(
-                request,
-                placeholder,
-                parent,
-                template_name=template_name,
-                cachable=cachable,
-                limit_parent_language=True,
-                fallback_language=fallback_language,
-            )
+                # Also cache this, so the next request doesn't query for the placeholder again.
+                output = rendering.render_missing_placeholder(
+                    request, parent, slot, cachable=cachable
+                )
+            else:
+                output = rendering.render_placeholder(
+                    request,
+                    placeholder,
+                    parent,
+                    template_name=template_name,
+                    cachable=cachable,
+                    limit_parent_language=True,
+                    fallback_language=fallback_language,
+                )
 
         # Assume it doesn't hurt to register media. TODO: should this be optional?
         rendering.register_frontend_media(request, output.media)
         return output.html
 
 
+@register.tag
+def prefetch_placeholders(parser, token):
+    """
+    Render all placeholders of the current template at once. Syntax:
+
+    .. code-block:: html+django
+
+        {% prefetch_placeholders currentpage %}
+
+    If the currentpage variable is named ``page``, it can be left out.
+
+    This finds all ``{% page_placeholder %}`` tags in the template (including the templates it extends),
+    and renders those slots using :func:`~fluent_contents.rendering.render_placeholders`.
+    The ``{% page_placeholder %}`` tags that follow will display the prefetched output without any queries.
+    Hence, place this tag at the top of the base template.
+    Placeholders that are rendered with a custom ``template`` or ``cachable=False`` are not prefetched.
+    """
+    return PrefetchPlaceholdersNode.parse(parser, token)
+
+
+class PrefetchPlaceholdersNode(BaseNode):
+    """
+    The template node of the ``prefetch_placeholders`` tag.
+    """
+
+    min_args = 0
+    max_args = 1
+
+    def render_tag(self, context, *tag_args, **tag_kwargs):
+        request = self.get_request(context)
+        if tag_args:
+            parent = tag_args[0]
+        else:
+            # Allow 'page' by default, just like {% page_placeholder %} does.
+            parent = Variable("page").resolve(context)
+
+        if parent is None or context.template is None:
+            return ""
+
+        # Render the slots per fallback setting, as that is part of the prefetched data.
+        slots = {}
+        for fallback_language, slot in _get_prefetch_slots(context.template):
+            slots.setdefault(fallback_language, []).append(slot)
+
+        for fallback_language, fallback_slots in slots.items():
+            rendering.render_placeholders(
+                request, parent, fallback_slots, fallback_language=fallback_language
+            )
+        return ""
+
+
+def _get_prefetch_slots(template):
+    """
+    Return the ``(fallback_language, slot)`` pairs of all placeholders that can be prefetched.
+    The scanning of the template is memoized, see :func:`fluent_contents.analyzer.get_template_placeholder_nodes`.
+    """
+    try:
+        return template._fluent_contents_prefetch_slots
+    except AttributeError:
+        pass
+
+    from fluent_contents.analyzer import get_template_placeholder_nodes  # avoid circular import
+
+    prefetch_slots = []
+    for node in get_template_placeholder_nodes(template):
+        slot = node.get_slot()
+        try:
+            fallback_language = extract_literal_bool(node.kwargs["fallback"])
+        except KeyError:
+            fallback_language = False
+        try:
+            cachable = extract_literal_bool(node.kwargs["cachable"])
+        except KeyError:
+            cachable = True
+
+        if (
+            slot is None
+            or fallback_language is None  # not a literal value
+            or "template" in node.kwargs  # template output is not prefetched
+            or not cachable  # prefetching would store the output in the cache.
+        ):
+            continue
+
+        item = (fallback_language, slot)
+        if item not in prefetch_slots:
+            prefetch_slots.append(item)
+
+    template._fluent_contents_prefetch_slots = prefetch_slots
+    return prefetch_slots
+
+
 @register.tag
 def render_placeholder(parser, token):
     """
@@ -0,0 +1,194 @@
+import pickle
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache as django_cache
+from django.forms import Media
+from django.test import SimpleTestCase
+from django.utils.safestring import mark_safe
+
+from fluent_contents import appsettings, models
+from fluent_contents.cache import TieredCache, _get_generation_cache_key, _get_media_cache_key
+from fluent_contents.models import ContentItemOutput, ImmutableMedia
+
+
+class TieredCacheTests(SimpleTestCase):
+    """
+    Test the local caching tiers.
+    """
+
+    def setUp(self):
+        django_cache.clear()
+        self.cache = TieredCache(django_cache)
+
+    def tearDown(self):
+        appsettings.FLUENT_CONTENTS_LOCAL_CACHE = False
+        appsettings.FLUENT_CONTENTS_LOCAL_CACHE_MAX_ENTRIES = 0
+        self.cache.end_request()
+
+    def test_request_local(self):
+        """
+        The request-local tier avoids reading the same key twice within a request.
+        """
+        appsettings.FLUENT_CONTENTS_LOCAL_CACHE = True
+        django_cache.set("key1", "value1")
+
+        # Outside a request, all reads go to the backend.
+        self.assertEqual(self.cache.get("key1"), "value1")
+        django_cache.set("key1", "value2")
+        self.assertEqual(self.cache.get("key1"), "value2")
+
+        self.cache.start_request()
+        self.assertEqual(self.cache.get_many(["key1", "key2"]), {"key1": "value2"})
+        django_cache.set("key1", "value3")
+        self.assertEqual(self.cache.get("key1"), "value2")
+
+        # Deleting evicts the local tier too.
+        self.cache.delete_many(["key1"])
+        self.assertIsNone(self.cache.get("key1"))
+        self.cache.set("key1", "value4")
+        django_cache.delete("key1")
+        self.assertEqual(self.cache.get("key1"), "value4")
+
+        # Next request reads the backend again
+        self.cache.end_request()
+        self.cache.start_request()
+        self.assertIsNone(self.cache.get("key1"))
+
+    def test_process_local(self):
+        """
+        The process-local tier keeps a limited number of entries for a short time.
+        """
+        appsettings.FLUENT_CONTENTS_LOCAL_CACHE_MAX_ENTRIES = 2
+        self.cache.set_many({"key1": 1, "key2": 2, "key3": 3})
+        django_cache.clear()
+
+        self.assertEqual(self.cache.get_many(["key1", "key2", "key3"]), {"key2": 2, "key3": 3})
+
+        timeout = appsettings.FLUENT_CONTENTS_LOCAL_CACHE_TIMEOUT
+        appsettings.FLUENT_CONTENTS_LOCAL_CACHE_TIMEOUT = -1
+        try:
+            self.cache.set("key4", 4)
+            django_cache.clear()
+            self.assertIsNone(self.cache.get("key4"))
+        finally:
+            appsettings.FLUENT_CONTENTS_LOCAL_CACHE_TIMEOUT = timeout
+
+    def test_shared_keys(self):
+        """
+        The cache generations and locks are always read from the backend.
+        """
+        appsettings.FLUENT_CONTENTS_LOCAL_CACHE = True
+        appsettings.FLUENT_CONTENTS_LOCAL_CACHE_MAX_ENTRIES = 10
+        self.cache.start_request()
+
+        generation_key = _get_generation_cache_key(1, 2)
+        self.cache.set_many({generation_key: 1, "key1.lock": True})
+        self.assertEqual(self.cache.get(generation_key), 1)
+
+        # Another process changes the keys
+        django_cache.incr(generation_key)
+        django_cache.delete("key1.lock")
+        self.assertEqual(self.cache.get(generation_key), 2)
+        self.assertEqual(self.cache.get_many([generation_key, "key1.lock"]), {generation_key: 2})
+
+    def test_async_writes(self):
+        """
+        The asynchronous methods update the local tiers too.
+        """
+        appsettings.FLUENT_CONTENTS_LOCAL_CACHE_MAX_ENTRIES = 10
+
+        async def run():
+            await self.cache.aset("key1", 1)
+            django_cache.clear()
+            self.assertEqual(await self.cache.aget("key1"), 1)
+
+            await self.cache.adelete("key1")
+            self.assertIsNone(await self.cache.aget("key1"))
+            self.assertEqual(await self.cache.aget_or_set("key2", 2), 2)
+
+        async_to_sync(run)()
+        self.assertEqual(django_cache.get("key2"), 2)
+        self.assertEqual(self.cache.get_or_set("key2", 3), 2)
+
+    def test_return_copies(self):
+        """
+        Like the Django cache, each read should return a new object.
+        """
+        appsettings.FLUENT_CONTENTS_LOCAL_CACHE = True
+        self.cache.start_request()
+        self.cache.set("key1", [1, 2])
+        self.cache.get("key1").append(3)
+        self.assertEqual(self.cache.get("key1"), [1, 2])
+
+
+class ContentItemOutputTests(SimpleTestCase):
+    """
+    Test the serialization of the cached output.
+    """
+
+    def test_pickle(self):
+        """
+        The output should survive pickling, including the media.
+        """
+        media = Media(css={"all": ["foo.css"]}, js=["foo.js"])
+        output = pickle.loads(pickle.dumps(ContentItemOutput(mark_safe("<b>foo</b>"), media)))
+        self.assertEqual(output.html, "<b>foo</b>")
+        self.assertEqual(output.media._css, {"all": ["foo.css"]})
+        self.assertEqual(output.media._js, ["foo.js"])
+
+        # No Media object is constructed when there is no media.
+        output = pickle.loads(pickle.dumps(ContentItemOutput(mark_safe("<b>foo</b>"))))
+        self.assertIs(output.media, ImmutableMedia.empty_instance)
+
+    def test_pickle_media_key(self):
+        """
+        The media is stored next to the output, the output only holds the key.
+        """
+        django_cache.clear()
+        tiered_cache = TieredCache(django_cache)
+        media = Media(css={"all": ["foo.css"]}, js=["foo.js"])
+        tiered_cache.set("key1", ContentItemOutput(mark_safe("<b>foo</b>"), media))
+        output = tiered_cache.get("key1")
+        self.assertNotIn(b"foo.css", pickle.dumps(output))
+
+        # Another process reads the media from the cache.
+        with mock.patch.dict(models._decoded_media, clear=True):
+            output = tiered_cache.get("key1")
+        self.assertEqual(output.media._css, {"all": ["foo.css"]})
+        self.assertEqual(output.media._js, ["foo.js"])
+
+        # When the media is no longer available, the output is rendered again.
+        django_cache.delete(_get_media_cache_key(models._encode_media(output.media)))
+        with mock.patch.dict(models._decoded_media, clear=True):
+            self.assertIsNone(tiered_cache.get("key1"))
+            self.assertEqual(tiered_cache.get_many(["key1"]), {})
+
+            tiered_cache.set("key1", ContentItemOutput(mark_safe("<b>foo</b>"), media))
+        with mock.patch.dict(models._decoded_media, clear=True):
+            self.assertEqual(tiered_cache.get("key1").media._js, ["foo.js"])
+
+    def test_pickle_compressed(self):
+        """
+        Large output can be compressed.
+        """
+        html = mark_safe("<p>Lorem ipsum dolor sit amet.</p>" * 200)
+        uncompressed = pickle.dumps(ContentItemOutput(html))
+
+        appsettings.FLUENT_CONTENTS_CACHE_COMPRESSION = "zlib"
+        try:
+            compressed = pickle.dumps(ContentItemOutput(html))
+        finally:
+            appsettings.FLUENT_CONTENTS_CACHE_COMPRESSION = None
+
+        self.assertLess(len(compressed), len(uncompressed) / 10)
+        self.assertEqual(pickle.loads(compressed).html, html)
+
+    def test_unpickle_old_format(self):
+        """
+        Output that was cached by older versions can still be read.
+        """
+        output = ContentItemOutput.__new__(ContentItemOutput)
+        output.__setstate__(("<b>foo</b>", [{"all": ["foo.css"]}], [["foo.js"]]))
+        self.assertEqual(output.html, "<b>foo</b>")
+        self.assertEqual(output.media._js, ["foo.js"])
@@ -1,6 +1,12 @@
+from unittest import mock
+
 from django.contrib.contenttypes.models import ContentType
 
-from fluent_contents.models import ContentItem
+from fluent_contents.extensions import plugin_pool
+from fluent_contents.extensions.pluginpool import PluginPool
+from fluent_contents.models import ContentItem, Placeholder, prefetch_placeholders
+from fluent_contents.tests import factories
+from fluent_contents.tests.testapp.models import PlaceholderFieldTestPage, RawHtmlTestItem
 from fluent_contents.tests.utils import AppTestCase
 
 
@@ -9,6 +15,8 @@ class ModelTests(AppTestCase):
     Testing the data model.
     """
 
+    install_apps = ("fluent_contents.tests.testapp",)
+
     def test_stale_model_str(self):
         """
         No matter what, the ContentItem.__str__() should work.
@@ -18,3 +26,85 @@ class ModelTests(AppTestCase):
         c.save()
         a = ContentItem(polymorphic_ctype=c)
         self.assertEqual(str(a), "'(type deleted) 0' in 'None None'")
+
+    def test_placeholder_field_cache(self):
+        """
+        The placeholder field should only be fetched once per object.
+        """
+        page = factories.create_page()
+        factories.create_placeholder(page=page)
+        page = PlaceholderFieldTestPage.objects.get(pk=page.pk)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(page.contents.slot, "field_slot1")
+            self.assertIs(page.contents, page.contents)
+
+    def test_prefetch_placeholders(self):
+        """
+        The placeholders of multiple objects can be fetched in a single query.
+        """
+        page1 = factories.create_page()
+        page2 = factories.create_page()
+        placeholder1 = factories.create_placeholder(page=page1)
+        factories.create_page()  # no placeholder
+
+        with self.assertNumQueries(2):
+            pages = prefetch_placeholders(
+                PlaceholderFieldTestPage.objects.order_by("pk"), "contents"
+            )
+
+        with self.assertNumQueries(0):
+            self.assertEqual(pages[0].contents, placeholder1)
+            self.assertEqual(pages[0].contents.parent, pages[0])
+            self.assertRaises(Placeholder.DoesNotExist, lambda: pages[2].contents)
+
+        # The cache is updated when the placeholder is created.
+        placeholder2 = factories.create_placeholder(page=pages[1])
+        with self.assertNumQueries(0):
+            self.assertEqual(pages[1].contents, placeholder2)
+        self.assertEqual(page2.pk, pages[1].pk)
+
+    def test_plugin_lookup(self):
+        """
+        The plugin of an item is found in the precomputed lookup tables.
+        """
+        item = factories.create_content_item(RawHtmlTestItem, html="<b>Item1!</b>")
+        base_item = ContentItem.objects.non_polymorphic().get(pk=item.pk)
+        plugin = plugin_pool.get_plugin_by_model(RawHtmlTestItem)
+        plugin_pool._setup_lazy_indexes()
+
+        with mock.patch.object(plugin_pool, "_import_plugins") as import_plugins:
+            with self.assertNumQueries(0):
+                self.assertIs(item.plugin, plugin)
+                self.assertIs(base_item.plugin, plugin)
+        self.assertEqual(import_plugins.call_count, 0)
+
+        # The allowed plugins are only computed once per slot.
+        self.assertIn(plugin, plugin_pool.get_allowed_plugins("field_slot1"))
+        with mock.patch.object(plugin_pool, "get_plugins") as get_plugins:
+            self.assertIn(plugin, plugin_pool.get_allowed_plugins("field_slot1"))
+        self.assertEqual(get_plugins.call_count, 0)
+
+    def test_plugin_lazy_import(self):
+        """
+        Only the module that registers the plugin of a model is imported on first use.
+        """
+        from fluent_contents.extensions import pluginpool
+        from fluent_contents.tests.testapp.content_plugins import RawHtmlTestPlugin
+
+        pool = PluginPool()
+
+        def import_module(module_name):
+            self.assertEqual(module_name, "fluent_contents.tests.testapp.content_plugins")
+            pool.register(RawHtmlTestPlugin)
+
+        with mock.patch.object(
+            pluginpool, "import_module_or_none", side_effect=import_module
+        ), mock.patch.object(pluginpool, "import_apps_submodule") as import_apps_submodule:
+            ct_id = ContentType.objects.get_for_model(RawHtmlTestItem).id
+            plugin = pool._get_plugin_by_content_type(ct_id)
+            self.assertIsInstance(plugin, RawHtmlTestPlugin)
+            self.assertIs(pool.get_plugin_by_model(RawHtmlTestItem), plugin)
+
+        self.assertEqual(import_apps_submodule.call_count, 0)
+        self.assertFalse(pool.detected)
@@ -1,17 +1,42 @@
+import threading
+import time
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
 from django.http import HttpResponseRedirect
-from django.template import Template
+from django.template import Context, Template
 from django.test import RequestFactory
 from django.urls import reverse
+from django.utils import translation
+from django.utils.safestring import mark_safe
 
-from fluent_contents import rendering
+from fluent_contents import appsettings, rendering
+from fluent_contents.cache import (
+    get_placeholder_cache_key,
+    get_placeholder_cache_key_for_parent,
+    get_placeholder_fallback_cache_key,
+    get_placeholder_items_cache_key,
+    get_placeholder_site_cache_key,
+)
 from fluent_contents.extensions import PluginContext
-from fluent_contents.models import DEFAULT_TIMEOUT, Placeholder
+from fluent_contents.models import (
+    DEFAULT_TIMEOUT,
+    ContentItem,
+    Placeholder,
+    get_parent_language_code,
+    prefetch_contentitems,
+    prefetch_placeholders,
+)
+from fluent_contents.rendering import core as rendering_core
+from fluent_contents.rendering import holes as rendering_holes
 from fluent_contents.rendering import utils as rendering_utils
 from fluent_contents.tests import factories
 from fluent_contents.tests.testapp.models import (
     MediaTestItem,
     OverrideBase,
+    PlaceholderFieldTestPage,
     RawHtmlTestItem,
     RedirectTestItem,
     TestPage,
@@ -58,6 +83,741 @@ class RenderingTests(AppTestCase):
         # this is that timeout that should be used for the placeholder cache item.
         self.assertEqual(output.cache_timeout, 60)
 
+    def test_render_cached_items_bulk(self):
+        """
+        The cached output of all items should be fetched in a single cache call.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        cache.clear()
+        placeholder = factories.create_placeholder()
+        for i in range(3):
+            factories.create_content_item(
+                RawHtmlTestItem, placeholder=placeholder, html=f"<b>Item{i}!</b>", sort_order=i
+            )
+
+        output = rendering.render_placeholder(self.dummy_request, placeholder, cachable=False)
+        self.assertEqual(output.html, "<b>Item0!</b><b>Item1!</b><b>Item2!</b>")
+
+        with mock.patch.object(rendering_core, "cache", wraps=rendering_core.cache) as cache_mock:
+            output = rendering.render_placeholder(self.dummy_request, placeholder, cachable=False)
+        self.assertEqual(output.html, "<b>Item0!</b><b>Item1!</b><b>Item2!</b>")
+        self.assertEqual(cache_mock.get_many.call_count, 1)
+        self.assertEqual(cache_mock.get.call_count, 1)  # the list of items
+
+    def test_render_item_manifest(self):
+        """
+        The list of items is cached, so cached items can be rendered without any query.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = False
+        cache.clear()
+        placeholder = factories.create_placeholder()
+        item1 = factories.create_content_item(
+            RawHtmlTestItem, placeholder=placeholder, html="<b>1</b>", sort_order=1
+        )
+        factories.create_content_item(
+            TimeoutTestItem, placeholder=placeholder, html="<b>2</b>", sort_order=2
+        )
+
+        try:
+            output = rendering.render_placeholder(self.dummy_request, placeholder)
+            self.assertEqual(output.html, "<b>1</b><b>2</b>")
+            with self.assertNumQueries(0):
+                output = rendering.render_placeholder(self.dummy_request, placeholder)
+            self.assertEqual(output.html, "<b>1</b><b>2</b>")
+
+            # Items that are no longer cached, are read from the database.
+            # - fetch RawHtmlTestItem
+            cache.delete_many(item1.plugin.get_output_cache_keys(placeholder.slot, item1))
+            with self.assertNumQueries(1):
+                output = rendering.render_placeholder(self.dummy_request, placeholder)
+            self.assertEqual(output.html, "<b>1</b><b>2</b>")
+
+            # The list includes the render payload, so the derived table isn't read either.
+            plugin_class = RawHtmlTestItem().plugin.__class__
+            with mock.patch.object(plugin_class, "render_payload_fields", ("html",)):
+                item1.save()
+                output = rendering.render_placeholder(self.dummy_request, placeholder)
+                cache.delete_many(item1.plugin.get_output_cache_keys(placeholder.slot, item1))
+                with self.assertNumQueries(0):
+                    output = rendering.render_placeholder(self.dummy_request, placeholder)
+                self.assertEqual(output.html, "<b>1</b><b>2</b>")
+
+            # Adding and deleting items updates the list.
+            item3 = factories.create_content_item(
+                RawHtmlTestItem, placeholder=placeholder, html="<b>3</b>", sort_order=3
+            )
+            output = rendering.render_placeholder(self.dummy_request, placeholder)
+            self.assertEqual(output.html, "<b>1</b><b>2</b><b>3</b>")
+            item1.delete()
+            output = rendering.render_placeholder(self.dummy_request, placeholder)
+            self.assertEqual(output.html, "<b>2</b><b>3</b>")
+            self.assertIsNotNone(cache.get(get_placeholder_items_cache_key(placeholder, None)))
+            item3.delete()
+            self.assertIsNone(cache.get(get_placeholder_items_cache_key(placeholder, None)))
+        finally:
+            appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+            cache.clear()
+
+    def test_render_cache_items_bulk(self):
+        """
+        The output of rendered items should be written in a single cache call per timeout.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        cache.clear()
+        placeholder = factories.create_placeholder()
+        item1 = factories.create_content_item(
+            RawHtmlTestItem, placeholder=placeholder, html="<b>Item1!</b>", sort_order=1
+        )
+        item2 = factories.create_content_item(
+            RawHtmlTestItem, placeholder=placeholder, html="<b>Item2!</b>", sort_order=2
+        )
+        item3 = factories.create_content_item(
+            TimeoutTestItem, placeholder=placeholder, html="<b>Item3!</b>", sort_order=3
+        )
+
+        with mock.patch.object(rendering_core, "cache", wraps=rendering_core.cache) as cache_mock:
+            output = rendering.render_placeholder(self.dummy_request, placeholder, cachable=False)
+        self.assertEqual(output.html, "<b>Item1!</b><b>Item2!</b><b>Item3!</b>")
+        self.assertEqual(cache_mock.set_many.call_count, 2)
+        self.assertEqual(cache_mock.set.call_count, 1)  # the list of items
+
+        # The plugin timeout is respected
+        cache_mock.set_many.assert_any_call(
+            {item3.plugin.get_output_cache_key(placeholder.slot, item3): mock.ANY}, 60
+        )
+        for item in (item1, item2, item3):
+            self.assertIsNotNone(
+                cache.get(item.plugin.get_output_cache_key(placeholder.slot, item))
+            )
+
+    def test_render_placeholders(self):
+        """
+        The ``render_placeholders`` function should render all slots with a constant number of queries.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        page = factories.create_page()
+        placeholder1 = factories.create_placeholder(page=page, slot="slot1")
+        placeholder2 = factories.create_placeholder(page=page, slot="slot2")
+        factories.create_placeholder(page=page, slot="empty_slot")
+        factories.create_content_item(RawHtmlTestItem, placeholder=placeholder1, html="<b>1</b>")
+        factories.create_content_item(RawHtmlTestItem, placeholder=placeholder2, html="<b>2</b>")
+        factories.create_content_item(TimeoutTestItem, placeholder=placeholder2, html="<b>3</b>")
+        slots = ["slot1", "slot2", "empty_slot", "missing_slot"]
+        request = RequestFactory().get("/")
+
+        # - fetch Placeholder
+        # - fetch ContentItem
+        # - fetch RawHtmlTestItem
+        # - fetch TimeoutTestItem
+        with self.assertNumQueries(4):
+            output = rendering.render_placeholders(request, page, slots)
+        self.assertEqual(output["slot1"].html, "<b>1</b>")
+        self.assertEqual(output["slot2"].html, "<b>2</b><b>3</b>")
+        self.assertEqual(
+            output["empty_slot"].html, "<!-- no items in placeholder 'empty_slot' -->"
+        )
+        self.assertEqual(
+            output["missing_slot"].html, "<!-- placeholder 'missing_slot' does not yet exist -->"
+        )
+
+        # The page_placeholder tag reads the prefetched output
+        template = Template('{% load fluent_contents_tags %}{% page_placeholder page "slot2" %}')
+        with self.assertNumQueries(0):
+            html = template.render(Context({"page": page, "request": request}))
+        self.assertEqual(html, "<b>2</b><b>3</b>")
+
+        # Second time, all output is cached, including the missing slot.
+        with self.assertNumQueries(0):
+            output = rendering.render_placeholders(RequestFactory().get("/"), page, slots)
+        self.assertEqual(output["slot2"].html, "<b>2</b><b>3</b>")
+        self.assertEqual(
+            output["missing_slot"].html, "<!-- placeholder 'missing_slot' does not yet exist -->"
+        )
+
+        # Creating the placeholder, and adding the first item clears the cached output.
+        placeholder3 = factories.create_placeholder(page=page, slot="missing_slot")
+        output = rendering.render_placeholders(RequestFactory().get("/"), page, slots)
+        self.assertEqual(
+            output["missing_slot"].html, "<!-- no items in placeholder 'missing_slot' -->"
+        )
+        factories.create_content_item(RawHtmlTestItem, placeholder=placeholder3, html="<b>4</b>")
+        output = rendering.render_placeholders(RequestFactory().get("/"), page, slots)
+        self.assertEqual(output["missing_slot"].html, "<b>4</b>")
+
+    def test_render_cache_generations(self):
+        """
+        With cache generations, saving an item should invalidate the output without deleting keys.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_GENERATIONS = True
+        try:
+            cache.clear()
+            placeholder = factories.create_placeholder()
+            item = factories.create_content_item(
+                RawHtmlTestItem, placeholder=placeholder, html="<b>Item1!</b>"
+            )
+            old_key = item.plugin.get_output_cache_key(placeholder.slot, item)
+
+            output = rendering.render_placeholder(self.dummy_request, placeholder)
+            self.assertEqual(output.html, "<b>Item1!</b>")
+
+            item.html = "<b>Item2!</b>"
+            with mock.patch.object(cache, "delete_many") as delete_many:
+                item.save()
+            self.assertEqual(delete_many.call_count, 0)
+
+            # The old output is still stored, but no longer read.
+            self.assertNotEqual(item.plugin.get_output_cache_key(placeholder.slot, item), old_key)
+            self.assertIsNotNone(cache.get(old_key))
+            output = rendering.render_placeholder(self.dummy_request, placeholder)
+            self.assertEqual(output.html, "<b>Item2!</b>")
+        finally:
+            appsettings.FLUENT_CONTENTS_CACHE_GENERATIONS = False
+
+    def test_render_stampede_lock(self):
+        """
+        With stampede protection, only one worker renders; the others display the previous output.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION = "lock"
+        try:
+            cache.clear()
+            page = factories.create_page()
+            placeholder = factories.create_placeholder(page=page)
+            item = factories.create_content_item(
+                RawHtmlTestItem, placeholder=placeholder, html="<b>Item1!</b>"
+            )
+            output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+            self.assertEqual(output.html, "<b>Item1!</b>")
+
+            # Simulate that the output expired, while another worker is rendering it.
+            item.html = "<b>Item2!</b>"
+            item.save()
+            cache_key = get_placeholder_cache_key_for_parent(
+                page, placeholder.slot, get_parent_language_code(page)
+            )
+            cache.delete(cache_key)
+            cache.add(f"{cache_key}.lock", True)
+            output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+            self.assertEqual(output.html, "<b>Item1!</b>")
+
+            cache.delete(f"{cache_key}.lock")
+            output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+            self.assertEqual(output.html, "<b>Item2!</b>")
+            self.assertIsNone(cache.get(f"{cache_key}.lock"))
+        finally:
+            appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION = None
+
+    def test_render_stampede_early(self):
+        """
+        With early expiration, output is rendered again before the cached output expires.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION = "early"
+        try:
+            cache.clear()
+            page = factories.create_page()
+            placeholder = factories.create_placeholder(page=page)
+            factories.create_content_item(
+                RawHtmlTestItem, placeholder=placeholder, html="<b>Item1!</b>"
+            )
+            rendering.render_placeholder(self.dummy_request, placeholder, page)
+            cache_key = get_placeholder_cache_key_for_parent(
+                page, placeholder.slot, get_parent_language_code(page)
+            )
+            self.assertIsNotNone(cache.get(f"{cache_key}.expires"))
+
+            # Reading the cached output directly, e.g. from the template tags, also expires early.
+            self.assertIsNotNone(rendering.get_cached_placeholder_output(page, placeholder.slot))
+            cache.set(f"{cache_key}.expires", (time.time(), 0.1))
+            self.assertIsNone(rendering.get_cached_placeholder_output(page, placeholder.slot))
+
+            # The item output and list of items is still cached.
+            with self.assertNumQueries(0):
+                rendering.render_placeholder(self.dummy_request, placeholder, page)
+
+            with self.assertNumQueries(0):
+                output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+            self.assertEqual(output.html, "<b>Item1!</b>")
+        finally:
+            appsettings.FLUENT_CONTENTS_CACHE_STAMPEDE_PROTECTION = None
+
+    def test_render_prefetched_items(self):
+        """
+        The items of prefetch_contentitems() are rendered without additional queries for the items.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        cache.clear()
+        for i in range(3):
+            page = factories.create_page()
+            placeholder = factories.create_placeholder(page=page)
+            factories.create_content_item(
+                RawHtmlTestItem, placeholder=placeholder, html=f"<b>Item{i}!</b>"
+            )
+
+        # - fetch pages
+        # - fetch placeholders
+        # - fetch ContentItems of all pages
+        with self.assertNumQueries(3):
+            pages = prefetch_placeholders(PlaceholderFieldTestPage.objects.order_by("pk"))
+            prefetch_contentitems(pages, slots=["field_slot1"])
+
+        # Only the derived tables of items are fetched
+        with self.assertNumQueries(1):
+            output = rendering.render_placeholder(self.dummy_request, pages[0].contents)
+        self.assertEqual(output.html, "<b>Item0!</b>")
+
+        # Second time, the item output is cached.
+        with self.assertNumQueries(0):
+            output = rendering.render_placeholder(self.dummy_request, pages[0].contents)
+        self.assertEqual(output.html, "<b>Item0!</b>")
+
+        # The ContentItem manager can also select the items of multiple parents.
+        self.assertEqual(ContentItem.objects.for_parents(pages[:2]).count(), 2)
+        self.assertEqual(ContentItem.objects.for_parents(pages, slots=["other"]).count(), 0)
+
+    def test_render_payload(self):
+        """
+        Plugins with render_payload_fields are rendered without reading their derived table.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = False
+        try:
+            placeholder = factories.create_placeholder()
+            plugin_class = RawHtmlTestItem().plugin.__class__
+            with mock.patch.object(plugin_class, "render_payload_fields", ("html",)):
+                item = factories.create_content_item(
+                    RawHtmlTestItem, placeholder=placeholder, html="<b>Item1!</b>"
+                )
+                self.assertEqual(item.render_payload, '{"html":"<b>Item1!</b>"}')
+
+                # - fetch ContentItem
+                with self.assertNumQueries(1):
+                    output = rendering.render_placeholder(
+                        self.dummy_request, placeholder, cachable=False
+                    )
+                self.assertEqual(output.html, "<b>Item1!</b>")
+
+            # Without the declaration, the payload is ignored.
+            # - fetch ContentItem
+            # - fetch RawHtmlTestItem
+            with self.assertNumQueries(2):
+                output = rendering.render_placeholder(
+                    self.dummy_request, placeholder, cachable=False
+                )
+            self.assertEqual(output.html, "<b>Item1!</b>")
+        finally:
+            appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+
+    def test_render_threads(self):
+        """
+        Items of thread-safe plugins are rendered concurrently, in the original ordering.
+        """
+        placeholder = factories.create_placeholder()
+        for i in range(3):
+            factories.create_content_item(
+                RawHtmlTestItem, placeholder=placeholder, html=f"<b>Item{i}!</b>"
+            )
+
+        plugin_class = RawHtmlTestItem().plugin.__class__
+        original_render = plugin_class.render
+        render_info = []
+
+        def render(plugin, request, instance, **kwargs):
+            render_info.append((threading.current_thread(), translation.get_language()))
+            time.sleep(0.01)
+            return original_render(plugin, request, instance, **kwargs)
+
+        appsettings.FLUENT_CONTENTS_RENDER_THREADS = 2
+        try:
+            with mock.patch.object(plugin_class, "render_thread_safe", True), mock.patch.object(
+                plugin_class, "render_ignore_item_language", True
+            ), mock.patch.object(plugin_class, "render", render), translation.override("nl"):
+                output = rendering.render_placeholder(
+                    self.dummy_request, placeholder, cachable=False
+                )
+                render_count = len(render_info)
+
+                # Items which are not rendered in time are left out.
+                appsettings.FLUENT_CONTENTS_RENDER_THREAD_TIMEOUT = 0.001
+                cache.clear()
+                with self.assertLogs("fluent_contents.rendering", "WARNING") as logs:
+                    timeout_output = rendering.render_placeholder(
+                        self.dummy_request, placeholder, cachable=False
+                    )
+                appsettings.FLUENT_CONTENTS_RENDER_THREAD_TIMEOUT = 10
+
+            # A TimeoutError of the plugin itself is not mistaken for a thread timeout.
+            def render_timeout(plugin, request, instance, **kwargs):
+                raise TimeoutError("socket timeout")
+
+            with mock.patch.object(plugin_class, "render", render_timeout):
+                for thread_safe in (True, False):
+                    with mock.patch.object(plugin_class, "render_thread_safe", thread_safe):
+                        cache.clear()
+                        self.assertRaises(
+                            TimeoutError,
+                            lambda: rendering.render_placeholder(
+                                self.dummy_request, placeholder, cachable=False
+                            ),
+                        )
+        finally:
+            appsettings.FLUENT_CONTENTS_RENDER_THREADS = 0
+            appsettings.FLUENT_CONTENTS_RENDER_THREAD_TIMEOUT = 10
+            rendering_core._render_executor.shutdown()
+            rendering_core._render_executor = None
+
+        self.assertNotEqual(timeout_output.html, "<b>Item0!</b><b>Item1!</b><b>Item2!</b>")
+        self.assertIn("was not rendered within 0.001 seconds", logs.output[0])
+        self.assertFalse(timeout_output.cacheable)
+
+        self.assertEqual(output.html, "<b>Item0!</b><b>Item1!</b><b>Item2!</b>")
+        self.assertEqual(render_count, 3)
+        for thread, language in render_info:
+            self.assertIsNot(thread, threading.current_thread())
+            self.assertEqual(language, "nl")
+
+    def test_arender_placeholder(self):
+        """
+        The async pipeline renders the same output, using the async render hooks.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        placeholder = factories.create_placeholder()
+        for i in range(2):
+            factories.create_content_item(
+                RawHtmlTestItem,
+                placeholder=placeholder,
+                language_code="nl",
+                html=f"<b>Item{i}!</b>",
+            )
+
+        plugin_class = RawHtmlTestItem().plugin.__class__
+        render_languages = []
+
+        async def arender(plugin, request, instance, **kwargs):
+            render_languages.append(translation.get_language())
+            return mark_safe(f"<i>{instance.html}</i>")
+
+        with mock.patch.object(plugin_class, "arender", arender):
+            output = async_to_sync(rendering.arender_placeholder)(self.dummy_request, placeholder)
+            self.assertEqual(output.html, "<i><b>Item0!</b></i><i><b>Item1!</b></i>")
+            self.assertEqual(render_languages, ["nl", "nl"])
+
+            # The placeholder output is now cached.
+            with self.assertNumQueries(0):
+                output = async_to_sync(rendering.arender_placeholder)(
+                    self.dummy_request, placeholder
+                )
+            self.assertEqual(output.html, "<i><b>Item0!</b></i><i><b>Item1!</b></i>")
+            self.assertEqual(len(render_languages), 2)
+
+        # The sync render() is used by default.
+        items = ContentItem.objects.filter(placeholder=placeholder)
+        output = async_to_sync(rendering.arender_content_items)(
+            self.dummy_request, items, cachable=False
+        )
+        self.assertEqual(output.html, "<b>Item0!</b><b>Item1!</b>")
+
+    def test_arender_translated_parent(self):
+        """
+        The async pipeline reads the parent translation, ContentType and cache generation outside the event loop.
+        """
+        from fluent_contents.plugins.sharedcontent.models import SharedContent
+
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_GENERATIONS = True
+        cache.clear()
+        sharedcontent = SharedContent(slug="footer")
+        sharedcontent.set_current_language("en-us")
+        sharedcontent.title = "Footer"
+        sharedcontent.save()
+        placeholder = Placeholder.objects.create_for_object(sharedcontent, "shared_content")
+        factories.create_content_item(
+            RawHtmlTestItem, placeholder=placeholder, language_code="en-us", html="<b>1</b>"
+        )
+
+        def arender():
+            # The translation is not loaded yet, and no ContentType objects are in memory.
+            parent = SharedContent.objects.get(pk=sharedcontent.pk)
+            parent.set_current_language("en-us")
+            ContentType.objects.clear_cache()
+            return async_to_sync(rendering.arender_placeholder)(
+                self.dummy_request, placeholder, parent_object=parent
+            )
+
+        try:
+            self.assertEqual(arender().html, "<b>1</b>")
+            self.assertEqual(arender().html, "<b>1</b>")  # cached
+        finally:
+            appsettings.FLUENT_CONTENTS_CACHE_GENERATIONS = False
+            cache.clear()
+
+    def test_arender_empty_plugin_pool(self):
+        """
+        The async pipeline resolves the plugins outside the event loop, also when the pool is not set up yet.
+        """
+        from fluent_contents import extensions
+        from fluent_contents.rendering import async_core
+
+        placeholder = factories.create_placeholder()
+        factories.create_content_item(RawHtmlTestItem, placeholder=placeholder, html="<b>1</b>")
+
+        # A pool without the lookup tables, and no ContentType objects in memory.
+        pool = extensions.PluginPool()
+        for plugin in extensions.plugin_pool.get_plugins():
+            pool.register(plugin.__class__)
+        ContentType.objects.clear_cache()
+
+        items = ContentItem.objects.filter(placeholder=placeholder)
+        with mock.patch.object(extensions, "plugin_pool", pool), mock.patch.object(
+            async_core, "plugin_pool", pool
+        ):
+            output = async_to_sync(rendering.arender_content_items)(
+                self.dummy_request, items, cachable=False
+            )
+        self.assertEqual(output.html, "<b>1</b>")
+        self.assertIsNotNone(pool._name_for_ctype_id)
+
+    def test_iter_placeholder_html(self):
+        """
+        The placeholder output can be generated item by item.
+        """
+        cache.clear()
+        placeholder = factories.create_placeholder()
+        factories.create_content_item(RawHtmlTestItem, placeholder=placeholder, html="<b>1</b>")
+        factories.create_content_item(MediaTestItem, placeholder=placeholder, html="<b>2</b>")
+        request = RequestFactory().get("/")
+
+        chunks = rendering.iter_placeholder_html(request, placeholder)
+        self.assertEqual(next(chunks), "<b>1</b>")
+        self.assertEqual(rendering.get_frontend_media(request)._js, [])
+        self.assertEqual(next(chunks).strip(), "<b>2</b>")
+        self.assertEqual(rendering.get_frontend_media(request)._js, ["testapp/media_item.js"])
+        self.assertEqual(list(chunks), [])
+
+        # The items are cached, and read in a single call.
+        # The list of items is cached too, so no queries are needed.
+        with self.assertNumQueries(0):
+            html = "".join(rendering.iter_placeholder_html(request, placeholder))
+        self.assertEqual(html.replace("\n", ""), "<b>1</b><b>2</b>")
+
+    def test_render_hole_punching(self):
+        """
+        Items that can't be cached are rendered for each request, while the placeholder output is cached.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        page = factories.create_page()
+        placeholder = factories.create_placeholder(page=page)
+        factories.create_content_item(RawHtmlTestItem, placeholder=placeholder, html="<b>1</b>")
+        item2 = factories.create_content_item(
+            TimeoutTestItem, placeholder=placeholder, sort_order=2, html="<b>2</b>"
+        )
+        cache_key = get_placeholder_cache_key_for_parent(
+            page, placeholder.slot, get_parent_language_code(page)
+        )
+        plugin_class = TimeoutTestItem().plugin.__class__
+
+        appsettings.FLUENT_CONTENTS_CACHE_HOLE_PUNCHING = "inline"
+        try:
+            with mock.patch.object(plugin_class, "cache_output", False):
+                output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+                self.assertEqual(output.html, "<b>1</b><b>2</b>")
+                self.assertEqual(
+                    cache.get(cache_key).html,
+                    "<b>1</b>" + rendering_holes.get_hole_html(item2),
+                )
+
+                # Only the dynamic item is fetched.
+                # - fetch ContentItem
+                # - fetch TimeoutTestItem
+                with self.assertNumQueries(2):
+                    output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+                self.assertEqual(output.html, "<b>1</b><b>2</b>")
+
+                # Without a request, the dynamic items can't be rendered.
+                self.assertIsNone(rendering.get_cached_placeholder_output(page, placeholder.slot))
+                output = rendering.get_cached_placeholder_output(
+                    page, placeholder.slot, self.dummy_request
+                )
+                self.assertEqual(output.html, "<b>1</b><b>2</b>")
+
+                # Markers that are entered in the content can't include other items.
+                cache.clear()
+                item3 = factories.create_content_item(
+                    RawHtmlTestItem,
+                    placeholder=placeholder,
+                    sort_order=3,
+                    html=f"<!--fluent-contents-hole:{item2.pk}-->"
+                    + str(rendering_holes.get_hole_html(item2)),
+                )
+                output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+                self.assertEqual(output.html, "<b>1</b><b>2</b>")
+                self.assertEqual(
+                    rendering_holes.get_hole_ids(f"<!--fluent-contents-hole:{item2.pk}:abc-->"),
+                    [],
+                )
+                item3.delete()
+
+                # With edge side includes, the item is rendered by the fragment view.
+                appsettings.FLUENT_CONTENTS_CACHE_HOLE_PUNCHING = "esi"
+                cache.clear()
+                output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+                self.assertTrue(output.html.startswith('<b>1</b><esi:include src="'))
+                self.assertEqual(cache.get(cache_key).html, output.html)
+
+                url = output.html.split('"')[1]
+                self.assertEqual(url, rendering_holes.get_fragment_url(item2.pk))
+                response = self.client.get(url)
+                self.assertEqual(response.content, b"<b>2</b>")
+                self.assertIn("private", response["Cache-Control"])
+                self.assertEqual(self.client.get(url + "x/").status_code, 404)
+        finally:
+            appsettings.FLUENT_CONTENTS_CACHE_HOLE_PUNCHING = None
+            cache.clear()
+
+    def test_render_cache_per_site(self):
+        """
+        Placeholders with items that are cached per site, are also cached per site.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        page = factories.create_page()
+        placeholder = factories.create_placeholder(page=page)
+        item1 = factories.create_content_item(
+            RawHtmlTestItem, placeholder=placeholder, html="<b>1</b>"
+        )
+        item2 = factories.create_content_item(
+            TimeoutTestItem, placeholder=placeholder, sort_order=2, html="<b>2</b>"
+        )
+        cache_key = get_placeholder_cache_key_for_parent(
+            page, placeholder.slot, get_parent_language_code(page)
+        )
+
+        # A placeholder with the same slot on another page is not cached per site.
+        page2 = factories.create_page()
+        placeholder2 = factories.create_placeholder(page=page2)
+        item3 = factories.create_content_item(
+            RawHtmlTestItem, placeholder=placeholder2, html="<b>3</b>"
+        )
+        cache_key2 = get_placeholder_cache_key_for_parent(
+            page2, placeholder2.slot, get_parent_language_code(page2)
+        )
+        site_cache_key = get_placeholder_site_cache_key(cache_key)
+        plugin_class = TimeoutTestItem().plugin.__class__
+
+        with mock.patch.object(plugin_class, "cache_output_per_site", True):
+            output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+            self.assertEqual(output.html, "<b>1</b><b>2</b>")
+            self.assertIsNone(cache.get(cache_key))
+            self.assertEqual(cache.get(site_cache_key).html, "<b>1</b><b>2</b>")
+
+            with self.assertNumQueries(0):
+                output = rendering.render_placeholder(self.dummy_request, placeholder, page)
+            self.assertEqual(output.html, "<b>1</b><b>2</b>")
+
+            output = rendering.render_placeholder(self.dummy_request, placeholder2, page2)
+            self.assertEqual(output.html, "<b>3</b>")
+            self.assertEqual(cache.get(cache_key2).html, "<b>3</b>")
+
+            # Saving any item also clears the output of all sites.
+            item_key = get_placeholder_cache_key(placeholder, item2.language_code)
+            self.assertIn(get_placeholder_site_cache_key(item_key), item1.get_cache_keys())
+            self.assertIn(get_placeholder_site_cache_key(item_key), item2.get_cache_keys())
+
+            # Other placeholders don't have output per site.
+            item_key2 = get_placeholder_cache_key(placeholder2, item3.language_code)
+            self.assertNotIn(get_placeholder_site_cache_key(item_key2), item3.get_cache_keys())
+
+        with self.assertNumQueries(0):
+            self.assertNotIn(get_placeholder_site_cache_key(item_key), item1.get_cache_keys())
+        cache.clear()
+
+    def test_arender_cache_per_site(self):
+        """
+        The async rendering also caches the output per site.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        page = factories.create_page()
+        placeholder = factories.create_placeholder(page=page)
+        factories.create_content_item(TimeoutTestItem, placeholder=placeholder, html="<b>2</b>")
+        cache_key = get_placeholder_cache_key_for_parent(
+            page, placeholder.slot, get_parent_language_code(page)
+        )
+        plugin_class = TimeoutTestItem().plugin.__class__
+
+        with mock.patch.object(plugin_class, "cache_output_per_site", True):
+            output = async_to_sync(rendering.arender_placeholder)(
+                self.dummy_request, placeholder, page
+            )
+            self.assertEqual(output.html, "<b>2</b>")
+            self.assertIsNone(cache.get(cache_key))
+            self.assertEqual(cache.get(get_placeholder_site_cache_key(cache_key)).html, "<b>2</b>")
+        cache.clear()
+
+    def test_render_cache_fallback(self):
+        """
+        The fallback language output of a placeholder is cached under a separate key.
+        """
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        page = factories.create_page()
+        page.language_code = "nl"
+        placeholder = factories.create_placeholder(page=page)
+        item = factories.create_content_item(
+            RawHtmlTestItem, placeholder=placeholder, language_code="en", html="<b>en</b>"
+        )
+        cache_key = get_placeholder_cache_key_for_parent(page, placeholder.slot, "nl")
+        fallback_cache_key = get_placeholder_fallback_cache_key(cache_key, "en")
+
+        try:
+            output = rendering.render_placeholder(
+                self.dummy_request, placeholder, page, fallback_language="en"
+            )
+            self.assertEqual(output.html, "<b>en</b>")
+            self.assertIsNone(cache.get(cache_key))
+            self.assertEqual(cache.get(fallback_cache_key).html, "<b>en</b>")
+
+            with self.assertNumQueries(0):
+                output = rendering.render_placeholder(
+                    self.dummy_request, placeholder, page, fallback_language="en"
+                )
+            self.assertEqual(output.html, "<b>en</b>")
+
+            # Saving the item in the fallback language clears the fallback output.
+            item.html = "<b>en2</b>"
+            item.save()
+            self.assertIsNone(cache.get(fallback_cache_key))
+
+            # Adding an item in the requested language too.
+            output = rendering.render_placeholder(
+                self.dummy_request, placeholder, page, fallback_language="en"
+            )
+            self.assertEqual(output.html, "<b>en2</b>")
+            factories.create_content_item(
+                RawHtmlTestItem, placeholder=placeholder, language_code="nl", html="<b>nl</b>"
+            )
+            self.assertIsNone(cache.get(fallback_cache_key))
+            output = rendering.render_placeholder(
+                self.dummy_request, placeholder, page, fallback_language="en"
+            )
+            self.assertEqual(output.html, "<b>nl</b>")
+        finally:
+            cache.clear()
+
     def test_render_media(self):
         """
         Test that 'class FrontendMedia' works.
@@ -70,6 +830,30 @@ class RenderingTests(AppTestCase):
         self.assertEqual(output.media._js, ["testapp/media_item.js"])
         self.assertEqual(output.media._css, {"screen": ["testapp/media_item.css"]})
 
+    def test_render_media_shared(self):
+        """
+        The media of plugins is shared between items, and merged without duplicates.
+        """
+        placeholder = factories.create_placeholder()
+        item1 = factories.create_content_item(
+            MediaTestItem, placeholder=placeholder, html="MEDIA_TEST1", sort_order=1
+        )
+        factories.create_content_item(
+            MediaTestItem, placeholder=placeholder, html="MEDIA_TEST2", sort_order=2
+        )
+        self.assertIs(item1.plugin.frontend_media, item1.plugin.frontend_media)
+
+        output = rendering.render_placeholder(self.dummy_request, placeholder, cachable=False)
+        self.assertEqual(len([js for js in output.media._js_lists if js]), 1)
+        self.assertEqual(output.media._js, ["testapp/media_item.js"])
+
+        request = RequestFactory().get("/")
+        rendering.register_frontend_media(request, output.media)
+        rendering.register_frontend_media(request, item1.plugin.frontend_media)
+        media = rendering.get_frontend_media(request)
+        self.assertEqual(len([js for js in media._js_lists if js]), 1)
+        self.assertEqual(media._css, {"screen": ["testapp/media_item.css"]})
+
     def test_render_redirect(self):
         cache.clear()
         page = factories.create_page()
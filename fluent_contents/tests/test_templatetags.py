@@ -1,4 +1,5 @@
 from pprint import pprint
+from unittest import mock
 
 from django.contrib.auth.models import AnonymousUser
 from django.core.cache import cache
@@ -6,10 +7,14 @@ from django.template import Context, Template, TemplateSyntaxError, VariableDoes
 from django.test import RequestFactory
 from template_analyzer import get_node_instances
 
-from fluent_contents import appsettings
+from fluent_contents import appsettings, rendering
 from fluent_contents.analyzer import get_template_placeholder_data
-from fluent_contents.models import Placeholder
+from fluent_contents.cache import get_placeholder_cache_key_for_parent
+from fluent_contents.models import Placeholder, db, get_parent_language_code
+from fluent_contents.plugins.sharedcontent import models as sharedcontent_models
+from fluent_contents.plugins.sharedcontent.templatetags import sharedcontent_tags
 from fluent_contents.templatetags.fluent_contents_tags import PagePlaceholderNode
+from fluent_contents.tests import factories
 from fluent_contents.tests.testapp.models import (
     PlaceholderFieldTestPage,
     RawHtmlTestItem,
@@ -243,9 +248,8 @@ class TemplateTagTests(AppTestCase):
             )
             # pprint(ctx.captured_queries)
 
-        # Second time
-        # - fetch ContentItem
-        with self.assertNumQueries(1) as ctx:
+        # Second time, the list of items is cached too.
+        with self.assertNumQueries(0) as ctx:
             self._render(
                 """{% load fluent_contents_tags %}{% render_placeholder placeholder1 %}""",
                 {"placeholder1": placeholder1},
@@ -254,8 +258,7 @@ class TemplateTagTests(AppTestCase):
 
         # Using page_placeholder
         # - fetch Placeholder
-        # - fetch ContentItem
-        with self.assertNumQueries(2) as ctx:
+        with self.assertNumQueries(1) as ctx:
             self._render(
                 """{% load fluent_contents_tags %}{% page_placeholder 'field_slot1' %}""",
                 {"page": page3},
@@ -264,9 +267,7 @@ class TemplateTagTests(AppTestCase):
 
         # Using page_placeholder, use fallback
         # - fetch Placeholder
-        # - fetch ContentItem
-        # - fetch ContentItem fallback
-        with self.assertNumQueries(2) as ctx:
+        with self.assertNumQueries(1) as ctx:
             self._render(
                 """{% load fluent_contents_tags %}{% page_placeholder 'field_slot1' fallback=True %}""",
                 {"page": page3},
@@ -321,6 +322,305 @@ class TemplateTagTests(AppTestCase):
             )
             # pprint(ctx.captured_queries)
 
+    def test_num_fallback_placeholder_queries(self):
+        """
+        The cached output of the fallback language is displayed without queries.
+        """
+        page3 = factories.create_page()
+        page3.language_code = "nl"
+        placeholder1 = factories.create_placeholder(page=page3)
+        factories.create_content_item(
+            RawHtmlTestItem,
+            placeholder=placeholder1,
+            language_code=appsettings.FLUENT_CONTENTS_DEFAULT_LANGUAGE_CODE,
+            html="<b>Item1!</b>",
+        )
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        template = (
+            """{% load fluent_contents_tags %}{% page_placeholder 'field_slot1' fallback=True %}"""
+        )
+
+        html = self._render(template, {"page": page3})
+        self.assertEqual(html, "<b>Item1!</b>")
+
+        with self.assertNumQueries(0):
+            html = self._render(template, {"page": page3})
+        self.assertEqual(html, "<b>Item1!</b>")
+
+    def test_num_missing_placeholder_queries(self):
+        """
+        A missing placeholder should be cached too, until it's created.
+        """
+        page3 = PlaceholderFieldTestPage.objects.create()
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        template = """{% load fluent_contents_tags %}{% page_placeholder 'field_slot1' %}"""
+
+        # - fetch Placeholder
+        with self.assertNumQueries(1):
+            html = self._render(template, {"page": page3})
+        self.assertEqual(html, "<!-- placeholder 'field_slot1' does not yet exist -->")
+
+        with self.assertNumQueries(0):
+            html = self._render(template, {"page": page3})
+        self.assertEqual(html, "<!-- placeholder 'field_slot1' does not yet exist -->")
+
+        # Creating the placeholder clears the cache, the empty output is cached again.
+        placeholder1 = Placeholder.objects.create_for_object(page3, "field_slot1")
+        html = self._render(template, {"page": page3})
+        self.assertEqual(html, "<!-- no items in placeholder 'field_slot1' -->")
+        with self.assertNumQueries(0):
+            self._render(template, {"page": page3})
+
+        # Adding the first item clears the cache again.
+        RawHtmlTestItem.objects.create_for_placeholder(placeholder1, html="<b>Item1!</b>")
+        html = self._render(template, {"page": page3})
+        self.assertEqual(html, "<b>Item1!</b>")
+        cache.clear()
+
+    def test_prefetch_placeholders(self):
+        """
+        The ``prefetch_placeholders`` tag should render all slots of the template at once.
+        """
+        page3 = PlaceholderFieldTestPage.objects.create()
+        placeholder1 = Placeholder.objects.create_for_object(page3, "field_slot1")
+        placeholder2 = Placeholder.objects.create_for_object(page3, "field_slot2")
+        RawHtmlTestItem.objects.create_for_placeholder(placeholder1, html="<b>Item1!</b>")
+        RawHtmlTestItem.objects.create_for_placeholder(placeholder2, html="<b>Item2!</b>")
+
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = False
+        cache.clear()
+
+        template = Template(
+            "{% load fluent_contents_tags %}{% prefetch_placeholders %}"
+            "{% page_placeholder 'field_slot1' %}|{% page_placeholder 'field_slot2' %}|"
+            "{% page_placeholder 'field_slot3' %}"
+        )
+
+        # - fetch Placeholder
+        # - fetch ContentItem
+        # - fetch RawHtmlTestItem
+        with self.assertNumQueries(3):
+            context = Context({"page": page3, "request": RequestFactory().get("/")})
+            html = template.render(context)
+        self.assertEqual(
+            html,
+            "<b>Item1!</b>|<b>Item2!</b>|<!-- placeholder 'field_slot3' does not yet exist -->",
+        )
+        self.assertEqual(
+            template._fluent_contents_prefetch_slots,
+            [(False, "field_slot1"), (False, "field_slot2"), (False, "field_slot3")],
+        )
+
+    def test_prefetch_placeholders_not_cachable(self):
+        """
+        Placeholders with ``cachable=False`` are not prefetched, so their output is not cached.
+        """
+        page3 = PlaceholderFieldTestPage.objects.create()
+        placeholder1 = Placeholder.objects.create_for_object(page3, "field_slot1")
+        placeholder2 = Placeholder.objects.create_for_object(page3, "field_slot2")
+        RawHtmlTestItem.objects.create_for_placeholder(placeholder1, html="<b>Item1!</b>")
+        RawHtmlTestItem.objects.create_for_placeholder(placeholder2, html="<b>Item2!</b>")
+
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+
+        template = Template(
+            "{% load fluent_contents_tags %}{% prefetch_placeholders %}"
+            "{% page_placeholder 'field_slot1' %}|{% page_placeholder 'field_slot2' cachable=False %}"
+        )
+        context = Context({"page": page3, "request": RequestFactory().get("/")})
+        self.assertEqual(template.render(context), "<b>Item1!</b>|<b>Item2!</b>")
+        self.assertEqual(template._fluent_contents_prefetch_slots, [(False, "field_slot1")])
+
+        language_code = get_parent_language_code(page3)
+        self.assertIsNotNone(
+            cache.get(get_placeholder_cache_key_for_parent(page3, "field_slot1", language_code))
+        )
+        self.assertIsNone(
+            cache.get(get_placeholder_cache_key_for_parent(page3, "field_slot2", language_code))
+        )
+
+    def test_sharedcontent_cache(self):
+        """
+        The output of all ``sharedcontent`` tags in a template is read with a single cache call.
+        """
+        from fluent_contents.plugins.sharedcontent.models import SharedContent
+
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        items = []
+        for slug in ("header", "footer"):
+            sharedcontent = SharedContent.objects.create(slug=slug)
+            placeholder = Placeholder.objects.create_for_object(sharedcontent, "shared_content")
+            items.append(
+                RawHtmlTestItem.objects.create_for_placeholder(placeholder, html=f"<b>{slug}</b>")
+            )
+
+        template = Template(
+            "{% load sharedcontent_tags %}"
+            "{% sharedcontent 'header' %}|{% sharedcontent 'footer' %}|{% sharedcontent 'missing' %}"
+        )
+
+        def render():
+            request = RequestFactory().get("/")
+            request.user = AnonymousUser()
+            return template.render(Context({"request": request}))
+
+        try:
+            html = render()
+            self.assertEqual(
+                html,
+                "<b>header</b>|<b>footer</b>|<!-- shared content 'missing' does not yet exist -->",
+            )
+
+            # - fetch SharedContent (missing)
+            with mock.patch.object(
+                sharedcontent_tags, "cache", wraps=sharedcontent_tags.cache
+            ) as cache_mock:
+                with self.assertNumQueries(1):
+                    html = render()
+            self.assertEqual(
+                html,
+                "<b>header</b>|<b>footer</b>|<!-- shared content 'missing' does not yet exist -->",
+            )
+            self.assertEqual(cache_mock.get_many.call_count, 1)
+            self.assertEqual(cache_mock.get.call_count, 0)
+
+            # Saving an item clears the output
+            items[1].html = "<b>footer2</b>"
+            items[1].save()
+            self.assertTrue(render().startswith("<b>header</b>|<b>footer2</b>|"))
+        finally:
+            cache.clear()
+
+    def test_prefetch_sharedcontent(self):
+        """
+        The ``prefetch_sharedcontent`` tag should fetch all blocks with a constant number of queries.
+        """
+        from fluent_contents.plugins.sharedcontent.models import SharedContent
+
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = False
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = False
+        slugs = ["block1", "block2", "block3"]
+        for slug in slugs:
+            sharedcontent = SharedContent.objects.create(slug=slug)
+            sharedcontent.set_current_language("en-us")
+            sharedcontent.title = slug
+            sharedcontent.save()
+            placeholder = Placeholder.objects.create_for_object(sharedcontent, "shared_content")
+            RawHtmlTestItem.objects.create_for_placeholder(placeholder, html=f"<b>{slug}</b>")
+
+        template = Template(
+            "{% load sharedcontent_tags %}{% prefetch_sharedcontent %}"
+            "{% sharedcontent 'block1' %}|{% sharedcontent 'block2' %}|"
+            "{% sharedcontent 'block3' %}|{% sharedcontent 'missing' %}"
+        )
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+
+        try:
+            # - fetch SharedContent
+            # - fetch SharedContent translations
+            # - fetch Placeholder
+            # - fetch ContentItem
+            # - fetch RawHtmlTestItem
+            with self.assertNumQueries(5):
+                html = template.render(Context({"request": request}))
+            self.assertEqual(
+                html,
+                "<b>block1</b>|<b>block2</b>|<b>block3</b>|"
+                "<!-- shared content 'missing' does not yet exist -->",
+            )
+
+            # Explicit slugs
+            template = Template(
+                "{% load sharedcontent_tags %}{% prefetch_sharedcontent 'block1' 'block3' %}"
+                "{% sharedcontent 'block3' %}"
+            )
+            request = RequestFactory().get("/")
+            request.user = AnonymousUser()
+            with self.assertNumQueries(5):
+                html = template.render(Context({"request": request}))
+            self.assertEqual(html, "<b>block3</b>")
+        finally:
+            appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+            appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+
+    def test_sharedcontent_item_cache(self):
+        """
+        Placeholders that display shared content are cached, and cleared when the shared content changes.
+        """
+        from fluent_contents.plugins.sharedcontent.models import SharedContent, SharedContentItem
+
+        appsettings.FLUENT_CONTENTS_CACHE_OUTPUT = True
+        appsettings.FLUENT_CONTENTS_CACHE_PLACEHOLDER_OUTPUT = True
+        cache.clear()
+        sharedcontent = SharedContent.objects.create(slug="footer")
+        shared_placeholder = Placeholder.objects.create_for_object(sharedcontent, "shared_content")
+        shared_item = factories.create_content_item(
+            RawHtmlTestItem, placeholder=shared_placeholder, html="<b>footer</b>"
+        )
+
+        # The shared content is displayed in a page, and in another shared content.
+        placeholder = factories.create_placeholder()
+        factories.create_content_item(
+            SharedContentItem, placeholder=placeholder, shared_content=sharedcontent
+        )
+        outer_sharedcontent = SharedContent.objects.create(slug="outer")
+        outer_placeholder = Placeholder.objects.create_for_object(
+            outer_sharedcontent, "shared_content"
+        )
+        factories.create_content_item(
+            SharedContentItem, placeholder=outer_placeholder, shared_content=sharedcontent
+        )
+        outer_page_placeholder = factories.create_placeholder()
+        factories.create_content_item(
+            SharedContentItem,
+            placeholder=outer_page_placeholder,
+            shared_content=outer_sharedcontent,
+        )
+
+        def render(placeholder):
+            request = RequestFactory().get("/")
+            request.user = AnonymousUser()
+            return rendering.render_placeholder(request, placeholder).html
+
+        try:
+            self.assertEqual(render(placeholder), "<b>footer</b>")
+            self.assertEqual(render(outer_page_placeholder), "<b>footer</b>")
+            with self.assertNumQueries(0):
+                self.assertEqual(render(placeholder), "<b>footer</b>")
+                self.assertEqual(render(outer_page_placeholder), "<b>footer</b>")
+
+            # Changing the shared content clears all placeholders that display it.
+            # The keys of all placeholders are deleted at once.
+            # The per-site placeholders of the 3 embedding items are also found at once.
+            shared_item.html = "<b>footer2</b>"
+            with mock.patch.object(
+                sharedcontent_models, "cache", wraps=sharedcontent_models.cache
+            ) as cache_mock, mock.patch.object(
+                db, "_get_per_site_placeholder_ids", wraps=db._get_per_site_placeholder_ids
+            ) as per_site_mock:
+                shared_item.save()
+            self.assertEqual(cache_mock.delete_many.call_count, 1)
+            self.assertEqual([len(call.args[0]) for call in per_site_mock.call_args_list], [3, 1])
+            self.assertEqual(render(placeholder), "<b>footer2</b>")
+            self.assertEqual(render(outer_page_placeholder), "<b>footer2</b>")
+
+            # Deleting it too.
+            sharedcontent.delete()
+            self.assertNotIn("footer", render(placeholder))
+            self.assertNotIn("footer", render(outer_page_placeholder))
+        finally:
+            cache.clear()
+
     def _render(self, template_code, context_data):
         """
         Render a template
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 
 from . import views
 
@@ -7,7 +7,8 @@ admin.autodiscover()
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("testpage/<int:pk>/", views.TestPageView.as_view(), name="testpage")
+    path("testpage/<int:pk>/", views.TestPageView.as_view(), name="testpage"),
+    path("fluent-contents/", include("fluent_contents.urls")),
     # url(r'^comments/', include('django.contrib.comments.urls')),
     # url(r'^forms/', include('form_designer.urls')),
 ]
@@ -0,0 +1,19 @@
+"""
+The URLs of the fragment view, which renders the ``<esi:include>`` tags of
+:ref:`FLUENT_CONTENTS_CACHE_HOLE_PUNCHING`. Include these in the project URLconf:
+
+.. code-block:: python
+
+    path("fluent-contents/", include("fluent_contents.urls")),
+"""
+from django.urls import path
+
+from fluent_contents import views
+
+urlpatterns = [
+    path(
+        "fragment/<str:signed_id>/",
+        views.contentitem_fragment,
+        name="fluent_contents_fragment",
+    ),
+]
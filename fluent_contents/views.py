@@ -0,0 +1,33 @@
+"""
+The views of the content items.
+"""
+from django.core import signing
+from django.http import Http404, HttpResponse
+from django.views.decorators.cache import never_cache
+
+from fluent_contents.models import ContentItem
+from fluent_contents.rendering import render_content_items
+from fluent_contents.rendering.holes import FRAGMENT_SALT
+
+
+@never_cache
+def contentitem_fragment(request, signed_id):
+    """
+    .. versionadded:: 3.2
+
+    Render a single content item, for the ``<esi:include>`` tags
+    that :ref:`FLUENT_CONTENTS_CACHE_HOLE_PUNCHING` writes in the cached placeholder output.
+    The response is not cached, as the output can differ per user.
+    """
+    try:
+        contentitem_id = signing.loads(signed_id, salt=FRAGMENT_SALT)
+    except signing.BadSignature:
+        raise Http404("Invalid fragment")
+
+    try:
+        contentitem = ContentItem.objects.get(pk=contentitem_id)
+    except ContentItem.DoesNotExist:
+        raise Http404("Content item not found")
+
+    output = render_content_items(request, [contentitem], cachable=False)
+    return HttpResponse(output.html)
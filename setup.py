@@ -55,6 +55,7 @@ setup(
         "oembeditem": ["micawber>=0.3.3", "beautifulsoup4>=4.3.2"],
         "text": ["django-wysiwyg>=0.7.1"],
         "twitterfeed": ["twitter-text>=3.0"],
+        "zstd": ["zstandard"],
         "tests": [
             "django-wysiwyg",
             "html5lib",